@@ -0,0 +1,434 @@
+import os
+import re
+import json
+import html
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from bs4 import BeautifulSoup
+from job_frame import typed_jobs, job_links, memory_mb
+from keywords import keyword_counts
+from html_parsing import CardParser, LINKEDIN_CARD_SPEC, GOOGLE_CARD_SPEC, available_backends
+
+FIXTURES_DIR = 'fixtures'
+
+WORDS = ['data', 'scientist', 'senior', 'machine', 'learning', 'engineer', 'analyst', 'research',
+         'computer', 'vision', 'python', 'backend', 'platform', 'lead', 'applied', 'deep', 'nlp', 'r&d']
+COMPANIES = ['Google', 'Intel', 'Nvidia', 'Wix.com', 'monday.com', 'Mobileye', 'Check Point', 'AT&T <Israel>']
+LOCATIONS = ['Tel Aviv-Yafo, Tel Aviv District, Israel', 'Haifa, Haifa District, Israel', 'Israel',
+             'Herzliya, Tel Aviv District, Israel', 'Jerusalem, Jerusalem District, Israel']
+
+
+def synthetic_jobs(n, seed=0):
+    """A jobs frame shaped like the store's, with n rows"""
+    rng = np.random.default_rng(seed)
+    words = np.array(WORDS, dtype=object)
+    title_words = rng.integers(0, len(WORDS), size=(n, 3))
+    titles = words[title_words[:, 0]] + ' ' + words[title_words[:, 1]] + ' ' + words[title_words[:, 2]]
+    job_ids = rng.integers(4_000_000_000, 4_400_000_000, size=n).astype(str).astype(object)
+    run_times = pd.Timestamp('2025-08-12 01:00') + pd.to_timedelta(rng.integers(0, 90 * 2, size=n) * 12, unit='h')
+    return pd.DataFrame({
+        'title': titles,
+        'company': np.array(COMPANIES, dtype=object)[rng.integers(0, len(COMPANIES), size=n)],
+        'location': np.array(LOCATIONS, dtype=object)[rng.integers(0, len(LOCATIONS), size=n)],
+        'source': np.where(rng.random(n) < 0.99, 'LinkedIn', 'Google Careers'),
+        'run_time': run_times,
+        'link': 'https://il.linkedin.com/jobs/view/job-' + job_ids,
+        'job_id': job_ids,
+    })
+
+
+LINKEDIN_CARD_HTML = """
+<li>
+  <div class="base-card relative w-full hover:no-underline focus:no-underline base-card--link base-search-card base-search-card--link job-search-card" data-entity-urn="urn:li:jobPosting:{job_id}" data-impression-id="jobs-search-result-{n}" data-reference-id="ERIv57vGl70IvsigEQCqJQ==" data-tracking-id="3PmL1k0xpyzDdzjs5uoo7Q==" data-column="1" data-row="{n}">
+    <a class="base-card__full-link absolute top-0 right-0 bottom-0 left-0 p-0 z-[2]" href="{link}?position={n}&amp;pageNum=0&amp;refId=ERIv57vGl70IvsigEQCqJQ%3D%3D&amp;trackingId=3PmL1k0xpyzDdzjs5uoo7Q%3D%3D" data-tracking-control-name="public_jobs_jserp-result_search-card" data-tracking-client-ingraph data-tracking-will-navigate>
+      <span class="sr-only">
+          {title}
+      </span>
+    </a>
+    <div class="search-entity-media">
+        <img class="artdeco-entity-image artdeco-entity-image--square-4 lazy-loaded" data-delayed-url="https://media.licdn.com/dms/image/v2/logo_{n}.png" data-ghost-classes="artdeco-entity-image--ghost" data-ghost-url="https://static.licdn.com/aero-v1/sc/h/company-ghost.svg" alt="">
+    </div>
+    <div class="base-search-card__info">
+      <h3 class="base-search-card__title">
+            {title}
+      </h3>
+      <h4 class="base-search-card__subtitle">
+          <a class="hidden-nested-link" data-tracking-client-ingraph data-tracking-control-name="public_jobs_jserp-result_job-search-card-subtitle" data-tracking-will-navigate href="https://il.linkedin.com/company/company-{n}?trk=public_jobs_jserp-result_job-search-card-subtitle">
+            {company}
+          </a>
+      </h4>
+      <div class="base-search-card__metadata">
+          <span class="job-search-card__location">
+            {location}
+          </span>
+          <div class="job-posting-benefits text-sm">
+            <icon class="job-posting-benefits__icon" data-delayed-url="https://static.licdn.com/aero-v1/sc/h/8zmuwb93gpbkz6ohmb6xp7u2l" data-svg-class-name="job-posting-benefits__icon-svg"></icon>
+            <span class="job-posting-benefits__text">Actively Hiring</span>
+          </div>
+          <time class="job-search-card__listdate--new" datetime="2025-08-11">
+              3 hours ago
+          </time>
+      </div>
+    </div>
+  </div>
+</li>"""
+
+GOOGLE_CARD_HTML = """
+<li class="lLd3Je"><div class="sMn82b"><div class="ObfsIf-oKdM2c"><div class="ObfsIf-eEDwDf ObfsIf-eEDwDf-PvhD9-purZT-OiUrBf"><h3 class="QJPWVe">{title}</h3></div><div class="op1BBf"><span class="RP7SMd"><i class="google-material-icons notranslate VpWL9" aria-hidden="true">corporate_fare</i><span>Google</span></span><div class="vbZS6e"><span class="pwO9Dc"><i class="google-material-icons notranslate VpWL9" aria-hidden="true">place</i><span class="r0wTof ">{location}</span></span></div></div><div class="Xsxa1e"><h4>Minimum qualifications</h4><ul><li>Bachelor's degree in Statistics, Computer Science or equivalent practical experience.</li><li>5 years of work experience with analysis applications.</li></ul></div></div><div class="sMn82b-Btuy5e"><a class="WpHeLc VfPpkd-mRLv6 VfPpkd-RLmnJb" href="jobs/results/{job_id}-{slug}?q=%27Data+Scientist%27&amp;location=Israel" aria-label="Learn more about {title}" jsname="hSRGPd"></a></div></div></li>"""
+
+PAGE_HTML = """<!DOCTYPE html>
+<!-- Synthetic fixture written by `python bench.py fixtures` from store rows; not a saved page -->
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Synthetic search results</title>
+<style>{style}</style>
+<script>{script}</script>
+</head>
+<body>
+<main class="main" id="main-content" role="main">
+<section class="two-pane-serp-page__results-list">
+<ul class="{list_class}">{cards}
+</ul>
+</section>
+</main>
+</body>
+</html>
+"""
+
+
+def url_slug(text):
+    """The lowercase, dash-separated form of text that job URLs use"""
+    return re.sub(r'[^a-z0-9]+', '-', str(text).lower()).strip('-')
+
+
+def make_fixtures(store_dir, fixtures_dir=FIXTURES_DIR, linkedin_cards=250, google_cards=20):
+    """Write synthetic fixtures shaped like LinkedIn and Google Careers results.
+
+    The pages are not saved from either site: store rows are filled into
+    LinkedIn/Google card markup copied by hand (LINKEDIN_CARD_HTML,
+    GOOGLE_CARD_HTML), with filler style and script to give the pages a
+    realistic size. They track the selectors html_parsing.py expects, not
+    whatever markup the sites serve today. The store doesn't keep links, so
+    card links are made up from each row's title, company and job_id.
+    """
+    from job_store import JobStore
+    df = JobStore(store_dir).read()
+    os.makedirs(fixtures_dir, exist_ok=True)
+    filler_style = '.artdeco-entity-image{width:48px;height:48px}' * 200
+    filler_script = 'window.__li_data = ' + repr(['x' * 64] * 300) + ';'
+    linkedin = df[df['source'] == 'LinkedIn'].tail(linkedin_cards).reset_index(drop=True)
+    cards = ''.join(LINKEDIN_CARD_HTML.format(
+        n=n + 1, job_id=row.job_id, title=html.escape(row.title),
+        link=f'https://il.linkedin.com/jobs/view/{url_slug(row.title)}-at-{url_slug(row.company)}-{row.job_id}',
+        company=html.escape(str(row.company)), location=html.escape(str(row.location)))
+        for n, row in enumerate(linkedin.itertuples()))
+    with open(os.path.join(fixtures_dir, 'linkedin_search.html'), 'w', encoding='utf-8') as f:
+        f.write(PAGE_HTML.format(style=filler_style, script=filler_script,
+                                 list_class='jobs-search__results-list', cards=cards))
+    google = df[df['source'] == 'Google Careers'].tail(google_cards).reset_index(drop=True)
+    cards = ''.join(GOOGLE_CARD_HTML.format(
+        job_id=row.job_id, slug=url_slug(row.title),
+        title=html.escape(row.title), location=html.escape(str(row.location)))
+        for row in google.itertuples())
+    with open(os.path.join(fixtures_dir, 'google_careers.html'), 'w', encoding='utf-8') as f:
+        f.write(PAGE_HTML.format(style=filler_style, script=filler_script, list_class='spHGqe', cards=cards))
+    print(f"Wrote {len(linkedin)} LinkedIn and {len(google)} Google Careers cards to {fixtures_dir}/")
+
+
+def legacy_parse_linkedin(page_source):
+    """The original BeautifulSoup find-chain parser, kept for comparison"""
+    soup = BeautifulSoup(page_source, 'html.parser')
+    job_cards = soup.find_all('li', class_='jobs-search-results__list-item') or \
+                soup.find_all('div', class_='base-card') or \
+                soup.find_all('div', class_='job-card-container')
+    jobs = []
+    for card in job_cards:
+        link_elem = card.find('a', class_='base-card__full-link') or \
+                    card.find('a', class_='job-card-container__link')
+        title_elem = card.find('h3', class_='base-search-card__title') or \
+                     card.find('h3', class_='job-card-list__title')
+        company_elem = card.find('h4', class_='base-search-card__subtitle') or \
+                       card.find('a', class_='job-card-container__company-name')
+        location_elem = card.find('span', class_='job-search-card__location') or \
+                        card.find('li', class_='job-card-container__metadata-item')
+        jobs.append({
+            'link': link_elem['href'] if link_elem and 'href' in link_elem.attrs else None,
+            'title': title_elem.text.strip() if title_elem else None,
+            'company': company_elem.text.strip() if company_elem else None,
+            'location': location_elem.text.strip() if location_elem else None,
+        })
+    return jobs
+
+
+def bench_parse(fixtures_dir=FIXTURES_DIR, repeat=5):
+    """Cards/second for each installed parser backend over the synthetic fixtures.
+
+    Each backend's cards are also compared with the first one's. The
+    fixtures are generated from the card templates above, so a match only
+    shows the backends agree on that markup, not on the live sites' pages.
+    """
+    results = []
+    fixtures = [('linkedin', 'linkedin_search.html', LINKEDIN_CARD_SPEC),
+                ('google', 'google_careers.html', GOOGLE_CARD_SPEC)]
+    for source, name, spec in fixtures:
+        with open(os.path.join(fixtures_dir, name), encoding='utf-8') as f:
+            page = f.read()
+        parsers = [(backend, CardParser(spec, backend).parse) for backend in available_backends()]
+        if source == 'linkedin':
+            parsers.append(('legacy html.parser', legacy_parse_linkedin))
+        expected = None
+        for backend, parse in parsers:
+            cards, seconds = timed(lambda: [parse(page) for _ in range(repeat)])
+            cards = cards[0]
+            if expected is None:
+                expected = cards
+            elif [dict(sorted(c.items())) for c in cards] != [dict(sorted(c.items())) for c in expected]:
+                print(f"  warning: {backend} output differs from {parsers[0][0]}")
+            rate = len(cards) * repeat / seconds
+            results.append({'source': source, 'backend': backend, 'cards': len(cards), 'cards_per_second': rate})
+            print(f"{source:>8} {backend:<20} {len(cards):>4} cards  {rate:>10,.0f} cards/s")
+    return results
+
+
+def noisy_links(df, copies=2, seed=0):
+    """Repeat rows with fresh tracking params, like LinkedIn links across runs"""
+    rng = np.random.default_rng(seed)
+    frames = [df]
+    for _ in range(copies - 1):
+        tracking = rng.integers(0, 10**9, size=len(df)).astype(str).astype(object)
+        frames.append(df.assign(link=df['link'] + '?refId=' + tracking + '&trackingId=' + tracking))
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def bench_dedup(n=100_000):
+    """Link-based drop_duplicates vs canonical id index on n rows with link noise"""
+    from job_index import JobIndex, canonicalize_jobs
+    jobs = synthetic_jobs(n // 2)
+    jobs['job_id'] = jobs['job_id'].where(~jobs['job_id'].duplicated(), None)
+    jobs = jobs.dropna(subset=['job_id'])
+    jobs['link'] = 'https://il.linkedin.com/jobs/view/data-scientist-at-x-' + jobs['job_id']
+    df = noisy_links(jobs)
+    legacy, legacy_s = timed(lambda: df.drop_duplicates(subset=['link']))
+    indexed, index_s = timed(lambda: JobIndex().filter_new(canonicalize_jobs(df)))
+    print(f"dedup {len(df):,} rows: drop_duplicates(link) {legacy_s:.3f}s -> {len(legacy):,} rows, "
+          f"id index {index_s:.3f}s -> {len(indexed):,} rows")
+    return {'rows': len(df), 'legacy_seconds': legacy_s, 'legacy_rows': len(legacy),
+            'index_seconds': index_s, 'index_rows': len(indexed)}
+
+
+def bench_merge(history=100_000, run_yield=200):
+    """Cost of merging one run into a history of `history` rows, old vs store"""
+    from job_store import JobStore, merge_new_jobs
+    from job_index import JobIndex
+    jobs = synthetic_jobs(history + run_yield)
+    jobs = jobs.drop_duplicates(subset=['job_id']).reset_index(drop=True)
+    jobs['run_time'] = jobs['run_time'].dt.strftime('%Y-%m-%d %H:%M')
+    past, new = jobs.iloc[:-run_yield], jobs.iloc[-run_yield:].assign(run_time='2026-01-01 01:00')
+    tmp = tempfile.mkdtemp()
+    try:
+        csv_file = os.path.join(tmp, 'legacy.csv')
+        past.to_csv(csv_file, index=False)
+
+        def legacy_merge():
+            existing = pd.read_csv(csv_file)
+            combined = pd.concat([existing, new]).drop_duplicates(subset=['link'])
+            combined.to_csv(csv_file, index=False)
+
+        _, legacy_s = timed(legacy_merge)
+        store = JobStore(os.path.join(tmp, 'store'))
+        index = JobIndex(store.index_path)
+        store.append(index.filter_new(past))
+        index.save()
+        export = os.path.join(tmp, 'export.csv')
+        past.to_csv(export, index=False)
+        _, store_s = timed(lambda: merge_new_jobs(JobStore(store.root), new, export))
+    finally:
+        shutil.rmtree(tmp)
+    print(f"merge {run_yield} rows into {len(past):,}: read/concat/rewrite {legacy_s:.3f}s, "
+          f"append-only store {store_s:.3f}s")
+    return {'history_rows': len(past), 'run_rows': run_yield,
+            'legacy_seconds': legacy_s, 'store_seconds': store_s}
+
+
+def bench_end_to_end(fixtures_dir=FIXTURES_DIR):
+    """Replay a synthetic recording through JobScraper and merge the result"""
+    from replay import synthesize_recording, replay_scraper
+    from job_store import JobStore, merge_new_jobs
+    queries = [{'website': 'linkedin.com', 'position': 'Data Scientist', 'country': 'Israel', 'max_results': None},
+               {'website': 'google.com', 'position': 'Data Scientist', 'country': 'Israel', 'max_results': None}]
+    tmp = tempfile.mkdtemp()
+    try:
+        synthesize_recording(tmp, fixtures_dir, queries)
+        start = time.perf_counter()
+        with replay_scraper(tmp) as scraper:
+            frames = [scraper.scrape(q['website'], q['position'], q['country'], q['max_results']) for q in queries]
+        scrape_s = time.perf_counter() - start
+        new_jobs, merge_s = timed(merge_new_jobs, JobStore(os.path.join(tmp, 'store')), pd.concat(frames))
+    finally:
+        shutil.rmtree(tmp)
+    print(f"end-to-end replay: scrape {scrape_s:.3f}s, merge {merge_s:.3f}s, {len(new_jobs)} jobs")
+    return {'scrape_seconds': scrape_s, 'merge_seconds': merge_s, 'jobs': len(new_jobs)}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_suite(json_path=None):
+    """Run every scraper benchmark and optionally save the results as JSON"""
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'results': {
+            'parse': bench_parse(repeat=3),
+            'dedup': bench_dedup(),
+            'merge': bench_merge(),
+            'end_to_end': bench_end_to_end(),
+        },
+    }
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+        print(f"Wrote {json_path}")
+    return report
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def legacy_keyword_counts(titles):
+    """The dashboard's original keyword chart data, stop words filtered after head(20)"""
+    all_titles = ' '.join(titles.astype(str)).lower()
+    words = re.findall(r'\b[a-z]{4,}\b', all_titles)
+    word_counts = pd.Series(words).value_counts().head(20)
+    stop_words = ['senior', 'lead', 'israel', 'tel', 'aviv', 'and', 'for', 'with', 'team', 'developer']
+    return word_counts[~word_counts.index.isin(stop_words)]
+
+
+def bench_keywords(n=100_000):
+    """Keyword counting on n synthetic titles: the old whole-string regex vs keywords.py"""
+    titles = synthetic_jobs(n)['title']
+    legacy, legacy_s = timed(legacy_keyword_counts, titles)
+    keywords_only, keywords_s = timed(keyword_counts, titles, (1,))
+    counts, ngrams_s = timed(keyword_counts, titles)
+    result = {'titles': n, 'legacy_s': legacy_s, 'keywords_s': keywords_s, 'keywords_and_phrases_s': ngrams_s,
+              'legacy_bars': len(legacy), 'keyword_bars': len(keywords_only[1].most_common(20))}
+    print(f"{n:,} titles: legacy {legacy_s:.3f}s ({len(legacy)} bars), keywords {keywords_s:.3f}s "
+          f"({result['keyword_bars']} bars), keywords + 2/3-grams {ngrams_s:.3f}s")
+    return result
+
+
+def bench_frame(sizes, store_dir='job_store'):
+    """Memory and groupby/value_counts time of object-string vs typed jobs frames"""
+    from job_store import JobStore
+    frames = [(f"{n:,} synthetic", synthetic_jobs(n).astype({'run_time': str})) for n in sizes]
+    store = JobStore(store_dir)
+    if store.exists:
+        # The store no longer keeps links: add them back to measure the frame as it was loaded before
+        stored = store.read()
+        frames.insert(0, (f"store ({store.row_count:,})", stored.assign(link=job_links(stored))))
+    operations = {
+        'company value_counts': lambda df: df['company'].value_counts(),
+        'source value_counts': lambda df: df['source'].value_counts(),
+        'runs groupby': lambda df: df.groupby('run_time', observed=True).size(),
+        'company x source groupby': lambda df: df.groupby(['company', 'source'], observed=True).size(),
+    }
+    results = []
+    for label, raw in frames:
+        typed, convert_s = timed(typed_jobs, raw)
+        result = {'frame': label, 'raw_mb': memory_mb(raw), 'typed_mb': memory_mb(typed), 'convert_s': convert_s}
+        print(f"{label}: {result['raw_mb']:.1f} MB -> {result['typed_mb']:.1f} MB "
+              f"(conversion {convert_s:.3f}s)")
+        for name, operation in operations.items():
+            raw_s = min(timed(operation, raw)[1] for _ in range(3))
+            typed_s = min(timed(operation, typed)[1] for _ in range(3))
+            result[name] = {'raw_s': raw_s, 'typed_s': typed_s}
+            print(f"  {name}: {raw_s * 1000:.1f} ms -> {typed_s * 1000:.1f} ms ({raw_s / typed_s:.1f}x)")
+        results.append(result)
+    return results
+
+
+def bench_clusters(sizes, repost_share=0.1):
+    """MinHash/LSH near-duplicate clustering on synthetic jobs with injected reposts.
+
+    A share of the rows is re-posted under a new job id with a cosmetically
+    changed title; recall is the share of reposts that land in their
+    original's cluster.
+    """
+    from job_clusters import job_records, candidate_pairs, cluster_labels
+    results = []
+    for n in sizes:
+        originals = synthetic_jobs(n)
+        reposts = originals.sample(frac=repost_share, random_state=1)
+        reposts = reposts.assign(title=reposts['title'].str.replace('senior', 'Sr.', regex=False) + ' - Hybrid')
+        jobs = pd.concat([originals, reposts], ignore_index=True)
+        records, hash_s = timed(job_records, jobs)
+        (firsts, _), pairs_s = timed(candidate_pairs, records)
+        labels, cluster_s = timed(cluster_labels, records)
+        _, run_s = timed(job_records, jobs.tail(200))
+        recall = float((labels[len(originals):] == labels[reposts.index.values]).mean())
+        result = {'rows': len(jobs), 'hash_s': hash_s, 'hash_200_rows_s': run_s, 'cluster_s': cluster_s,
+                  'candidate_pairs': len(firsts), 'all_pairs': len(jobs) * (len(jobs) - 1) // 2,
+                  'clusters': int(len(np.unique(labels))), 'repost_recall': recall}
+        print(f"{len(jobs):>9,} rows: hash {hash_s:.2f}s (one run of 200: {run_s * 1000:.0f} ms), "
+              f"cluster {cluster_s:.2f}s, {len(firsts):,} candidate pairs of {result['all_pairs']:,}, "
+              f"{result['clusters']:,} clusters, repost recall {recall:.1%}")
+        results.append(result)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the scraper and dashboard")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    fixtures_parser = subparsers.add_parser('fixtures', help="regenerate the synthetic page fixtures from the store")
+    fixtures_parser.add_argument('--store', default='job_store')
+
+    parse_parser = subparsers.add_parser('parse', help="card parsing throughput per parser backend")
+    parse_parser.add_argument('--repeat', type=int, default=5)
+
+    keywords_parser = subparsers.add_parser('keywords', help="title keyword and phrase counting")
+    keywords_parser.add_argument('--titles', type=int, default=100_000)
+
+    frame_parser = subparsers.add_parser('frame', help="memory and aggregation time of the typed jobs frame")
+    frame_parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+
+    clusters_parser = subparsers.add_parser('clusters', help="near-duplicate clustering on synthetic reposts")
+    clusters_parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 500_000])
+
+    suite_parser = subparsers.add_parser('suite', help="parse, dedup, merge and end-to-end replay benchmarks")
+    suite_parser.add_argument('--json', help="write the results to this file")
+
+    args = parser.parse_args(argv)
+    if args.benchmark == 'suite':
+        bench_suite(args.json)
+    elif args.benchmark == 'fixtures':
+        make_fixtures(args.store)
+    elif args.benchmark == 'keywords':
+        bench_keywords(args.titles)
+    elif args.benchmark == 'frame':
+        bench_frame(args.sizes)
+    elif args.benchmark == 'clusters':
+        bench_clusters(args.sizes)
+    elif args.benchmark == 'parse':
+        bench_parse(repeat=args.repeat)
+
+
+if __name__ == "__main__":
+    main()
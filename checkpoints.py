@@ -0,0 +1,124 @@
+import os
+import re
+import json
+import pandas as pd
+
+CHECKPOINT_DIR = '.checkpoints'
+
+# Rows handed to merge_new_jobs at a time when a checkpoint is merged
+MERGE_CHUNK_ROWS = 500
+
+
+def checkpoint_name(label):
+    """File name for a query label ("linkedin.com Data Scientist Israel" -> "linkedin-com-data-scientist-israel.jsonl")"""
+    return re.sub(r'[^a-z0-9]+', '-', label.lower()).strip('-') + '.jsonl'
+
+
+class Checkpoint:
+    """Jobs scraped so far by one query, streamed to an append-only JSONL file.
+
+    Each append writes one line per job and flushes it, and every
+    `fsync_every` appends the file is also synced to disk, so a crash loses
+    at most the scroll in progress. Opening an existing checkpoint resumes
+    it: its job ids are loaded (a line cut short by a crash is dropped) so
+    the scraper skips them. Only the ids are kept in memory; the rows are
+    read back in chunks when the checkpoint is merged, then it is removed.
+    With path=None the rows are kept in memory instead, for callers that
+    don't need to survive a crash (replay, benchmarks).
+    """
+
+    def __init__(self, path=None, fsync_every=5):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.job_ids = set()
+        self.rows = 0
+        self._memory = [] if path is None else None
+        self._file = None
+        self._unsynced = 0
+        if path is not None and os.path.exists(path):
+            self._resume()
+
+    @classmethod
+    def open(cls, directory, label):
+        """The checkpoint of the query `label` in directory, or an in-memory one if directory is None"""
+        return cls(os.path.join(directory, checkpoint_name(label)) if directory else None)
+
+    def _resume(self):
+        good_bytes = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    job = json.loads(line)
+                except ValueError:
+                    break
+                good_bytes += len(line)
+                self.job_ids.add(job.get('job_id'))
+                self.rows += 1
+        if good_bytes < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_bytes)
+
+    def __len__(self):
+        return self.rows
+
+    def append(self, jobs):
+        if not jobs:
+            return
+        self.job_ids.update(job.get('job_id') for job in jobs)
+        self.rows += len(jobs)
+        if self._memory is not None:
+            self._memory.extend(jobs)
+            return
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.writelines(json.dumps(job, ensure_ascii=False) + '\n' for job in jobs)
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def chunks(self, size=MERGE_CHUNK_ROWS):
+        """The scraped jobs as DataFrames of up to `size` rows"""
+        if self._memory is not None:
+            for start in range(0, len(self._memory), size):
+                yield pd.DataFrame(self._memory[start:start + size])
+            return
+        self.close()
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as f:
+            batch = []
+            for line in f:
+                batch.append(json.loads(line))
+                if len(batch) == size:
+                    yield pd.DataFrame(batch)
+                    batch = []
+            if batch:
+                yield pd.DataFrame(batch)
+
+    def frame(self):
+        """All scraped jobs as one DataFrame"""
+        frames = list(self.chunks())
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def remove(self):
+        """Delete the checkpoint once its jobs are merged"""
+        self.close()
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+        self._memory = [] if self.path is None else None
+        self.job_ids = set()
+        self.rows = 0
@@ -0,0 +1,122 @@
+import time
+
+# Taken before anything else is imported: CPU time so far is the interpreter's own startup
+STARTUP_CPU_SECONDS = time.process_time()
+CLI_START = time.perf_counter()
+
+import os
+import sys
+import argparse
+from contextlib import contextmanager
+from run_report import PROFILERS
+
+SOURCES = {'linkedin': 'linkedin.com', 'google': 'google.com'}
+
+
+class Timings:
+    """Wall time per phase of a CLI command"""
+
+    def __init__(self):
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def report(self):
+        phases = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in self.phases.items())
+        return (f"Timings: interpreter startup {STARTUP_CPU_SECONDS:.2f}s CPU, cold start to command "
+                f"{self.phases.get('imports', 0.0) + self.ready - CLI_START:.2f}s, {phases}, "
+                f"total {time.perf_counter() - CLI_START:.2f}s")
+
+
+def scrape(args, timings):
+    with timings.phase('imports'):
+        from scraper import run_scrape
+    with timings.phase('run'):
+        run_scrape(sources=[SOURCES[source] for source in args.source or []], config_path=args.config,
+                   csv_file=args.csv, profile=args.profile)
+
+
+def merge(args, timings):
+    with timings.phase('imports'):
+        import pandas as pd
+        from job_store import STORE_DIR, open_store, merge_new_jobs
+        from job_lifecycle import open_lifecycle
+    with timings.phase('run'):
+        store = open_store(STORE_DIR, args.csv)
+        lifecycle = open_lifecycle(store)
+        for path in args.files:
+            new_jobs = merge_new_jobs(store, pd.read_csv(path, dtype={'job_id': str}), args.csv, lifecycle)
+            print(f"Merged {path}: {len(new_jobs)} new jobs", flush=True)
+        print(f"Total unique jobs: {store.row_count}", flush=True)
+
+
+def dashboard(args, timings):
+    with timings.phase('imports'):
+        import dashboard
+    with timings.phase('run'):
+        dashboard.main(args.listings, args.profile, args.config, args.workers)
+
+
+def bench(args, timings):
+    with timings.phase('imports'):
+        import bench
+    with timings.phase('run'):
+        bench.main(args.bench_args)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Scrape jobs, merge results and build the dashboard")
+    parser.add_argument('--timings', action='store_true', help="print cold-start and per-phase timings")
+    parser.add_argument('--profile', choices=PROFILERS,
+                        help="profile scrape and dashboard runs (saved next to their run report)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    scrape_parser = subparsers.add_parser('scrape', help="run the configured scrape queries")
+    scrape_parser.add_argument('--source', choices=sorted(SOURCES), action='append',
+                               help="only run queries for this source (repeatable; default: all)")
+    scrape_parser.add_argument('--config', default='scrape_jobs.json')
+    scrape_parser.add_argument('--csv', default='Data_Science_Jobs_Israel.csv', help="legacy CSV export")
+    scrape_parser.set_defaults(func=scrape)
+
+    merge_parser = subparsers.add_parser('merge', help="merge scraped-jobs CSV files into the store")
+    merge_parser.add_argument('files', nargs='+')
+    merge_parser.add_argument('--csv', default='Data_Science_Jobs_Israel.csv', help="legacy CSV export")
+    merge_parser.set_defaults(func=merge)
+
+    dashboard_parser = subparsers.add_parser('dashboard', help="build the dashboard of every configured market")
+    dashboard_parser.add_argument('--listings', choices=['shards', 'inline'], default='shards')
+    dashboard_parser.add_argument('--config', default='scrape_jobs.json')
+    dashboard_parser.add_argument('--workers', type=int, help="processes building markets (default: one per CPU)")
+    dashboard_parser.set_defaults(func=dashboard)
+
+    # Everything after `bench` goes to bench.py's own parser, which is only imported then
+    bench_parser = subparsers.add_parser('bench', help="run bench.py (arguments are passed through)",
+                                         add_help=False)
+    bench_parser.set_defaults(func=bench)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if extra and args.command != 'bench':
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    args.bench_args = extra
+    timings = Timings()
+    timings.ready = time.perf_counter()
+    try:
+        args.func(args, timings)
+    finally:
+        if args.timings:
+            print(timings.report(), flush=True)
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    main()
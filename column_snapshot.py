@@ -0,0 +1,88 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+META_FILE = 'columns.json'
+
+
+class ColumnSnapshot:
+    """A frame saved as one .npy file per column, memory-mapped by every reader.
+
+    Numeric and datetime columns are saved as they are. Text columns are
+    dictionary-encoded: int32 codes in the .npy file (-1 for missing) and
+    the distinct values, in order, in columns.json. Processes that open
+    the same snapshot share its pages through the OS cache instead of each
+    parsing and holding its own copy, and select their rows by comparing
+    codes without decoding any text.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+        self.rows = meta['rows']
+        self.columns = meta['columns']
+        self.dictionaries = meta['dictionaries']
+
+    @classmethod
+    def write(cls, df, directory):
+        os.makedirs(directory, exist_ok=True)
+        dictionaries = {}
+        for column in df.columns:
+            values = df[column]
+            if values.dtype.kind in 'biufM':
+                array = values.to_numpy()
+            else:
+                codes, uniques = pd.factorize(values.astype(object))
+                array = codes.astype(np.int32)
+                dictionaries[column] = [str(value) for value in uniques]
+            np.save(os.path.join(directory, f"{column}.npy"), array)
+        with open(os.path.join(directory, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump({'rows': len(df), 'columns': list(df.columns), 'dictionaries': dictionaries}, f,
+                      ensure_ascii=False)
+        return cls(directory)
+
+    def array(self, column):
+        """The column's values (codes, for a text column), memory-mapped"""
+        return np.load(os.path.join(self.directory, f"{column}.npy"), mmap_mode='r')
+
+    def rows_where(self, **values):
+        """Positions of the rows whose text columns equal the given values"""
+        mask = np.ones(self.rows, dtype=bool)
+        for column, value in values.items():
+            dictionary = self.dictionaries[column]
+            if value not in dictionary:
+                return np.empty(0, dtype=np.int64)
+            mask &= self.array(column) == dictionary.index(value)
+        return np.flatnonzero(mask)
+
+    def frame(self, rows=None, columns=None):
+        """The snapshot (or its rows at positions `rows`) as a frame; text columns become categories"""
+        data = {}
+        for column in columns or self.columns:
+            values = self.array(column)
+            values = np.asarray(values[rows] if rows is not None else values)
+            if column in self.dictionaries:
+                categories = pd.Index(self.dictionaries[column], dtype=object)
+                values = pd.Categorical.from_codes(values, categories).remove_unused_categories()
+            data[column] = values
+        return pd.DataFrame(data)
+
+    def digest(self, rows=None, columns=None):
+        """Hash of the values at positions `rows`: it changes only if one of those rows does"""
+        sha = hashlib.sha1()
+        for column in columns or self.columns:
+            values = self.array(column)
+            values = np.ascontiguousarray(values[rows] if rows is not None else values)
+            sha.update(column.encode('utf-8'))
+            if column in self.dictionaries:
+                # Codes are only meaningful with the values they stand for
+                used = np.unique(values)
+                dictionary = self.dictionaries[column]
+                sha.update(json.dumps([dictionary[code] if code >= 0 else None for code in used],
+                                      ensure_ascii=False).encode('utf-8'))
+                values = np.searchsorted(used, values).astype(np.int32)
+            sha.update(values.tobytes())
+        return sha.hexdigest()[:12]
@@ -1,43 +1,421 @@
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime
-import re
-
-# Load data
-df = pd.read_csv('Data_Science_Jobs_Israel.csv')
-df['run_time'] = pd.to_datetime(df['run_time'], errors='coerce', format='mixed')
-df['run_id'] = df['run_time'].dt.strftime("%Y-%m-%d %H:%M")
-last_updated_time = df['run_id'].max()
-
-html_content = f"""
+import os
+import html
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from job_store import STORE_DIR, open_store
+from job_frame import typed_jobs, job_links, memory_mb
+from column_snapshot import ColumnSnapshot
+from markets import DEFAULT_MARKET, config_markets
+from scheduler import CONFIG_FILE, load_config
+from dashboard_state import STATE_VERSION, DashboardState
+from trends import TrendState
+from job_lifecycle import ACTIVE_WINDOW, open_lifecycle, lifecycle_metrics
+from job_clusters import JobClusters
+from html_render import write_html
+from run_report import PROFILERS, RunReport, report_path, profiled
+from listing_shards import (DATA_DIR, PAGED_TABLE_HTML, PAGED_TABLE_JS, listing_records, write_listing_shards,
+                            write_charts, load_charts)
+
+OUTPUT_FILE = DEFAULT_MARKET.output_file
+CSV_FILE = DEFAULT_MARKET.csv_file
+BUNDLE_FILE = 'bundle.json'
+BUNDLE_VERSION = 1
+LATEST_JOBS = 10
+
+
+def counter_series(counter, index_name, n=None):
+    """Turn a Counter into a value_counts()-style Series, largest first"""
+    series = pd.Series(counter, name='count', dtype='int64').sort_values(ascending=False, kind='stable')
+    series.index.name = index_name
+    return series.head(n) if n else series
+
+
+def parse_seconds(path):
+    """Time a full parse of an output file, as a proxy for the browser's cost"""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    start = time.perf_counter()
+    if path.endswith('.json'):
+        json.loads(text)
+    else:
+        HTMLParser().feed(text)
+    return time.perf_counter() - start
+
+
+def format_days(days):
+    return '-' if days is None else f"{days:.1f}"
+
+
+def content_hash(data):
+    """Short hash of a JSON-serializable value or a string"""
+    if not isinstance(data, str):
+        data = json.dumps(data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()[:12]
+
+
+def frame_input(df, decimals=None):
+    """A date-indexed frame as a small JSON-serializable figure input"""
+    if decimals is not None:
+        df = df.round(decimals)
+    return {'index': df.index.strftime('%Y-%m-%d').tolist(), 'columns': [str(col) for col in df.columns],
+            'data': df.values.tolist()}
+
+
+def input_frame(data):
+    return pd.DataFrame(data['data'], index=pd.to_datetime(data['index']), columns=data['columns'])
+
+
+def input_series(pairs, index_name=None):
+    series = pd.Series(dict(pairs), name='count', dtype='int64')
+    series.index.name = index_name
+    return series
+
+
+# Figure builders. Each one takes the JSON input recorded in the bundle and
+# returns a Plotly figure; plotly is imported only when a figure is rebuilt.
+
+def daily_figure(data):
+    import plotly.graph_objects as go
+    daily = input_frame(data['daily'])
+    rolling = input_frame(data['rolling'])
+    distinct = input_frame(data['distinct'])
+    fig = go.Figure([
+        go.Bar(x=daily.index, y=daily['count'], name='New jobs', marker_color='#2575fc', opacity=0.6),
+        go.Scatter(x=distinct.index, y=distinct['count'], name='New distinct postings', mode='lines',
+                   line=dict(color='#ff7f0e', width=2, dash='dot')),
+        go.Scatter(x=rolling.index, y=rolling['count'], name='7-day average', mode='lines',
+                   line=dict(color='#6a11cb', width=3)),
+    ])
+    fig.update_layout(
+        title=f"New {data['label']} Jobs Per Day",
+        xaxis_title='Day',
+        yaxis_title='Jobs Found',
+        hovermode='x unified',
+        height=500
+    )
+    return fig
+
+
+def company_trends_figure(data):
+    import plotly.express as px
+    return px.line(
+        input_frame(data),
+        markers=True,
+        title='Weekly New Postings, Top 5 Companies',
+        labels={'index': 'Week', 'value': 'Jobs', 'variable': 'Company'},
+        height=400
+    )
+
+
+def keyword_trends_figure(data):
+    import plotly.express as px
+    return px.line(
+        input_frame(data),
+        markers=True,
+        title='Weekly Keyword Mentions, Top 5 Keywords',
+        labels={'index': 'Week', 'value': 'Titles', 'variable': 'Keyword'},
+        height=400
+    )
+
+
+def company_activity_figure(data):
+    import plotly.express as px
+    df = pd.DataFrame(data, columns=['company', 'first_seen', 'last_seen', 'total'])
+    # Bars run to the end of the last day, so a company seen on one day still gets a bar
+    df['until'] = pd.to_datetime(df['last_seen']) + pd.Timedelta(days=1)
+    fig = px.timeline(
+        df,
+        x_start='first_seen',
+        x_end='until',
+        y='company',
+        color='total',
+        hover_data={'first_seen': True, 'last_seen': True, 'total': True, 'until': False},
+        labels={'company': 'Company', 'first_seen': 'First seen', 'last_seen': 'Last seen', 'total': 'Jobs'},
+        title='First and Last Seen, Top 15 Companies',
+        height=500
+    )
+    fig.update_yaxes(autorange='reversed')
+    return fig
+
+
+def companies_figure(data):
+    import plotly.express as px
+    fig = px.bar(
+        input_series(data, 'company'),
+        orientation='h',
+        labels={'index': 'Company', 'value': 'Distinct Postings'},
+        title='Top Companies (reposts and cross-source duplicates counted once)'
+    )
+    fig.update_layout(showlegend=False, height=400)
+    return fig
+
+
+def sources_figure(data):
+    import plotly.express as px
+    source_counts = input_series(data, 'source')
+    return px.pie(
+        source_counts,
+        names=source_counts.index,
+        values=source_counts.values,
+        title='Job Sources Distribution',
+        height=400
+    )
+
+
+def keywords_figure(data):
+    import plotly.express as px
+    fig = px.bar(
+        input_series(data),
+        orientation='h',
+        title='Most Common Keywords in Job Titles',
+        labels={'index': 'Keyword', 'value': 'Count'},
+        height=500
+    )
+    fig.update_layout(showlegend=False)
+    return fig
+
+
+def phrases_figure(data):
+    import plotly.express as px
+    fig = px.bar(
+        input_series(data),
+        orientation='h',
+        title='Most Common Phrases in Job Titles',
+        labels={'index': 'Phrase', 'value': 'Count'},
+        height=500
+    )
+    fig.update_layout(showlegend=False)
+    return fig
+
+
+FIGURES = {
+    'time-series-chart': daily_figure,
+    'company-trends-chart': company_trends_figure,
+    'keyword-trends-chart': keyword_trends_figure,
+    'company-activity-chart': company_activity_figure,
+    'companies-chart': companies_figure,
+    'sources-chart': sources_figure,
+    'keywords-chart': keywords_figure,
+    'phrases-chart': phrases_figure,
+}
+
+
+def distinct_daily(df, days):
+    """New distinct postings per day: each near-duplicate cluster counts on the day it was first seen"""
+    first_seen = df.groupby('cluster')['run_time'].min().dt.normalize()
+    return first_seen.value_counts().reindex(days, fill_value=0).rename('count').to_frame()
+
+
+def figure_inputs(state, trends, df, label=DEFAULT_MARKET.label):
+    """The small aggregate each figure is drawn from, keyed by div id.
+
+    df holds every listing with its near-duplicate cluster, for the
+    figures that count distinct postings rather than rows. Those are
+    counted over all of df on every build: a new job can merge two
+    existing clusters, so counts folded behind a watermark would drift.
+    label names the market's jobs in titles.
+    """
+    daily = trends.frame()
+    distinct_companies = df.groupby('company', observed=True)['cluster'].nunique()
+    return {
+        # Daily postings with a 7-day rolling average (runs happen every 12 hours, so days are comparable)
+        'time-series-chart': {'label': label,
+                              'daily': frame_input(daily),
+                              'rolling': frame_input(trends.frame(window=7), decimals=2),
+                              'distinct': frame_input(distinct_daily(df, daily.index))},
+        'company-trends-chart': frame_input(trends.frame('company', trends.top('company', 5), freq='W')),
+        'keyword-trends-chart': frame_input(trends.frame('keyword', trends.top('keyword', 5), freq='W')),
+        'company-activity-chart': trends.first_last_seen('company').head(15).values.tolist(),
+        'companies-chart': list(counter_series(distinct_companies.to_dict(), 'company', 10).items()),
+        'sources-chart': list(counter_series(state.sources, 'source').items()),
+        # Stop words were dropped when counting, so these are full top 20s
+        'keywords-chart': list(counter_series(state.keywords, None, 20).items()),
+        'phrases-chart': list(counter_series(state.phrases, None, 20).items()),
+    }
+
+
+def load_bundle(data_dir=DATA_DIR):
+    path = os.path.join(data_dir, BUNDLE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        bundle = json.load(f)
+    return bundle if bundle.get('version') == BUNDLE_VERSION else {}
+
+
+def build_charts(inputs, previous_bundle, data_dir=DATA_DIR):
+    """Build the figures whose input changed since the last build, reuse the rest.
+
+    Returns the charts written to charts.json and the input hash of each.
+    """
+    previous_hashes = previous_bundle.get('figures', {})
+    previous_charts = load_charts(data_dir) if previous_hashes else {}
+    charts, hashes, rebuilt = {}, {}, []
+    for div_id, build in FIGURES.items():
+        hashes[div_id] = content_hash(inputs[div_id])
+        if previous_hashes.get(div_id) == hashes[div_id] and div_id in previous_charts:
+            charts[div_id] = previous_charts[div_id]
+        else:
+            charts[div_id] = json.loads(build(inputs[div_id]).to_json())
+            rebuilt.append(div_id)
+    print(f"Figures: {len(rebuilt)} of {len(FIGURES)} rebuilt" + (f" ({', '.join(rebuilt)})" if rebuilt else ''))
+    return charts, hashes
+
+
+# Columns of the snapshot every market's dashboard is built from
+SNAPSHOT_COLUMNS = ['title', 'company', 'location', 'source', 'job_id', 'run_time', 'country', 'position']
+LIFECYCLE_COLUMNS = ['first_seen', 'last_seen', 'seen_count']
+
+
+def prepare_snapshot(directory, store_dir=STORE_DIR, csv_file=CSV_FILE, report=None):
+    """Load every stored job once, with its cluster and lifecycle, into a ColumnSnapshot in directory.
+
+    This is the work all markets share: reading the store, hashing new
+    jobs for near-duplicate clustering and joining the lifecycle table.
+    Rows stored before jobs were tagged with their market belong to the
+    default market.
+    """
+    report = report or RunReport('dashboard')
+    store = open_store(store_dir, csv_file)
+    with report.stage('load_jobs'):
+        df = store.read(columns=SNAPSHOT_COLUMNS)
+        df['job_id'] = df['job_id'].astype('int64')
+        df = df.fillna({'country': DEFAULT_MARKET.country, 'position': DEFAULT_MARKET.position})
+    report.count('snapshot_rows', len(df))
+    # Near-duplicate clusters: only jobs not hashed by an earlier build are hashed
+    with report.stage('clusters'):
+        clusters = JobClusters.load(store_dir)
+        hashed = clusters.add(df)
+        df['cluster'] = clusters.assign(df).values
+    print(f"Near-duplicates: hashed {hashed} new jobs")
+    with report.stage('join_lifecycle'):
+        table = open_lifecycle(store).frame().astype({'source': object}).set_index(['source', 'job_id'])
+        seen = table.reindex(pd.MultiIndex.from_arrays([df['source'], df['job_id']]))
+        for column in LIFECYCLE_COLUMNS:
+            df[column] = seen[column].values
+        # Jobs the table hasn't seen yet keep NaT dates; a fixed dtype keeps the markets' input hashes stable
+        df['seen_count'] = seen['seen_count'].fillna(0).astype('int64').values
+    with report.stage('write_snapshot'):
+        snapshot = ColumnSnapshot.write(df, directory)
+    print(f"Snapshot: {len(df)} jobs, {len(snapshot.dictionaries['company'])} companies, "
+          f"{len(snapshot.dictionaries['run_time'])} runs")
+    return snapshot
+
+
+def build_data(jobs, market=DEFAULT_MARKET, store_dir=STORE_DIR, listings='shards', report=None, input_hash=None):
+    """Fold new runs into a market's aggregates and write its data bundle.
+
+    jobs holds every row of the market, as read from the ColumnSnapshot.
+    The bundle (bundle.json) holds the header numbers, the latest jobs, the
+    listing index, the hash of each figure's input and `input_hash`; the
+    figures themselves go to charts.json and the listings to shards, all in
+    the market's data_dir. With listings='inline' the figures and every
+    listing row are put in the returned bundle instead, and nothing is
+    written to data_dir. Stage timings go to `report` (a
+    run_report.RunReport) when one is given.
+    """
+    report = report or RunReport('dashboard')
+    state_dir = market.state_dir(store_dir)
+    data_dir = market.data_dir
+    # Aggregates only fold the rows newer than their watermark
+    fold_rows = jobs[['title', 'company', 'source', 'run_time']].astype(object)
+    with report.stage('aggregates'):
+        state = DashboardState.load(os.path.join(state_dir, 'dashboard_state.json'), market.stop_words)
+        folded = state.update_from_rows(fold_rows)
+        state.save()
+        print(f"Folded {folded} new rows into dashboard aggregates (watermark {state.watermark})")
+    with report.stage('trends'):
+        trends = TrendState.load(os.path.join(state_dir, 'trends.json'), market.stop_words)
+        trends.update_from_rows(fold_rows)
+        trends.save()
+    with report.stage('lifecycle'):
+        lifecycle_stats = lifecycle_metrics(jobs[LIFECYCLE_COLUMNS].dropna())
+    print(f"Lifecycle: {lifecycle_stats}")
+    report.count('rows_folded', folded)
+
+    with report.stage('load_listings'):
+        df = typed_jobs(jobs[['title', 'company', 'location', 'source', 'job_id', 'run_time', 'cluster']])
+        print(f"Loaded {len(df)} listings ({memory_mb(df):.1f} MB in memory)")
+        df['link'] = job_links(df)
+        latest_jobs = df.sort_values('run_time', ascending=False, kind='stable').head(LATEST_JOBS)
+    report.count('listings', len(df))
+    distinct = df['cluster'].nunique()
+    print(f"Near-duplicates: {len(df)} listings are {distinct} distinct postings")
+    with report.stage('write_listings'):
+        if listings == 'inline':
+            listing_index = {'count': len(df), 'rows': listing_records(df.sort_values('run_time', kind='stable'))}
+        else:
+            listing_index = write_listing_shards(df, data_dir)
+
+    # An inline build is self-contained: it neither reuses nor writes anything in data_dir
+    with report.stage('figures'):
+        previous_bundle = load_bundle(data_dir) if listings != 'inline' else {}
+        charts, figure_hashes = build_charts(figure_inputs(state, trends, df, market.label), previous_bundle,
+                                             data_dir)
+        if listings == 'inline':
+            chart_ref = charts
+        else:
+            chart_ref = {'file': 'charts.json', 'hash': write_charts(charts, data_dir)}
+
+    bundle = {
+        'version': BUNDLE_VERSION,
+        'updated': state.watermark,
+        'total_jobs': state.rows,
+        'stats': {
+            'distinct': str(distinct),
+            'active': str(lifecycle_stats['active']),
+            'active_window_hours': f"{ACTIVE_WINDOW.total_seconds() / 3600:.0f}",
+            'median_days_open': format_days(lifecycle_stats['median_days_open']),
+        },
+        'latest': listing_records(latest_jobs),
+        'listings': listing_index,
+        'charts': chart_ref,
+        'figures': figure_hashes,
+        'input': input_hash,
+    }
+    if listings != 'inline':
+        with report.stage('write_bundle'):
+            payload = json.dumps(bundle, ensure_ascii=False, separators=(',', ':'))
+            with open(os.path.join(data_dir, BUNDLE_FILE), 'w', encoding='utf-8') as f:
+                f.write(payload)
+    return bundle
+
+
+SHELL_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Data Science Jobs in Israel</title>
+    <title>MARKET_LABEL Jobs in MARKET_COUNTRY</title>
     <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+    <script src="https://cdn.plot.ly/plotly-2.29.1.min.js"></script>
     <style>
-        body {{ background-color: #f8f9fa; }}
-        .card {{ border-radius: 15px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); margin-bottom: 25px; }}
-        .header {{ background: linear-gradient(135deg, #6a11cb 0%, #2575fc 100%); color: white; padding: 30px 0; margin-bottom: 30px; }}
-        .stat-card {{ text-align: center; padding: 20px; }}
-        .stat-value {{ font-size: 2.5rem; font-weight: bold; }}
-        .section-title {{ border-left: 5px solid #2575fc; padding-left: 15px; margin: 30px 0 20px; color: #2c3e50; }}
+        body { background-color: #f8f9fa; }
+        .card { border-radius: 15px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); margin-bottom: 25px; }
+        .header { background: linear-gradient(135deg, #6a11cb 0%, #2575fc 100%); color: white; padding: 30px 0; margin-bottom: 30px; }
+        .stat-card { text-align: center; padding: 20px; }
+        .stat-value { font-size: 2.5rem; font-weight: bold; }
+        .section-title { border-left: 5px solid #2575fc; padding-left: 15px; margin: 30px 0 20px; color: #2c3e50; }
     </style>
 </head>
 <body>
     <div class="header">
         <div class="container">
-            <h1 class="display-4">Data Science Job Market in Israel</h1>
+            <h1 class="display-4">MARKET_LABEL Job Market in MARKET_COUNTRY</h1>
             <div class="row mt-4">
                 <div class="col-md-6">
-                    <p class="lead">Total jobs collected: <strong>{df.link.nunique()}</strong></p>
+                    <p class="lead">Total jobs collected: <strong id="total-jobs"></strong>
+                        (<span data-stat="distinct"></span> distinct postings)</p>
                 </div>
                 <div class="col-md-6 text-md-end">
-                    <p class="lead">Updated: {last_updated_time}</p>
+                    <p class="lead">Updated: <span class="updated"></span></p>
                 </div>
             </div>
             <p>Data updated every 12 hours from LinkedIn and Google Careers</p>
@@ -45,18 +423,65 @@ html_content = f"""
     </div>
 
     <div class="container">
+        <!-- Lifecycle Section -->
+        <div class="row">
+            <div class="col-md-6">
+                <div class="card stat-card">
+                    <div class="stat-value" data-stat="active"></div>
+                    <div>Active postings (seen in the last <span data-stat="active_window_hours"></span> hours)</div>
+                </div>
+            </div>
+            <div class="col-md-6">
+                <div class="card stat-card">
+                    <div class="stat-value" data-stat="median_days_open"></div>
+                    <div>Median days open (time-to-fill of closed postings seen in more than one run)</div>
+                </div>
+            </div>
+        </div>
+
         <!-- Time Series Section -->
         <div class="row">
             <div class="col">
                 <div class="card">
                     <div class="card-body">
-                        <h2 class="section-title">Job Postings Per Scraping Run</h2>
+                        <h2 class="section-title">New Job Postings Per Day</h2>
                         <div id="time-series-chart"></div>
                     </div>
                 </div>
             </div>
         </div>
 
+        <!-- Trends Section -->
+        <div class="row">
+            <div class="col-md-6">
+                <div class="card">
+                    <div class="card-body">
+                        <h2 class="section-title">Weekly Postings by Company</h2>
+                        <div id="company-trends-chart"></div>
+                    </div>
+                </div>
+            </div>
+            <div class="col-md-6">
+                <div class="card">
+                    <div class="card-body">
+                        <h2 class="section-title">Weekly Keyword Trends</h2>
+                        <div id="keyword-trends-chart"></div>
+                    </div>
+                </div>
+            </div>
+        </div>
+
+        <div class="row">
+            <div class="col">
+                <div class="card">
+                    <div class="card-body">
+                        <h2 class="section-title">When Companies Were Hiring</h2>
+                        <div id="company-activity-chart"></div>
+                    </div>
+                </div>
+            </div>
+        </div>
+
         <!-- Breakdown Section -->
         <div class="row">
             <div class="col-md-6">
@@ -89,44 +514,25 @@ html_content = f"""
             </div>
         </div>
 
-        <!-- Recent Jobs Section -->
+        <!-- Phrases Section -->
         <div class="row">
             <div class="col">
                 <div class="card">
                     <div class="card-body">
-                        <h2 class="section-title">Latest Data Science Job Postings</h2>
-                        <div class="accordion" id="jobs-accordion">
-
-"""
-
-run_counts = df.groupby('run_id').size().reset_index(name='count')
-run_counts['run_time'] = pd.to_datetime(run_counts['run_id'])
-run_counts = run_counts.sort_values('run_time')
-df = df.drop_duplicates(subset=['link']).reset_index(drop=True)
-
-# Generate recent jobs accordion
-latest_jobs = df.sort_values('run_time', ascending=False).head(10)
-for i, row in latest_jobs.iterrows():
-    html_content += f"""
-    <div class="accordion-item">
-        <h2 class="accordion-header" id="heading{i}">
-            <button class="accordion-button collapsed" type="button" data-bs-toggle="collapse" data-bs-target="#collapse{i}" aria-expanded="false" aria-controls="collapse{i}">
-                {row['title']} - {row['company']}
-            </button>
-        </h2>
-        <div id="collapse{i}" class="accordion-collapse collapse" aria-labelledby="heading{i}" data-bs-parent="#jobs-accordion">
-            <div class="accordion-body">
-                <p><strong>Location:</strong> {row['location']}</p>
-                <p><strong>Source:</strong> {row['source']}</p>
-                <p><strong>Scraped:</strong> {row['run_time'].strftime('%Y-%m-%d %H:%M')}</p>
-                <a href="{row['link']}" class="btn btn-primary" target="_blank">Apply Here</a>
+                        <h2 class="section-title">Job Title Phrases</h2>
+                        <div id="phrases-chart"></div>
+                    </div>
+                </div>
             </div>
         </div>
-    </div>
-    """
 
-html_content += """
-                        </div>
+        <!-- Recent Jobs Section -->
+        <div class="row">
+            <div class="col">
+                <div class="card">
+                    <div class="card-body">
+                        <h2 class="section-title">Latest MARKET_LABEL Job Postings</h2>
+                        <div class="accordion" id="jobs-accordion"></div>
                     </div>
                 </div>
             </div>
@@ -138,130 +544,207 @@ html_content += """
                 <div class="card">
                     <div class="card-body">
                         <h2 class="section-title">All Job Listings</h2>
-                        <div style="overflow-x: auto;">
-                            <table class="table table-striped">
-                                <thead>
-                                    <tr>
-                                        <th>Title</th>
-                                        <th>Company</th>
-                                        <th>Location</th>
-                                        <th>Source</th>
-                                        <th>Scraped At</th>
-                                        <th>Link</th>
-                                    </tr>
-                                </thead>
-                                <tbody>
-"""
-
-# Generate table rows
-sorted_df = df[['title', 'company', 'location', 'source', 'run_time', 'link']].sort_values('run_time', ascending=False)
-for i, row in sorted_df.iterrows():
-    html_content += f"""
-    <tr>
-        <td>{row['title']}</td>
-        <td>{row['company']}</td>
-        <td>{row['location']}</td>
-        <td>{row['source']}</td>
-        <td>{row['run_time'].strftime('%Y-%m-%d %H:%M')}</td>
-        <td><a href="{row['link']}" target="_blank">Apply</a></td>
-    </tr>
-    """
-
-html_content += f"""
-                                </tbody>
-                            </table>
-                        </div>
+PAGED_TABLE_HTML
                     </div>
                 </div>
             </div>
         </div>
-        
+
         <footer class="text-center mt-5 mb-3 text-muted">
-            <p>Data Science Job Tracker | Last updated: {last_updated_time}</p>
+            <p>MARKET_LABEL Job Tracker | Last updated: <span class="updated"></span></p>
         </footer>
     </div>
 
     <!-- Bootstrap & Plotly Scripts -->
     <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js"></script>
+EMBEDDED_DATA
     <script>
-        // Time Series Chart
-        Plotly.newPlot('time-series-chart', """
-
-
-fig_time = px.scatter(
-    run_counts,
-    x='run_time',
-    y='count',
-    title='Data Science Jobs Per Scraping Run',
-    labels={'run_time': 'Scraping Time', 'count': 'Jobs Found'},
-    size='count',
-    color='count',
-    hover_data={'run_time': '|%Y-%m-%d %H:%M'}
-)
-
-fig_time.update_traces(
-    marker=dict(size=12, line=dict(width=2, color='DarkSlateGrey')),
-    textfont=dict(size=10)
-)
-
-fig_time.update_layout(
-    hovermode='x unified',
-    xaxis=dict(tickformat='%Y-%m-%d %H:%M'),
-    height=500
-)
-html_content += fig_time.to_json() + """, {});
-
-        // Companies Chart
-        Plotly.newPlot('companies-chart', """
-# Top companies plot
-top_companies = df['company'].value_counts().head(10)
-fig_companies = px.bar(
-    top_companies, 
-    orientation='h',
-    labels={'index': 'Company', 'value': 'Job Count'},
-    title='Top Companies'
-)
-fig_companies.update_layout(showlegend=False, height=400)
-html_content += fig_companies.to_json() + """, {});
-
-        // Sources Chart
-        Plotly.newPlot('sources-chart', """
-# Sources plot
-source_counts = df['source'].value_counts()
-fig_sources = px.pie(
-    source_counts,
-    names=source_counts.index,
-    values=source_counts.values,
-    title='Job Sources Distribution',
-    height=400
-)
-html_content += fig_sources.to_json() + """, {});
-
-        // Keywords Chart
-        Plotly.newPlot('keywords-chart', """
-# Keywords plot
-all_titles = ' '.join(df['title'].astype(str)).lower()
-words = re.findall(r'\b[a-z]{4,}\b', all_titles)
-word_counts = pd.Series(words).value_counts().head(20)
-stop_words = ['senior', 'lead', 'israel', 'tel', 'aviv', 'and', 'for', 'with', 'team', 'developer']
-word_counts = word_counts[~word_counts.index.isin(stop_words)]
-
-fig_keywords = px.bar(
-    word_counts, 
-    orientation='h',
-    title='Most Common Keywords in Job Titles',
-    labels={'index': 'Keyword', 'value': 'Count'},
-    height=500
-)
-fig_keywords.update_layout(showlegend=False)
-html_content += fig_keywords.to_json() + """, {});
+        const DATA_DIR = 'DATA_DIR_NAME';
+PAGED_TABLE_JS
+        // Latest jobs accordion, built with textContent so titles are never parsed as HTML
+        function showLatest(rows) {
+            const accordion = document.getElementById('jobs-accordion');
+            rows.forEach((r, i) => {
+                const item = document.createElement('div');
+                item.className = 'accordion-item';
+                item.innerHTML = '<h2 class="accordion-header" id="heading' + i + '"><button class="accordion-button collapsed" type="button" data-bs-toggle="collapse" data-bs-target="#collapse' + i + '" aria-expanded="false" aria-controls="collapse' + i + '"></button></h2>'
+                    + '<div id="collapse' + i + '" class="accordion-collapse collapse" aria-labelledby="heading' + i + '" data-bs-parent="#jobs-accordion"><div class="accordion-body">'
+                    + '<p><strong>Location:</strong> <span></span></p><p><strong>Source:</strong> <span></span></p><p><strong>Scraped:</strong> <span></span></p>'
+                    + '<a class="btn btn-primary" target="_blank" rel="noopener">Apply Here</a></div></div>';
+                item.querySelector('button').textContent = r[0] + ' - ' + r[1];
+                const fields = item.querySelectorAll('.accordion-body span');
+                fields[0].textContent = r[2];
+                fields[1].textContent = r[3];
+                fields[2].textContent = r[4];
+                item.querySelector('a').href = r[5];
+                accordion.appendChild(item);
+            });
+        }
+
+        // The bundle is revalidated on every visit; everything it points to is content-hashed
+        const embedded = document.getElementById('dashboard-bundle');
+        (embedded ? Promise.resolve(JSON.parse(embedded.textContent)) : fetch(DATA_DIR + '/BUNDLE_FILE', {cache: 'no-cache'}).then(r => r.json())).then(bundle => {
+            document.getElementById('total-jobs').textContent = bundle.total_jobs;
+            document.querySelectorAll('.updated').forEach(el => { el.textContent = bundle.updated; });
+            document.querySelectorAll('[data-stat]').forEach(el => { el.textContent = bundle.stats[el.dataset.stat]; });
+            showLatest(bundle.latest);
+            (bundle.charts.file ? fetch(DATA_DIR + '/' + bundle.charts.file + '?v=' + bundle.charts.hash).then(r => r.json())
+                                : Promise.resolve(bundle.charts)).then(charts => {
+                for (const [divId, fig] of Object.entries(charts)) Plotly.newPlot(divId, fig, {});
+            });
+            showListings(bundle.listings);
+        });
     </script>
 </body>
 </html>
 """
 
-# Save HTML file
-with open('jobs_dashboard.html', 'w', encoding='utf-8') as f:
-    f.write(html_content)
 
-print("Dashboard generated: jobs_dashboard.html")
+def embed_json(element_id, data):
+    """A JSON <script> block that can't close itself early"""
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+    return f'    <script type="application/json" id="{element_id}">{payload}</script>\n'
+
+
+def shell_template():
+    """SHELL_HTML with the parts every market shares filled in"""
+    return (SHELL_HTML.replace('PAGED_TABLE_HTML\n', PAGED_TABLE_HTML.lstrip('\n'))
+            .replace('PAGED_TABLE_JS\n', PAGED_TABLE_JS.lstrip('\n'))
+            .replace('BUNDLE_FILE', BUNDLE_FILE))
+
+
+def market_shell(market=DEFAULT_MARKET, template=None):
+    """The HTML shell of one market, still without data"""
+    data_url = os.path.relpath(market.data_dir, os.path.dirname(market.output_file) or '.')
+    return ((template or shell_template()).replace('MARKET_LABEL', html.escape(market.label))
+            .replace('MARKET_COUNTRY', html.escape(market.country))
+            .replace('DATA_DIR_NAME', data_url.replace(os.sep, '/')))
+
+
+def render(bundle=None, output_file=OUTPUT_FILE, shell=None):
+    """Write the HTML shell, embedding the bundle when one is given.
+
+    Without a bundle the shell holds no data at all, so it only changes
+    when this template does and stays cached in browsers between data
+    updates. Returns the shell's content hash.
+    """
+    shell = shell or market_shell()
+    embedded = embed_json('dashboard-bundle', bundle) if bundle is not None else ''
+    shell_hash = content_hash(shell)
+    html_content = shell.replace('EMBEDDED_DATA\n', embedded)
+    if os.path.exists(output_file):
+        with open(output_file, encoding='utf-8') as f:
+            if f.read() == html_content:
+                print(f"Shell {shell_hash} unchanged: {output_file}")
+                return shell_hash
+    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+    write_html(output_file, [html_content])
+    print(f"Dashboard generated: {output_file} (shell {shell_hash})")
+    return shell_hash
+
+
+def build_market(market, snapshot_dir, template=None, listings='shards', store_dir=STORE_DIR):
+    """Build and render one market's dashboard from the shared snapshot.
+
+    The market's input hash covers its rows in the snapshot, its shell and
+    the bundle and aggregate formats; when the hash recorded in its bundle matches, the
+    market is skipped without loading any of its rows. Runs in a worker
+    process, so it returns a summary with its run report as a dict.
+    """
+    report = RunReport('dashboard')
+    snapshot = ColumnSnapshot(snapshot_dir)
+    rows = snapshot.rows_where(country=market.country, position=market.position)
+    shell = market_shell(market, template)
+    input_hash = content_hash([BUNDLE_VERSION, STATE_VERSION, listings, content_hash(shell), snapshot.digest(rows)])
+    summary = {'market': market.slug, 'jobs': len(rows), 'input': input_hash, 'skipped': False}
+    print(f"{market.country} / {market.position}: {len(rows)} jobs -> {market.output_file}", flush=True)
+    if not len(rows):
+        print(f"No jobs stored yet, skipped {market.output_file}")
+        summary['skipped'] = True
+        summary['report'] = report.to_dict()
+        return summary
+    if (listings == 'shards' and os.path.exists(market.output_file)
+            and load_bundle(market.data_dir).get('input') == input_hash):
+        print(f"Inputs unchanged ({input_hash}), skipped {market.output_file}")
+        summary['skipped'] = True
+        summary['report'] = report.to_dict()
+        return summary
+
+    before_bytes = os.path.getsize(market.output_file) if os.path.exists(market.output_file) else 0
+    build_start = time.perf_counter()
+    with report.stage('load_snapshot'):
+        jobs = snapshot.frame(rows)
+    bundle = build_data(jobs, market, store_dir, listings, report, input_hash)
+    render_start = time.perf_counter()
+    with report.stage('render'):
+        render(bundle if listings == 'inline' else None, market.output_file, shell)
+    print(f"Build {render_start - build_start:.2f}s, render {time.perf_counter() - render_start:.2f}s")
+
+    after_bytes = os.path.getsize(market.output_file)
+    print(f"HTML size: {before_bytes / 1024:.1f} KB -> {after_bytes / 1024:.1f} KB, "
+          f"parse {parse_seconds(market.output_file) * 1000:.1f} ms")
+    summary['html_bytes'] = after_bytes
+    if listings == 'shards':
+        data_files = [os.path.join(market.data_dir, name) for name in sorted(os.listdir(market.data_dir))]
+        data_bytes = sum(os.path.getsize(path) for path in data_files)
+        data_parse = sum(parse_seconds(path) for path in data_files)
+        print(f"Data files: {len(data_files)} in {market.data_dir}/, {data_bytes / 1024:.1f} KB, "
+              f"parse {data_parse * 1000:.1f} ms (loaded after first paint)")
+        summary['data_bytes'] = data_bytes
+    summary['report'] = report.to_dict()
+    return summary
+
+
+def build_markets(markets, snapshot_dir, listings='shards', workers=None, store_dir=STORE_DIR):
+    """Build every market from the snapshot, in a process pool when there is more than one"""
+    template = shell_template()
+    workers = min(workers or os.cpu_count() or 1, len(markets))
+    if workers <= 1:
+        return [build_market(market, snapshot_dir, template, listings, store_dir) for market in markets]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(build_market, market, snapshot_dir, template, listings, store_dir)
+                   for market in markets]
+        return [future.result() for future in futures]
+
+
+def main(listings='shards', profile=None, config_path=CONFIG_FILE, workers=None):
+    """Build the data and write the dashboard of every market in the scrape config.
+
+    The snapshot all markets share is prepared once, then the markets are
+    built from it in parallel processes. The timings go to a run report in
+    run_reports/ next to the CSV, with one 'markets' event per market;
+    profile='cprofile' or 'pyinstrument' profiles this process, so use
+    workers=1 to include the market builds in the profile.
+    """
+    report = RunReport('dashboard')
+    path = report_path('dashboard', CSV_FILE, report.started)
+    markets = config_markets(load_config(config_path)) if os.path.exists(config_path) else [DEFAULT_MARKET]
+
+    with profiled(profile, path[:-len('.json')]):
+        with tempfile.TemporaryDirectory(prefix='jobs_snapshot_') as snapshot_dir:
+            prepare_snapshot(snapshot_dir, report=report)
+            with report.stage('markets'):
+                results = build_markets(markets, snapshot_dir, listings, workers)
+
+    for result in results:
+        worker = result.pop('report')
+        for name, stage in worker['stages'].items():
+            report.add_time(name, stage['seconds'], stage['calls'])
+        for name, n in worker['counters'].items():
+            report.count(name, n)
+        report.event('markets', **result, seconds=worker['seconds'], peak_rss_mb=worker['peak_rss_mb'])
+    skipped = sum(result['skipped'] for result in results)
+    print(f"Markets: {len(results) - skipped} built, {skipped} skipped")
+    report.save(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the jobs dashboard of every configured market")
+    parser.add_argument('--listings', choices=['shards', 'inline'], default='shards',
+                        help="'shards' loads the data lazily from JSON files in jobs_data/, "
+                             "'inline' embeds everything in one self-contained HTML file")
+    parser.add_argument('--config', default=CONFIG_FILE, help="markets are its (country, position) pairs")
+    parser.add_argument('--workers', type=int, help="processes building markets (default: one per CPU)")
+    parser.add_argument('--profile', choices=PROFILERS, help="also profile the build")
+    args = parser.parse_args()
+    main(args.listings, args.profile, args.config, args.workers)
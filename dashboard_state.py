@@ -0,0 +1,86 @@
+import os
+import json
+from collections import Counter
+from keywords import STOP_WORDS, keyword_counts
+
+STATE_VERSION = 3
+
+
+class DashboardState:
+    """Row, source, keyword and phrase counts behind the dashboard, folded in one run at a time.
+
+    `watermark` is the latest run_time already counted; fold() only accepts
+    rows newer than it, so a rebuild tokenizes the titles of the new runs
+    instead of the whole history. Company and daily counts of distinct
+    postings aren't kept here: they depend on near-duplicate clusters,
+    which can merge when new jobs arrive.
+    """
+
+    def __init__(self, path=None, stop_words=STOP_WORDS):
+        self.path = path
+        self.stop_words = stop_words
+        self.watermark = None
+        self.rows = 0
+        self.sources = Counter()
+        self.keywords = Counter()
+        self.phrases = Counter()
+
+    @classmethod
+    def load(cls, path, stop_words=STOP_WORDS):
+        state = cls(path, stop_words)
+        if not os.path.exists(path):
+            return state
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != STATE_VERSION:
+            return state
+        state.watermark = data['watermark']
+        state.rows = data['rows']
+        state.sources = Counter(data['sources'])
+        state.keywords = Counter(data['keywords'])
+        state.phrases = Counter(data['phrases'])
+        return state
+
+    def save(self):
+        data = {
+            'version': STATE_VERSION,
+            'watermark': self.watermark,
+            'rows': self.rows,
+            'sources': dict(self.sources.most_common()),
+            'keywords': dict(self.keywords.most_common()),
+            'phrases': dict(self.phrases.most_common()),
+        }
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def fold(self, df):
+        """Count rows of df newer than the watermark and advance it"""
+        if self.watermark is not None:
+            df = df[df['run_time'] > self.watermark]
+        if df.empty:
+            return 0
+        self.sources.update(df['source'].dropna().value_counts().to_dict())
+        counts = keyword_counts(df['title'], stop_words=self.stop_words)
+        self.keywords.update(counts[1])
+        self.phrases.update(counts[2] + counts[3])
+        self.rows += len(df)
+        self.watermark = max(filter(None, [self.watermark, df['run_time'].max()]))
+        return len(df)
+
+    def update_from_rows(self, df):
+        """Fold the rows of df (every row of one market) newer than the watermark.
+
+        Rows don't always arrive in run_time order: `cli.py merge` of an
+        older CSV or a resumed checkpoint can store rows at or before the
+        watermark, which fold() skips. So if the rows counted don't add up
+        to df afterwards (or df shrank), the state is rebuilt from all of df.
+        """
+        folded = self.fold(df)
+        if self.rows != len(df):
+            print(f"Dashboard state: {self.rows} rows counted but {len(df)} stored, rebuilding", flush=True)
+            self.__init__(self.path, self.stop_words)
+            folded = self.fold(df)
+        return folded
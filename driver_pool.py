@@ -0,0 +1,145 @@
+import time
+import threading
+from contextlib import contextmanager
+from selenium.common.exceptions import WebDriverException
+
+
+class DriverPool:
+    """Reusable WebDriver instances shared by concurrent scrapes.
+
+    Drivers are created lazily by `driver_factory`, up to `size` at a time.
+    A driver is health-checked before each lease and replaced after
+    `max_pages` leases or once the page's JS heap exceeds `max_memory_mb`.
+    `metrics` separates browser startup time from time spent scraping.
+    """
+
+    def __init__(self, driver_factory, size=1, max_pages=20, max_memory_mb=512):
+        self.driver_factory = driver_factory
+        self.size = size
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self._idle = []
+        self._pages = {}
+        self._leased_at = {}
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.metrics = {
+            'drivers_started': 0,
+            'drivers_recycled': 0,
+            'leases': 0,
+            'startup_seconds': 0.0,
+            'scrape_seconds': 0.0,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _start_driver(self):
+        start = time.perf_counter()
+        driver = self.driver_factory()
+        elapsed = time.perf_counter() - start
+        with self._cond:
+            self.metrics['drivers_started'] += 1
+            self.metrics['startup_seconds'] += elapsed
+            self._pages[id(driver)] = 0
+        print(f"Started browser in {elapsed:.1f}s", flush=True)
+        return driver
+
+    def _quit_driver(self, driver):
+        with self._cond:
+            self._pages.pop(id(driver), None)
+            self._live -= 1
+            self._cond.notify()
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    @staticmethod
+    def is_healthy(driver):
+        try:
+            return driver.execute_script("return 1") == 1
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def memory_mb(driver):
+        """JS heap in use by the current page, or 0 if the browser doesn't report it"""
+        try:
+            used = driver.execute_script(
+                "return window.performance && performance.memory ? performance.memory.usedJSHeapSize : 0")
+            return (used or 0) / (1024 * 1024)
+        except WebDriverException:
+            return 0
+
+    def acquire(self):
+        """Lease a healthy driver, starting one if the pool isn't full yet"""
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("DriverPool is closed")
+                while not self._idle and self._live >= self.size:
+                    self._cond.wait()
+                if self._idle:
+                    driver = self._idle.pop()
+                else:
+                    driver = None
+                    self._live += 1
+            if driver is None:
+                try:
+                    driver = self._start_driver()
+                except Exception:
+                    with self._cond:
+                        self._live -= 1
+                        self._cond.notify()
+                    raise
+            elif not self.is_healthy(driver):
+                print("Discarding unhealthy browser", flush=True)
+                self._quit_driver(driver)
+                continue
+            with self._cond:
+                self.metrics['leases'] += 1
+                self._leased_at[id(driver)] = time.perf_counter()
+            return driver
+
+    def release(self, driver):
+        """Return a leased driver, recycling it if it is worn out"""
+        with self._cond:
+            self.metrics['scrape_seconds'] += time.perf_counter() - self._leased_at.pop(id(driver))
+            self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+            pages = self._pages[id(driver)]
+        memory = self.memory_mb(driver)
+        if self._closed or pages >= self.max_pages or memory >= self.max_memory_mb:
+            if not self._closed:
+                print(f"Recycling browser after {pages} pages ({memory:.0f} MB JS heap)", flush=True)
+                with self._cond:
+                    self.metrics['drivers_recycled'] += 1
+            self._quit_driver(driver)
+            return
+        with self._cond:
+            self._idle.append(driver)
+            self._cond.notify()
+
+    @contextmanager
+    def driver(self):
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._quit_driver(driver)
+
+    def report(self):
+        m = self.metrics
+        return (f"Browser pool: {m['drivers_started']} started ({m['startup_seconds']:.1f}s startup), "
+                f"{m['drivers_recycled']} recycled, {m['leases']} scrapes ({m['scrape_seconds']:.1f}s scraping)")
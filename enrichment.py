@@ -0,0 +1,211 @@
+import os
+import re
+import time
+import argparse
+import threading
+from datetime import datetime, timedelta
+import requests
+import numpy as np
+import pandas as pd
+from http_fetch import PageFetcher, DiskCache, DETAIL_CACHE_DIR
+from html_parsing import CardParser, LINKEDIN_DETAIL_SPEC, LINKEDIN_CRITERIA_SPEC
+
+ENRICHMENT_COLUMNS = ['seniority', 'employment_type', 'posted_date', 'skills']
+
+# Job pages that can be fetched over plain HTTP, by source. Google Careers job pages only use
+# generated class names, so Google rows keep empty enrichment columns for now.
+DETAIL_URLS = {
+    'LinkedIn': 'https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{}',
+}
+
+# Detail pages downloaded per run at most; jobs past it are stored without details and backfilled by a later run
+MAX_DETAIL_FETCHES = 100
+# Failed downloads of a backlogged job's page before it is given up on
+MAX_DETAIL_ATTEMPTS = 3
+# Jobs stored without a cached detail page, in the job store
+BACKLOG_FILE = 'details_backlog.csv'
+BACKLOG_COLUMNS = ['source', 'job_id', 'run_time', 'attempts']
+
+SKILLS = ['python', 'sql', 'scala', 'java', 'c++', 'spark', 'pyspark', 'hadoop', 'airflow', 'dbt', 'kafka',
+          'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'xgboost', 'pandas', 'numpy', 'llm', 'nlp',
+          'computer vision', 'deep learning', 'machine learning', 'statistics', 'a/b testing',
+          'aws', 'gcp', 'azure', 'docker', 'kubernetes', 'tableau', 'looker', 'snowflake', 'databricks', 'bigquery']
+# Longest first, so "pyspark" isn't read as "spark"; "c++" and "a/b" need their own boundaries
+SKILL_RE = re.compile(r'(?<![\w+#/])(' + '|'.join(re.escape(skill) for skill in sorted(SKILLS, key=len, reverse=True))
+                      + r')(?![\w+#])')
+
+POSTED_RE = re.compile(r'(\d+)\s+(minute|hour|day|week|month|year)s?\s+ago')
+POSTED_UNITS = {'minute': timedelta(minutes=1), 'hour': timedelta(hours=1), 'day': timedelta(days=1),
+                'week': timedelta(weeks=1), 'month': timedelta(days=30), 'year': timedelta(days=365)}
+
+
+def find_skills(text):
+    """Known skills mentioned in a job description, ';'-separated in SKILLS order"""
+    if not text:
+        return None
+    found = set(SKILL_RE.findall(text.lower()))
+    return ';'.join(skill for skill in SKILLS if skill in found) or None
+
+
+def parse_posted(text, fetched):
+    """"3 days ago", as seen at the `fetched` epoch time, as a YYYY-MM-DD date"""
+    match = POSTED_RE.search(text.lower()) if text else None
+    if not match:
+        return None
+    posted = datetime.fromtimestamp(fetched) - int(match.group(1)) * POSTED_UNITS[match.group(2)]
+    return posted.strftime('%Y-%m-%d')
+
+
+class JobEnricher:
+    """Adds seniority, employment type, posted date and skills to new jobs from their detail pages.
+
+    Downloading and storing are separate steps. fetch() downloads the
+    pages of jobs about to be stored into a DiskCache, over a pooled
+    session by PageFetcher, at most `max_workers` at a time, through the
+    rate limit of the detail API and at most `max_fetches` per run; the
+    scheduler calls it before taking its merge lock. enrich() only reads
+    the cache, so a merge never waits on the network. Fields are parsed
+    from the cached page, so changing the parser doesn't need a refetch.
+
+    Jobs stored without a cached page (past the cap, or failed) are kept
+    in a backlog file, and backfill() fetches them with the budget a later
+    run has left and writes their columns into the store. A job whose page
+    fails MAX_DETAIL_ATTEMPTS times (it was most likely taken down) is
+    dropped from the backlog and keeps empty columns.
+    """
+
+    def __init__(self, session=None, max_workers=4, cache=None, throttle=None, max_fetches=MAX_DETAIL_FETCHES,
+                 backlog_path=None, parser_backend=None, sleep=time.sleep):
+        self.fetcher = PageFetcher(session or requests.Session(), max_workers=max_workers, throttle=throttle,
+                                   sleep=sleep)
+        self.cache = cache if cache is not None else DiskCache(DETAIL_CACHE_DIR)
+        # Fetches left this run (None: no cap)
+        self.budget = max_fetches
+        self.backlog_path = backlog_path
+        self.backlog = self._load_backlog()
+        self.failed = set()
+        self._lock = threading.Lock()
+        self.detail_parser = CardParser(LINKEDIN_DETAIL_SPEC, parser_backend)
+        self.criteria_parser = CardParser(LINKEDIN_CRITERIA_SPEC, parser_backend)
+        self.stats = {'enriched': 0, 'fetched': 0, 'failed': 0, 'deferred': 0, 'backfilled': 0,
+                      'backlog': len(self.backlog)}
+
+    def _load_backlog(self):
+        if self.backlog_path and os.path.exists(self.backlog_path):
+            return pd.read_csv(self.backlog_path, dtype={'job_id': str})
+        return pd.DataFrame(columns=BACKLOG_COLUMNS)
+
+    def _save_backlog(self):
+        self.stats['backlog'] = len(self.backlog)
+        if not self.backlog_path:
+            return
+        tmp_path = self.backlog_path + '.tmp'
+        self.backlog.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.backlog_path)
+
+    @staticmethod
+    def detail_url(source, job_id):
+        template = DETAIL_URLS.get(source)
+        return template.format(job_id) if template and job_id else None
+
+    def urls(self, df):
+        """The detail page URL of each row of df (None where the source has none)"""
+        return [self.detail_url(source, job_id) for source, job_id in zip(df['source'], df['job_id'])]
+
+    def parse(self, html, fetched):
+        """The enrichment fields of one LinkedIn job page, fetched at epoch time `fetched`"""
+        page = self.detail_parser.parse(html)[0]
+        criteria = {item['name']: item['value'] for item in self.criteria_parser.parse(html) if item['name']}
+        return {
+            'seniority': criteria.get('Seniority level'),
+            'employment_type': criteria.get('Employment type'),
+            'posted_date': parse_posted(page['posted'], fetched),
+            'skills': find_skills(page['description']),
+        }
+
+    def fetch(self, df):
+        """Download the detail pages of df's jobs that aren't cached, within the run's budget; return how many"""
+        missing = [url for url in dict.fromkeys(self.urls(df))
+                   if url and url not in self.failed and self.cache.get(url) is None]
+        with self._lock:
+            if self.budget is not None:
+                self.stats['deferred'] += max(0, len(missing) - self.budget)
+                missing = missing[:self.budget]
+                self.budget -= len(missing)
+        if not missing:
+            return 0
+        fetched = 0
+        for url, text in self.fetcher.fetch_all(missing, lambda text: text).items():
+            if text:
+                self.cache.put(url, text)
+                fetched += 1
+            else:
+                with self._lock:
+                    self.failed.add(url)
+        with self._lock:
+            self.stats['fetched'] += fetched
+            self.stats['failed'] += len(missing) - fetched
+            self.cache.save()
+        return fetched
+
+    def _fill(self, df):
+        """df with ENRICHMENT_COLUMNS from the cached pages, and a mask of the rows whose page isn't cached"""
+        df = df.assign(**{column: None for column in ENRICHMENT_COLUMNS})
+        urls = self.urls(df)
+        pages = {}
+        for url in dict.fromkeys(url for url in urls if url):
+            cached = self.cache.get(url)
+            if cached is not None:
+                pages[url] = cached
+        fields = {url: self.parse(text, fetched) for url, (text, fetched) in pages.items()}
+        rows = [fields.get(url, {}) for url in urls]
+        for column in ENRICHMENT_COLUMNS:
+            df[column] = [row.get(column) for row in rows]
+        return df, np.array([bool(url) and url not in pages for url in urls], dtype=bool)
+
+    def enrich(self, df):
+        """df with ENRICHMENT_COLUMNS added from the cached detail pages; nothing is downloaded here.
+
+        Rows whose page isn't cached are added to the backlog.
+        """
+        df, missing = self._fill(df)
+        if df.empty:
+            return df
+        self.stats['enriched'] += int((~missing).sum())
+        if missing.any():
+            queued = df.loc[missing].reindex(columns=BACKLOG_COLUMNS[:-1]).assign(attempts=0)
+            self.backlog = pd.concat([self.backlog, queued], ignore_index=True)
+            self._save_backlog()
+        print(f"Enrichment: {self.stats}", flush=True)
+        return df
+
+    def backfill(self, store):
+        """Fetch backlog pages with the run's remaining budget and write their columns into store.
+
+        Returns the number of stored rows filled in.
+        """
+        backlog = self.backlog.drop_duplicates(['source', 'job_id', 'run_time']).reset_index(drop=True)
+        if backlog.empty:
+            return 0
+        self.fetch(backlog)
+        enriched, missing = self._fill(backlog)
+        filled = store.fill(enriched[~missing], ENRICHMENT_COLUMNS) if (~missing).any() else 0
+        failed = np.array([url in self.failed for url in self.urls(backlog)], dtype=bool)
+        attempts = backlog['attempts'].astype(int) + failed
+        self.backlog = backlog.assign(attempts=attempts)[missing & (attempts < MAX_DETAIL_ATTEMPTS)]
+        self.stats['backfilled'] += filled
+        self._save_backlog()
+        print(f"Enrichment backfill: {self.stats}", flush=True)
+        return filled
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch (or read from cache) and parse one job's detail page")
+    parser.add_argument('source', choices=sorted(DETAIL_URLS))
+    parser.add_argument('job_id')
+    args = parser.parse_args()
+    enricher = JobEnricher()
+    job = pd.DataFrame({'source': [args.source], 'job_id': [args.job_id]})
+    enricher.fetch(job)
+    enriched = enricher.enrich(job)
+    print(enriched.iloc[0].to_dict())
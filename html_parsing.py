@@ -0,0 +1,148 @@
+import re
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    SelectolaxParser = None
+
+try:
+    import lxml  # noqa: F401 -- only needed as a BeautifulSoup tree builder
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# Fastest first; html.parser ships with Python so it is always available
+BACKENDS = ['selectolax', 'lxml', 'html.parser']
+
+# Declarative card specs. Every selector is `tag.class`; where a field lists
+# several selectors the first one that matches wins, mirroring the
+# `card.find(...) or card.find(...)` fallbacks LinkedIn's changing markup needs.
+# A spec with no card selectors treats the whole page as a single card.
+LINKEDIN_CARD_SPEC = {
+    'cards': ['li.jobs-search-results__list-item', 'div.base-card', 'div.job-card-container'],
+    'fields': {
+        'link': (['a.base-card__full-link', 'a.job-card-container__link'], 'href'),
+        'title': (['h3.base-search-card__title', 'h3.job-card-list__title'], None),
+        'company': (['h4.base-search-card__subtitle', 'a.job-card-container__company-name'], None),
+        'location': (['span.job-search-card__location', 'li.job-card-container__metadata-item'], None),
+    },
+}
+
+GOOGLE_CARD_SPEC = {
+    'cards': ['li.lLd3Je'],
+    'fields': {
+        'title': (['h3.QJPWVe'], None),
+        'location': (['div.vbZS6e'], None),
+        'link': (['a.WpHeLc'], 'href'),
+    },
+}
+
+# A LinkedIn job page (the guest jobPosting endpoint): the page itself, then one card per
+# "Seniority level" / "Employment type" / ... criterion under the description
+LINKEDIN_DETAIL_SPEC = {
+    'cards': [],
+    'fields': {
+        'posted': (['span.posted-time-ago__text'], None),
+        'description': (['div.show-more-less-html__markup', 'div.description__text'], None),
+    },
+}
+
+LINKEDIN_CRITERIA_SPEC = {
+    'cards': ['li.description__job-criteria-item'],
+    'fields': {
+        'name': (['h3.description__job-criteria-subheader'], None),
+        'value': (['span.description__job-criteria-text'], None),
+    },
+}
+
+SELECTOR_RE = re.compile(r'^([a-z][a-z0-9]*)\.([A-Za-z0-9_-]+)$')
+
+
+def available_backends():
+    return [name for name in BACKENDS
+            if name == 'html.parser'
+            or (name == 'selectolax' and SelectolaxParser is not None)
+            or (name == 'lxml' and HAS_LXML)]
+
+
+def _split_selector(selector):
+    match = SELECTOR_RE.match(selector)
+    if not match:
+        raise ValueError(f"Card selectors must look like 'tag.class', got {selector!r}")
+    return match.groups()
+
+
+class CardParser:
+    """Extract every field of every card in a page, compiled once from a spec.
+
+    With the BeautifulSoup backends each card's subtree is walked once, and
+    every element is looked up by (tag, class) in a table built from the
+    spec. selectolax runs the selectors in C instead. Each card becomes a
+    dict of stripped strings, with None for fields that weren't found.
+    """
+
+    def __init__(self, spec, backend=None):
+        self.backend = backend or available_backends()[0]
+        if self.backend not in available_backends():
+            raise ValueError(f"Parser backend {self.backend!r} is not installed")
+        self.card_selectors = [_split_selector(selector) for selector in spec['cards']]
+        self.fields = list(spec['fields'])
+        self.field_specs = spec['fields']
+        # (tag, class) -> [(field, priority, attribute)]
+        self.lookup = {}
+        for field, (selectors, attribute) in spec['fields'].items():
+            for priority, selector in enumerate(selectors):
+                self.lookup.setdefault(_split_selector(selector), []).append((field, priority, attribute))
+
+    def parse(self, html):
+        """Return one dict per card in html"""
+        if self.backend == 'selectolax':
+            return self._parse_selectolax(html)
+        from bs4 import BeautifulSoup
+        return self._parse_soup(BeautifulSoup(html, 'lxml' if self.backend == 'lxml' else 'html.parser'))
+
+    def _parse_soup(self, soup):
+        cards = [] if self.card_selectors else [soup]
+        for tag, cls in self.card_selectors:
+            cards = soup.find_all(tag, class_=cls)
+            if cards:
+                break
+        lookup = self.lookup
+        results = []
+        for card in cards:
+            found = {}
+            for element in card.find_all(True):
+                for cls in element.get('class') or ():
+                    for field, priority, attribute in lookup.get((element.name, cls), ()):
+                        if field not in found or priority < found[field][0]:
+                            found[field] = (priority, element, attribute)
+            results.append({field: self._soup_value(*found[field][1:]) if field in found else None
+                            for field in self.fields})
+        return results
+
+    @staticmethod
+    def _soup_value(element, attribute):
+        if attribute:
+            return element.get(attribute)
+        return element.text.strip()
+
+    def _parse_selectolax(self, html):
+        tree = SelectolaxParser(html)
+        cards = [] if self.card_selectors else [tree.root]
+        for tag, cls in self.card_selectors:
+            cards = tree.css(f'{tag}.{cls}')
+            if cards:
+                break
+        results = []
+        for card in cards:
+            row = {}
+            for field, (selectors, attribute) in self.field_specs.items():
+                value = None
+                for selector in selectors:
+                    node = card.css_first(selector)
+                    if node is not None:
+                        value = node.attributes.get(attribute) if attribute else node.text().strip()
+                        break
+                row[field] = value
+            results.append(row)
+        return results
@@ -0,0 +1,7 @@
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def write_html(path, parts):
+    """Stream strings to path through one buffered writer"""
+    with open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        f.writelines(parts)
@@ -0,0 +1,270 @@
+import os
+import gzip
+import json
+import time
+import random
+import hashlib
+import threading
+import requests
+from collections import Counter
+from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+HTTP_CACHE_DIR = '.http_cache'
+DETAIL_CACHE_DIR = '.detail_cache'
+
+# Worth retrying: rate limited or a transient server error
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    pass
+
+
+class PageFetcher:
+    """Fetch pages over one keep-alive session with bounded concurrency.
+
+    Requests that fail with 429/5xx or a connection error are retried with
+    exponential backoff, honouring Retry-After. With a cache directory, each
+    page's ETag/Last-Modified is saved and sent back on the next run, so an
+    unchanged page costs a 304 instead of a download.
+    """
+
+    def __init__(self, session, max_workers=4, retries=3, backoff=1.0, timeout=15, cache_dir=None,
+                 throttle=None, sleep=time.sleep):
+        self.session = session
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        self.throttle = throttle
+        self.sleep = sleep
+        self.stats = {'requests': 0, 'retries': 0, 'not_modified': 0, 'bytes': 0}
+        self._lock = threading.Lock()
+        if isinstance(session, requests.Session):
+            # Enough pooled keep-alive connections for every worker
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _count(self, stat, n=1):
+        with self._lock:
+            self.stats[stat] += n
+
+    def _cache_path(self, url, params):
+        if params:
+            url = f"{url}?{urlencode(sorted(params.items()))}"
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest()[:16] + '.json')
+
+    def _load_cached(self, url, params):
+        if not self.cache_dir:
+            return None
+        path = self._cache_path(url, params)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_cached(self, url, params, response):
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not self.cache_dir or not (etag or last_modified):
+            return
+        path = self._cache_path(url, params)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'etag': etag, 'last_modified': last_modified, 'text': response.text}, f)
+        os.replace(path + '.tmp', path)
+
+    def _retry_delay(self, attempt, response=None):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * 2 ** attempt * random.uniform(0.8, 1.2)
+
+    def fetch(self, url, params=None):
+        """Return the page text, or None if the page doesn't exist (404)"""
+        cached = self._load_cached(url, params)
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        for attempt in range(self.retries + 1):
+            if self.throttle:
+                self.throttle(url)
+            self._count('requests')
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                if attempt == self.retries:
+                    raise FetchError(f"{url}: {e}") from e
+                self._count('retries')
+                self.sleep(self._retry_delay(attempt))
+                continue
+            if response.status_code == 304 and cached:
+                self._count('not_modified')
+                return cached['text']
+            if response.status_code == 404:
+                return None
+            if response.status_code in RETRY_STATUSES and attempt < self.retries:
+                self._count('retries')
+                self.sleep(self._retry_delay(attempt, response))
+                continue
+            response.raise_for_status()
+            self._count('bytes', len(response.content))
+            self._save_cached(url, params, response)
+            return response.text
+
+    def fetch_pages(self, url, page_params, parse, max_pages=50, page_size=None):
+        """Fetch numbered result pages concurrently, parsing each as it arrives.
+
+        `page_params(n)` gives the query parameters of page n (1-based) and
+        `parse(text)` turns a page into a list of items. The first window is
+        page 1 alone and each later window doubles, up to `max_workers`
+        pages, so a search with one page of results costs one request. The
+        walk stops after the first window that contains a missing, empty or
+        failed page, or, with `page_size`, a page with fewer items than a
+        full one. Returns the items in page order, up to that page.
+        """
+        pages = {}
+        last_page = max_pages
+        width = 1
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            first = 1
+            while first <= last_page:
+                window = range(first, min(first + width, last_page + 1))
+                futures = {pool.submit(self._fetch_and_parse, url, page_params(n), parse): n for n in window}
+                for future in as_completed(futures):
+                    n = futures[future]
+                    try:
+                        pages[n] = future.result()
+                    except (FetchError, requests.RequestException) as e:
+                        # Keep the pages before the failed one rather than losing the whole walk
+                        print(f"Stopping at page {n}: {e}", flush=True)
+                        pages[n] = []
+                    if not pages[n]:
+                        last_page = min(last_page, n - 1)
+                    elif page_size and len(pages[n]) < page_size:
+                        # A short page is the last one
+                        last_page = min(last_page, n)
+                first = window.stop
+                width = min(width * 2, self.max_workers)
+        return [item for n in sorted(pages) if n <= last_page for item in pages[n]]
+
+    def fetch_all(self, urls, parse):
+        """Fetch and parse many unrelated pages, `max_workers` at a time.
+
+        Returns {url: parse(text)}, or None for pages that are missing or
+        failed after retries, so one bad page doesn't lose the others.
+        """
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self._fetch_and_parse, url, None, parse): url for url in urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    results[url] = future.result()
+                except (FetchError, requests.RequestException) as e:
+                    print(f"Fetch failed: {e}", flush=True)
+                    results[url] = None
+        return results
+
+    def _fetch_and_parse(self, url, params, parse):
+        text = self.fetch(url, params)
+        return parse(text) if text else []
+
+    def report(self):
+        return dict(self.stats)
+
+
+class DiskCache:
+    """Page bodies on disk, with a time-to-live and a size cap.
+
+    Bodies are stored gzip-compressed under the SHA-1 of their content, so
+    identical pages are kept once; index.json maps each URL to its body,
+    when it was fetched and when it was last used. get() treats entries
+    older than `ttl` seconds as missing. save() evicts the least recently
+    used URLs until the bodies fit in `max_bytes`, then writes the index.
+    """
+
+    def __init__(self, root=DETAIL_CACHE_DIR, ttl=30 * 86400, max_bytes=200 * 2 ** 20, clock=time.time):
+        self.root = root
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.index_path = os.path.join(root, 'index.json')
+        self.entries = {}
+        self._lock = threading.Lock()
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def _body_path(self, digest):
+        return os.path.join(self.root, digest[:2], digest[2:] + '.gz')
+
+    def get(self, url):
+        """(text, fetched_at) for a fresh cached URL, or None"""
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is None or self.clock() - entry['fetched'] > self.ttl:
+                return None
+            entry['used'] = self.clock()
+        try:
+            with gzip.open(self._body_path(entry['body']), 'rt', encoding='utf-8') as f:
+                return f.read(), entry['fetched']
+        except OSError:
+            return None
+
+    def put(self, url, text):
+        data = text.encode('utf-8')
+        digest = hashlib.sha1(data).hexdigest()
+        path = self._body_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with gzip.open(path + '.tmp', 'wb') as f:
+                f.write(data)
+            os.replace(path + '.tmp', path)
+        now = self.clock()
+        with self._lock:
+            self.entries[url] = {'body': digest, 'size': os.path.getsize(path), 'fetched': now, 'used': now}
+
+    def evict(self):
+        """Drop expired URLs, then least recently used ones until under max_bytes; return how many"""
+        with self._lock:
+            now = self.clock()
+            expired = [url for url, entry in self.entries.items() if now - entry['fetched'] > self.ttl]
+            for url in expired:
+                del self.entries[url]
+            sizes = {entry['body']: entry['size'] for entry in self.entries.values()}
+            references = Counter(entry['body'] for entry in self.entries.values())
+            total = sum(sizes.values())
+            evicted = len(expired)
+            for url in sorted(self.entries, key=lambda url: self.entries[url]['used']):
+                if total <= self.max_bytes:
+                    break
+                body = self.entries.pop(url)['body']
+                evicted += 1
+                references[body] -= 1
+                if not references[body]:
+                    total -= sizes.pop(body)
+            live = set(sizes)
+        # Remove bodies no URL points to any more
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                if name.endswith('.gz') and os.path.basename(directory) + name[:-3] not in live:
+                    os.remove(os.path.join(directory, name))
+        return evicted
+
+    def save(self):
+        evicted = self.evict()
+        os.makedirs(self.root, exist_ok=True)
+        with self._lock:
+            with open(self.index_path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, separators=(',', ':'))
+        os.replace(self.index_path + '.tmp', self.index_path)
+        return evicted
@@ -0,0 +1,243 @@
+import os
+import re
+import argparse
+import numpy as np
+import pandas as pd
+from job_index import index_keys
+from job_store import STORE_DIR, JobStore
+
+# 64 MinHash values per job, hashed in 16 bands of 4: two jobs with a Jaccard similarity of 0.5 share
+# at least one band about 65% of the time, at 0.7 about 99.9%. Candidates sharing a band are then
+# kept only if their signatures agree on at least THRESHOLD of the values.
+NUM_PERM = 64
+BAND_ROWS = 4
+THRESHOLD = 0.8
+
+# One fixed-width record per job: its block, a hash of its normalized company and seniority
+# (only jobs in the same block are compared; 0 = not clustered), and its signature
+RECORD = np.dtype([('block', '<u8'), ('signature', '<u4', (NUM_PERM,))])
+
+# Universal hashing h -> (a * h + b) mod p. The seed is fixed so signatures saved by earlier runs stay comparable.
+PRIME = np.uint64((1 << 31) - 1)
+PERM_A, PERM_B = np.random.default_rng(20240601).integers(1, (1 << 31) - 1, size=(2, NUM_PERM), dtype=np.uint64)
+
+WORD_RE = re.compile(r'[^\W_]+')
+TITLE_ALIASES = {'sr': 'senior', 'jr': 'junior'}
+# Title words that say where or how, not what the role is ("Data Scientist - Hybrid")
+TITLE_NOISE = frozenset(['israel', 'hybrid', 'remote', 'onsite'])
+COMPANY_SUFFIXES = frozenset(['ltd', 'inc', 'llc', 'corp', 'co', 'limited', 'israel', 'il'])
+# "Back End Developer" and "Senior Back End Developer" are different roles, however similar the titles
+SENIORITY = ['intern', 'student', 'junior', 'senior', 'lead', 'staff', 'principal', 'head', 'manager', 'director']
+LOCATION_ALIASES = {'tel aviv yafo': 'tel aviv'}
+
+
+def _words(text):
+    return WORD_RE.findall(text.lower()) if isinstance(text, str) else []
+
+
+def normalize_company(company):
+    """"Google Israel Ltd." and "Google" are the same company"""
+    return ' '.join(word for word in _words(company) if word not in COMPANY_SUFFIXES)
+
+
+def normalize_city(location):
+    """First part of the location ("Tel Aviv-Yafo, Tel Aviv District, Israel" -> "tel aviv"), or None
+    when it only names the country"""
+    city = ' '.join(_words(location.split(',')[0])) if isinstance(location, str) else ''
+    city = LOCATION_ALIASES.get(city, city)
+    return city if city and city != 'israel' else None
+
+
+def title_words(title):
+    return [TITLE_ALIASES.get(word, word) for word in _words(title) if word not in TITLE_NOISE]
+
+
+def seniority(title):
+    """The first seniority word in the title, or ''"""
+    words = set(title_words(title))
+    return next((level for level in SENIORITY if level in words), '')
+
+
+def shingles(title, location):
+    """Title words and word pairs, plus the city: the set each job's MinHash is taken over"""
+    words = title_words(title)
+    result = set(words)
+    result.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+    city = normalize_city(location)
+    if city and result:
+        result.add('@' + city)
+    return result
+
+
+def minhash(shingle_sets, chunk=4096):
+    """MinHash signatures, one row of NUM_PERM uint32 values per shingle set (all max for an empty set)"""
+    signatures = np.full((len(shingle_sets), NUM_PERM), np.iinfo(np.uint32).max, dtype=np.uint32)
+    for start in range(0, len(shingle_sets), chunk):
+        sets = shingle_sets[start:start + chunk]
+        lengths = np.fromiter(map(len, sets), dtype=np.int64, count=len(sets))
+        flat = [shingle for shingle_set in sets for shingle in shingle_set]
+        if not flat:
+            continue
+        hashes = pd.util.hash_array(np.array(flat, dtype=object)) % PRIME
+        values = (hashes[:, None] * PERM_A + PERM_B) % PRIME
+        nonempty = lengths > 0
+        offsets = (np.cumsum(lengths) - lengths)[nonempty]
+        signatures[start:start + len(sets)][nonempty] = np.minimum.reduceat(values, offsets, axis=0)
+    return signatures
+
+
+def job_records(df):
+    """A RECORD per row of df (title, company, location)"""
+    records = np.zeros(len(df), dtype=RECORD)
+    if not len(df):
+        return records
+    # Company normalization runs once per distinct company
+    codes, companies = pd.factorize(df['company'].astype(object))
+    companies = np.array([normalize_company(company) for company in companies] + [''], dtype=object)
+    titles = df['title'].tolist()
+    blocks = companies[codes] + '|' + np.array([seniority(title) for title in titles], dtype=object)
+    sets = [shingles(title, location) for title, location in zip(titles, df['location'].tolist())]
+    records['signature'] = minhash(sets)
+    # Jobs without a usable title are never clustered with anything
+    records['block'] = np.where(np.fromiter(map(len, sets), dtype=np.int64, count=len(sets)) > 0,
+                                pd.util.hash_array(blocks), 0)
+    return records
+
+
+def candidate_pairs(records):
+    """Pairs of jobs in the same block that share at least one band of their signature"""
+    usable = np.flatnonzero(records['block'] != 0)
+    signatures = records['signature'][usable].astype(np.uint64)
+    firsts, seconds = [], []
+    for start in range(0, NUM_PERM, BAND_ROWS):
+        key = records['block'][usable]
+        for column in range(start, start + BAND_ROWS):
+            key = (key * np.uint64(0x100000001b3)) ^ signatures[:, column]
+        order = np.argsort(key, kind='stable')
+        members = usable[order]
+        same = key[order][1:] == key[order][:-1]
+        # Link each member of a bucket to the one before it and to the bucket's first member
+        bucket_starts = np.maximum.accumulate(np.where(np.r_[True, ~same], np.arange(len(members)), 0))
+        firsts += [members[1:][same], members[1:][same]]
+        seconds += [members[:-1][same], members[bucket_starts][1:][same]]
+    if not firsts:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    # A pair can share several bands; drop repeats as one int64 per (smaller, larger) pair
+    firsts, seconds = np.concatenate(firsts), np.concatenate(seconds)
+    low, high = np.minimum(firsts, seconds), np.maximum(firsts, seconds)
+    pairs = np.unique(low[low != high] * len(records) + high[low != high])
+    return pairs // len(records), pairs % len(records)
+
+
+def cluster_labels(records, chunk=250_000):
+    """Near-duplicate cluster of each record: the position of the earliest record in its cluster"""
+    firsts, seconds = candidate_pairs(records)
+    keep = np.zeros(len(firsts), dtype=bool)
+    for start in range(0, len(firsts), chunk):
+        a, b = firsts[start:start + chunk], seconds[start:start + chunk]
+        agreement = (records['signature'][a] == records['signature'][b]).mean(axis=1)
+        keep[start:start + chunk] = (agreement >= THRESHOLD) & (records['block'][a] == records['block'][b])
+    return connected_components(len(records), firsts[keep], seconds[keep])
+
+
+def connected_components(n, firsts, seconds):
+    """Smallest node of each node's component, for an undirected graph given as edge arrays"""
+    labels = np.arange(n)
+    while True:
+        previous = labels
+        lowest = np.minimum(labels[firsts], labels[seconds])
+        labels = labels.copy()
+        np.minimum.at(labels, firsts, lowest)
+        np.minimum.at(labels, seconds, lowest)
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            return labels
+
+
+class JobClusters:
+    """MinHash signatures of every job, keyed by (source, job_id), and their near-duplicate clusters.
+
+    Catches what exact (source, job_id) dedup can't: a posting re-listed
+    under a new LinkedIn id, or a Google role found both on Google Careers
+    and on LinkedIn. Jobs are near-duplicates when their company and
+    seniority match after normalization and their title (plus city)
+    shingles are similar.
+    Stored like JobLifecycle: keys one per line in minhash.keys, the
+    signature of the key on line i as the i-th record of minhash.bin. Only
+    jobs not hashed before are hashed; clusters are recomputed from the
+    stored signatures with LSH banding, without comparing every pair.
+    """
+
+    def __init__(self, root=STORE_DIR):
+        self.keys_path = os.path.join(root, 'minhash.keys')
+        self.records_path = os.path.join(root, 'minhash.bin')
+        self.ordinals = {}
+        self._labels = None
+
+    @classmethod
+    def load(cls, root=STORE_DIR):
+        clusters = cls(root)
+        if os.path.exists(clusters.keys_path) and os.path.exists(clusters.records_path):
+            records = os.path.getsize(clusters.records_path) // RECORD.itemsize
+            with open(clusters.keys_path, encoding='utf-8') as f:
+                keys = [line.rstrip('\n') for line in f]
+            # Records are written before keys, so ignore keys a crash left without one
+            clusters.ordinals = {key: i for i, key in enumerate(keys[:records])}
+        return clusters
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def add(self, df):
+        """Hash the jobs in df (title, company, location, source, job_id) not seen before; return how many"""
+        if df.empty:
+            return 0
+        keys = index_keys(df)
+        new = (~keys.isin(self.ordinals.keys()) & ~keys.duplicated()).values
+        if not new.any():
+            return 0
+        records = job_records(df[new])
+        os.makedirs(os.path.dirname(self.keys_path) or '.', exist_ok=True)
+        with open(self.records_path, 'ab') as f:
+            f.write(records.tobytes())
+        with open(self.keys_path, 'a', encoding='utf-8') as f:
+            f.writelines(f"{key}\n" for key in keys[new])
+        start = len(self.ordinals)
+        self.ordinals.update(zip(keys[new], range(start, start + int(new.sum()))))
+        self._labels = None
+        return int(new.sum())
+
+    def labels(self):
+        """Cluster of every stored job, in key order"""
+        if self._labels is None:
+            records = (np.fromfile(self.records_path, dtype=RECORD, count=len(self.ordinals))
+                       if self.ordinals else np.zeros(0, dtype=RECORD))
+            self._labels = cluster_labels(records)
+        return self._labels
+
+    def assign(self, df):
+        """Cluster id of each row of df, or -1 for jobs that were never added"""
+        ordinals = index_keys(df).map(self.ordinals)
+        known = ordinals.notna().values
+        clusters = np.full(len(df), -1, dtype=np.int64)
+        clusters[known] = self.labels()[ordinals[known].astype(np.int64).values]
+        return pd.Series(clusters, index=df.index, name='cluster')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cluster near-duplicate postings in the job store")
+    parser.add_argument('--store', default=STORE_DIR)
+    parser.add_argument('--examples', type=int, default=5, help="print this many of the largest clusters")
+    args = parser.parse_args()
+    store = JobStore(args.store)
+    jobs = store.read(columns=['title', 'company', 'location', 'source', 'job_id', 'run_time'])
+    clusters = JobClusters.load(args.store)
+    print(f"Hashed {clusters.add(jobs)} new jobs", flush=True)
+    jobs['cluster'] = clusters.assign(jobs)
+    sizes = jobs['cluster'].value_counts()
+    print(f"{len(jobs)} jobs in {len(sizes)} clusters ({int((sizes > 1).sum())} with near-duplicates)", flush=True)
+    for cluster in sizes.index[:args.examples]:
+        members = jobs[jobs['cluster'] == cluster]
+        print(f"\n{len(members)} jobs, e.g.:", flush=True)
+        print(members[['source', 'company', 'title', 'location', 'run_time']].head(5).to_string(index=False),
+              flush=True)
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+# Low-cardinality text columns: a few hundred distinct values over the whole history
+CATEGORY_COLUMNS = ['company', 'location', 'source']
+
+# Stable link to a posting, given its canonical job id
+LINK_TEMPLATES = {
+    'LinkedIn': 'https://www.linkedin.com/jobs/view/{}',
+    'Google Careers': 'https://www.google.com/about/careers/applications/jobs/results/{}',
+}
+
+
+def typed_jobs(df):
+    """Convert a jobs frame to compact dtypes.
+
+    company/location/source become categories, run_time is parsed once to
+    datetime64 and job_id becomes int64. link is dropped: job_links()
+    rebuilds it from (source, job_id) when it is needed.
+    """
+    df = df.drop(columns=['link'], errors='ignore')
+    types = {col: 'category' for col in CATEGORY_COLUMNS if col in df.columns}
+    if 'job_id' in df.columns:
+        types['job_id'] = 'int64'
+    df = df.astype(types)
+    if 'run_time' in df.columns:
+        # A categorical column (from a ColumnSnapshot) is parsed once per run and stays categorical until astype
+        df['run_time'] = pd.to_datetime(df['run_time'], errors='coerce', format='mixed').astype('datetime64[ns]')
+    return df
+
+
+def job_links(df):
+    """Rebuild each row's link from its source and job_id, as an object array"""
+    sources = df['source'].astype('category')
+    prefixes = np.array([LINK_TEMPLATES.get(source, '{}').format('') for source in sources.cat.categories] + [''],
+                        dtype=object)
+    return prefixes[sources.cat.codes.values] + df['job_id'].astype(str).values.astype(object)
+
+
+def memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 2 ** 20
@@ -0,0 +1,205 @@
+import os
+import re
+import argparse
+import numpy as np
+import pandas as pd
+
+LINKEDIN_JOB_ID_RE = re.compile(r'-(\d+)(?:\?|$)')
+GOOGLE_JOB_ID_RE = re.compile(r'/jobs/results/(\d+)')
+
+
+def extract_linkedin_job_id(url):
+    """Extract LinkedIn job ID from URL using regex"""
+    match = LINKEDIN_JOB_ID_RE.search(url)
+    return match.group(1) if match else None
+
+
+def extract_google_job_id(url):
+    """Extract Google Careers job ID (the numeric prefix of the results slug)"""
+    match = GOOGLE_JOB_ID_RE.search(url)
+    return match.group(1) if match else None
+
+
+def canonical_link(link):
+    """Drop the per-session query string (refId, trackingId, position, ...)"""
+    if not isinstance(link, str):
+        return link
+    return link.split('?', 1)[0]
+
+
+def canonical_job_id(source, link, job_id=None):
+    """Return the stable job id for a posting, or None if it can't be derived"""
+    if isinstance(link, str):
+        if source == 'Google Careers':
+            derived = extract_google_job_id(link)
+        else:
+            derived = extract_linkedin_job_id(link)
+        if derived:
+            return derived
+    if job_id is None or pd.isna(job_id):
+        return None
+    job_id = str(job_id).strip()
+    return job_id if job_id.isdigit() else None
+
+
+def canonicalize_jobs(df):
+    """Rewrite job_id and link columns to their canonical form.
+
+    Rows whose id can't be derived are dropped, since they can never be
+    deduplicated reliably. Without a link column (rows read back from the
+    store) only job_id is normalized.
+    """
+    if df.empty:
+        return df
+    df = df.copy()
+    if 'link' not in df.columns:
+        derived = np.array([canonical_job_id(None, None, job_id) for job_id in df['job_id'].values], dtype=object)
+        df['job_id'] = derived
+        return df[pd.notna(derived)].reset_index(drop=True)
+    links = [canonical_link(link) for link in df['link'].tolist()]
+    # Ids are extracted once per distinct canonical link (code -1 = missing link)
+    codes, uniques = pd.factorize(pd.Series(links, dtype=object))
+    derived = np.array([extract_linkedin_job_id(link) for link in uniques] + [None], dtype=object)[codes]
+    is_google = (df['source'] == 'Google Careers').values
+    if is_google.any():
+        google_ids = np.array([extract_google_job_id(link) for link in uniques] + [None], dtype=object)[codes]
+        derived = np.where(is_google, google_ids, derived)
+    # Fall back to the scraped job_id when the link doesn't carry one
+    missing = pd.isna(derived)
+    if missing.any():
+        derived[missing] = [canonical_job_id(None, None, job_id) for job_id in df['job_id'].values[missing]]
+    df['job_id'] = derived
+    df['link'] = links
+    return df[pd.notna(derived)].reset_index(drop=True)
+
+
+def index_keys(df):
+    """Index keys ("source<TAB>job_id", as stored on disk) for each row of df"""
+    return df['source'].astype(str) + '\t' + df['job_id'].astype(str)
+
+
+def scoped_keys(keys, scope=None):
+    """Index keys within a scope: "<scope><TAB>source<TAB>job_id", or the plain key without one"""
+    return keys if scope is None else scope + '\t' + keys
+
+
+class JobIndex:
+    """Set of (source, job_id) keys already stored, persisted one key per line.
+
+    The file is append-only: new keys are written by save() without
+    rewriting the keys that were loaded. Keys can be scoped (see
+    scoped_keys): each market stores the postings its own queries found,
+    so one posting can be stored once per market.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.keys = set()
+        self._pending = []
+
+    @classmethod
+    def load(cls, path):
+        index = cls(path)
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                index.keys = {line.rstrip('\n') for line in f if '\t' in line}
+        return index
+
+    @classmethod
+    def from_frame(cls, df, path=None):
+        index = cls(path)
+        index.add_frame(df)
+        return index
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        source, job_id = key
+        return f"{source}\t{job_id}" in self.keys
+
+    def add(self, source, job_id):
+        """Add a key, returning False if it was already known"""
+        key = f"{source}\t{job_id}"
+        if key in self.keys:
+            return False
+        self.keys.add(key)
+        self._pending.append(key)
+        return True
+
+    def add_frame(self, df):
+        self.filter_new(df)
+
+    def new_mask(self, df, scope=None):
+        """Boolean array: which rows of a canonicalized frame aren't indexed yet in scope.
+
+        Unlike filter_new, the index is left unchanged.
+        """
+        if df.empty:
+            return np.zeros(0, dtype=bool)
+        return ~scoped_keys(index_keys(df), scope).isin(self.keys).values
+
+    def filter_new(self, df, scope=None):
+        """Return the rows of a canonicalized frame whose key isn't indexed yet in scope.
+
+        Accepted keys are added to the index, so duplicates within df are
+        dropped as well (first occurrence wins).
+        """
+        if df.empty:
+            return df
+        keys = scoped_keys(index_keys(df), scope)
+        mask = ~keys.duplicated() & ~keys.isin(self.keys)
+        new_keys = keys[mask].tolist()
+        self.keys.update(new_keys)
+        self._pending.extend(new_keys)
+        return df[mask.values].reset_index(drop=True)
+
+    def save(self):
+        if not self.path:
+            return
+        mode = 'a' if os.path.exists(self.path) else 'w'
+        keys = self._pending if mode == 'a' else sorted(self.keys)
+        with open(self.path, mode, encoding='utf-8') as f:
+            f.writelines(f"{key}\n" for key in keys)
+        self._pending = []
+
+
+class SeenIds:
+    """Sorted int64 array of one source's stored job ids.
+
+    A compact read-only view of the index for the scraper: about 8 bytes
+    per id, with vectorized membership checks by binary search.
+    """
+
+    def __init__(self, job_ids=()):
+        self.ids = np.unique(np.asarray(list(job_ids), dtype=np.int64))
+
+    @classmethod
+    def from_index(cls, index, source, scope=None):
+        prefix = scoped_keys(f"{source}\t", scope)
+        return cls(key[len(prefix):] for key in index.keys if key.startswith(prefix))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, job_id):
+        return bool(self.known_mask([job_id])[0])
+
+    def known_mask(self, job_ids):
+        """Boolean array: which of job_ids are already stored"""
+        job_ids = np.asarray(list(job_ids), dtype=np.int64)
+        if not len(self.ids) or not len(job_ids):
+            return np.zeros(len(job_ids), dtype=bool)
+        positions = np.minimum(np.searchsorted(self.ids, job_ids), len(self.ids) - 1)
+        return self.ids[positions] == job_ids
+
+
+if __name__ == "__main__":
+    from job_store import STORE_DIR, JobStore
+    parser = argparse.ArgumentParser(description="Inspect or rebuild the job store's identity index")
+    parser.add_argument('--store', default=STORE_DIR)
+    parser.add_argument('--rebuild', action='store_true', help="rewrite index.tsv from the stored rows")
+    args = parser.parse_args()
+    store = JobStore(args.store)
+    index = store.rebuild_index() if args.rebuild else store.load_index()
+    print(f"Indexed {len(index)} jobs in {index.path}", flush=True)
@@ -0,0 +1,250 @@
+import io
+import os
+import json
+import argparse
+import numpy as np
+import pandas as pd
+from job_index import SeenIds, canonicalize_jobs, index_keys
+from job_store import STORE_DIR, JobStore
+
+SIGHTINGS_FILE = 'sightings.csv'
+SIGHTING_COLUMNS = ['source', 'job_id', 'run_time']
+
+# One fixed-width record per job; times are minutes since the Unix epoch
+RECORD = np.dtype([('first_seen', '<i4'), ('last_seen', '<i4'), ('seen_count', '<i4')])
+
+# A posting not seen in the last three 12-hour runs is considered closed
+ACTIVE_WINDOW = pd.Timedelta(hours=36)
+
+
+def to_minutes(run_times):
+    return (pd.to_datetime(pd.Series(run_times), format='mixed').values.astype('datetime64[m]')
+            .astype(np.int64).astype(np.int32))
+
+
+def from_minutes(minutes):
+    return pd.to_datetime(np.asarray(minutes, dtype=np.int64), unit='m')
+
+
+class JobLifecycle:
+    """first_seen / last_seen / seen_count for every job, keyed by (source, job_id).
+
+    Every sighting (a job seen in a run) is appended to sightings.csv,
+    the table's source of truth. The table itself is derived from it:
+    keys are listed one per line in lifecycle.keys, and the record of the
+    key on line i is the i-th fixed-width record of lifecycle.bin. A run
+    rewrites only the records of the jobs it observed, in place, and
+    appends records for jobs it sees for the first time. lifecycle.json
+    records how much of the log the table holds, so load() rebuilds a
+    missing table and catches up a stale one from the log.
+    """
+
+    def __init__(self, root=STORE_DIR):
+        self.keys_path = os.path.join(root, 'lifecycle.keys')
+        self.records_path = os.path.join(root, 'lifecycle.bin')
+        self.meta_path = os.path.join(root, 'lifecycle.json')
+        self.sightings_path = os.path.join(root, SIGHTINGS_FILE)
+        self.ordinals = {}
+        # Bytes of the sightings log folded into the table
+        self.offset = 0
+
+    @classmethod
+    def load(cls, root=STORE_DIR):
+        lifecycle = cls(root)
+        paths = [lifecycle.keys_path, lifecycle.records_path, lifecycle.meta_path]
+        if all(os.path.exists(path) for path in paths):
+            with open(lifecycle.meta_path, encoding='utf-8') as f:
+                lifecycle.offset = json.load(f)['offset']
+            records = os.path.getsize(lifecycle.records_path) // RECORD.itemsize
+            with open(lifecycle.keys_path, encoding='utf-8') as f:
+                keys = [line.rstrip('\n') for line in f]
+            # Records are written before keys, so ignore keys a crash left without one
+            lifecycle.ordinals = {key: i for i, key in enumerate(keys[:records])}
+        else:
+            # Without its offset a leftover table can't be caught up, so it is rebuilt from the log
+            lifecycle._reset()
+        lifecycle.catch_up()
+        return lifecycle
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def _reset(self):
+        for path in [self.keys_path, self.records_path, self.meta_path]:
+            if os.path.exists(path):
+                os.remove(path)
+        self.ordinals = {}
+        self.offset = 0
+
+    def _save_meta(self):
+        tmp_path = self.meta_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'offset': self.offset}, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def catch_up(self):
+        """Fold the sightings logged since the table was last written; return how many"""
+        if not os.path.exists(self.sightings_path):
+            if self.ordinals:
+                self._reset()
+            return 0
+        if self.offset > os.path.getsize(self.sightings_path):
+            # The table is ahead of the log it was built from: start over
+            self._reset()
+        with open(self.sightings_path, 'r+b') as f:
+            f.seek(self.offset)
+            data = f.read()
+            complete = data.rfind(b'\n') + 1
+            if complete < len(data):
+                # Drop a line cut short by a crash, so the next append starts on a fresh line
+                f.truncate(self.offset + complete)
+        if not complete:
+            return 0
+        header = 0 if self.offset == 0 else None
+        sightings = pd.read_csv(io.BytesIO(data[:complete]), header=header, names=SIGHTING_COLUMNS,
+                                dtype={'job_id': str})
+        self._fold(sightings)
+        self.offset += complete
+        self._save_meta()
+        return len(sightings)
+
+    def observe(self, df):
+        """Record that the (canonicalized) jobs in df were seen at their run_time.
+
+        Returns (jobs seen before, jobs seen for the first time). A job seen
+        twice in the same run is only counted once.
+        """
+        if df.empty:
+            return 0, 0
+        self.catch_up()
+        sightings = df[SIGHTING_COLUMNS].assign(minute=to_minutes(df['run_time'].values))
+        sightings = sightings.drop_duplicates(['source', 'job_id', 'minute']).sort_values('minute', kind='stable')
+        os.makedirs(os.path.dirname(self.sightings_path) or '.', exist_ok=True)
+        write_header = not os.path.exists(self.sightings_path)
+        sightings[SIGHTING_COLUMNS].to_csv(self.sightings_path, mode='a', header=write_header, index=False)
+        counts = self._fold(sightings)
+        self.offset = os.path.getsize(self.sightings_path)
+        self._save_meta()
+        return counts
+
+    def _fold(self, sightings):
+        """Apply sightings (source, job_id, run_time) to the table; return (known jobs, new jobs)"""
+        if sightings.empty:
+            return 0, 0
+        minutes = sightings['minute'].values if 'minute' in sightings else to_minutes(sightings['run_time'].values)
+        seen = pd.DataFrame({'key': index_keys(sightings).values, 'minute': minutes}).drop_duplicates()
+        ordinals = seen['key'].map(self.ordinals)
+        known = ordinals.notna().values
+        updated = 0
+        if known.any():
+            positions = ordinals[known].astype(np.int64).values
+            records = np.memmap(self.records_path, dtype=RECORD, mode='r+')
+            minutes = seen['minute'].values[known]
+            # A sighting counts as another run only if it is later than the job's last sighting
+            later = minutes > records['last_seen'][positions]
+            by_job = pd.DataFrame({'position': positions, 'minute': minutes, 'later': later}).groupby('position')
+            changes = by_job.agg(first=('minute', 'min'), last=('minute', 'max'), later=('later', 'sum'))
+            touched = records[changes.index.values]
+            touched['seen_count'] += changes['later'].values.astype(np.int32)
+            touched['last_seen'] = np.maximum(touched['last_seen'], changes['last'].values)
+            touched['first_seen'] = np.minimum(touched['first_seen'], changes['first'].values)
+            records[changes.index.values] = touched
+            records.flush()
+            del records
+            updated = len(changes)
+        new = seen[~known].groupby('key', sort=False)['minute'].agg(['min', 'max', 'nunique'])
+        if len(new):
+            appended = np.empty(len(new), dtype=RECORD)
+            appended['first_seen'] = new['min'].values
+            appended['last_seen'] = new['max'].values
+            appended['seen_count'] = new['nunique'].values
+            os.makedirs(os.path.dirname(self.keys_path) or '.', exist_ok=True)
+            with open(self.records_path, 'ab') as f:
+                f.write(appended.tobytes())
+            with open(self.keys_path, 'a', encoding='utf-8') as f:
+                f.writelines(f"{key}\n" for key in new.index)
+            start = len(self.ordinals)
+            self.ordinals.update(zip(new.index, range(start, start + len(new))))
+        return updated, len(new)
+
+    def frame(self):
+        """The whole table: source, job_id, first_seen, last_seen, seen_count"""
+        if not self.ordinals:
+            return pd.DataFrame(columns=['source', 'job_id', 'first_seen', 'last_seen', 'seen_count'])
+        records = np.fromfile(self.records_path, dtype=RECORD, count=len(self.ordinals))
+        keys = pd.Series(list(self.ordinals)).str.split('\t', n=1, expand=True)
+        return pd.DataFrame({
+            'source': keys[0].astype('category'),
+            'job_id': keys[1].astype('int64'),
+            'first_seen': from_minutes(records['first_seen']),
+            'last_seen': from_minutes(records['last_seen']),
+            'seen_count': records['seen_count'],
+        })
+
+    def repeat_ids(self, source):
+        """job_index.SeenIds of the source's jobs seen in more than one run"""
+        table = self.frame()
+        return SeenIds(table['job_id'][(table['source'] == source) & (table['seen_count'] > 1)])
+
+
+def open_lifecycle(store):
+    """Load the store's lifecycle table, seeding it from the stored rows if there is no sightings log"""
+    lifecycle = JobLifecycle.load(store.root)
+    if not len(lifecycle) and store.row_count:
+        lifecycle.observe(store.read(columns=SIGHTING_COLUMNS))
+        print(f"Seeded job lifecycle table with {len(lifecycle)} jobs", flush=True)
+    return lifecycle
+
+
+def seed_lifecycle(store, csv_file):
+    """Start the sightings log over from every row of csv_file and the store's rows.
+
+    csv_file should hold every sighting, like the CSV did before dedup
+    compaction kept only each job's first row; the store adds the jobs
+    stored since.
+    """
+    lifecycle = JobLifecycle(store.root)
+    lifecycle._reset()
+    if os.path.exists(lifecycle.sightings_path):
+        os.remove(lifecycle.sightings_path)
+    raw = canonicalize_jobs(pd.read_csv(csv_file, dtype={'job_id': str}))
+    lifecycle.observe(pd.concat([raw[SIGHTING_COLUMNS], store.read(columns=SIGHTING_COLUMNS)], ignore_index=True))
+    print(f"Seeded job lifecycle table with {len(lifecycle)} jobs from {csv_file}", flush=True)
+    return lifecycle
+
+
+def lifecycle_metrics(table, now=None):
+    """Active postings and time-to-fill from a lifecycle frame.
+
+    A posting is active if it was seen within ACTIVE_WINDOW of the latest
+    run; the others are closed, and their days open (first to last seen)
+    stand in for time-to-fill. The median only counts closed postings seen
+    in more than one run, since a single sighting says nothing about how
+    long a posting stayed open. Days open only cover the runs a posting
+    was seen in: the LinkedIn searches return the last 24 hours of
+    postings, so one that isn't reposted or refreshed drops out after a
+    day or two however long it stays open.
+    """
+    if table.empty:
+        return {'jobs': 0, 'active': 0, 'closed': 0, 'median_days_open': None, 'repeat_share': None}
+    now = now if now is not None else table['last_seen'].max()
+    active = table['last_seen'] >= now - ACTIVE_WINDOW
+    repeated = table['seen_count'] > 1
+    days_open = (table['last_seen'] - table['first_seen'])[~active & repeated].dt.total_seconds() / 86400
+    return {
+        'jobs': len(table),
+        'active': int(active.sum()),
+        'closed': int((~active).sum()),
+        'median_days_open': float(days_open.median()) if len(days_open) else None,
+        'repeat_share': float(repeated.mean()),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect the job lifecycle table")
+    parser.add_argument('--store', default=STORE_DIR)
+    parser.add_argument('--seed-csv', help="rebuild the sightings log from every row of this CSV and the store")
+    args = parser.parse_args()
+    store = JobStore(args.store)
+    lifecycle = seed_lifecycle(store, args.seed_csv) if args.seed_csv else open_lifecycle(store)
+    print(lifecycle_metrics(lifecycle.frame()), flush=True)
@@ -0,0 +1,259 @@
+import os
+import json
+import argparse
+import pandas as pd
+from job_index import JobIndex, canonicalize_jobs
+from markets import DEFAULT_COUNTRY, DEFAULT_POSITION, Market
+
+STORE_DIR = 'job_store'
+COLUMNS = ['title', 'company', 'location', 'source', 'job_id', 'run_time']
+# Scraped columns that aren't stored: job_frame.job_links() rebuilds link from (source, job_id)
+DERIVED_COLUMNS = ['link']
+MANIFEST_VERSION = 1
+
+
+class JobStore:
+    """Append-only job history split into one CSV segment per day.
+
+    Each run appends its new rows to the segment of the day it ran on and
+    records the segment in manifest.json, so the cost of a write depends on
+    the size of the run, not of the history. Readers pick segments from the
+    manifest and only parse the columns they ask for.
+
+    Rows may bring columns the store doesn't have yet (e.g. enrichment
+    fields); they are added to the manifest and read back as empty for
+    segments written before them. Each segment records its own columns.
+    DERIVED_COLUMNS are never stored.
+    """
+
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        self.manifest_path = os.path.join(root, 'manifest.json')
+        self.index_path = os.path.join(root, 'index.tsv')
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        return {'version': MANIFEST_VERSION, 'columns': list(COLUMNS), 'partitions': []}
+
+    def _save_manifest(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=1)
+            f.write('\n')
+        os.replace(tmp_path, self.manifest_path)
+
+    @property
+    def exists(self):
+        return os.path.exists(self.manifest_path)
+
+    @property
+    def partitions(self):
+        return self.manifest['partitions']
+
+    @property
+    def row_count(self):
+        return sum(p['rows'] for p in self.partitions)
+
+    @property
+    def max_run_time(self):
+        return max((p['max_run_time'] for p in self.partitions), default=None)
+
+    def load_index(self):
+        return JobIndex.load(self.index_path)
+
+    def rebuild_index(self):
+        """Rewrite index.tsv from the stored rows, each under its market's scope, and return it"""
+        rows = canonicalize_jobs(self.read(columns=['source', 'job_id', 'country', 'position']))
+        rows = rows.fillna({'country': DEFAULT_COUNTRY, 'position': DEFAULT_POSITION})
+        index = JobIndex(self.index_path)
+        for (country, position), market_rows in rows.groupby(['country', 'position'], sort=False):
+            index.filter_new(market_rows, Market(country, position).scope)
+        if os.path.exists(self.index_path):
+            os.remove(self.index_path)
+        index.save()
+        return index
+
+    @staticmethod
+    def partition_columns(partition):
+        return partition.get('columns', COLUMNS)
+
+    def append(self, df):
+        """Append rows to their day segments. Rows must already be deduplicated."""
+        if df.empty:
+            return 0
+        df = df.drop(columns=DERIVED_COLUMNS, errors='ignore')
+        columns = self.manifest['columns']
+        self.manifest['columns'] = columns = columns + [col for col in df.columns if col not in columns]
+        df = df.reindex(columns=columns)
+        by_name = {p['name']: p for p in self.partitions}
+        os.makedirs(self.root, exist_ok=True)
+        for day, rows in df.groupby(df['run_time'].astype(str).str[:10], sort=True):
+            partition = by_name.get(day)
+            if partition is None:
+                partition = {'name': day, 'file': f'{day}.csv', 'rows': 0,
+                             'min_run_time': None, 'max_run_time': None}
+                self.partitions.append(partition)
+                by_name[day] = partition
+            path = os.path.join(self.root, partition['file'])
+            if os.path.exists(path) and self.partition_columns(partition) != columns:
+                # The store gained columns since this segment was started: rewrite it with the new header
+                existing = pd.read_csv(path, dtype={'job_id': str}).reindex(columns=columns)
+                existing.to_csv(path + '.tmp', index=False)
+                os.replace(path + '.tmp', path)
+            write_header = not os.path.exists(path)
+            rows.to_csv(path, mode='a', header=write_header, index=False)
+            if columns != COLUMNS:
+                partition['columns'] = list(columns)
+            run_times = rows['run_time'].astype(str)
+            partition['rows'] += len(rows)
+            partition['min_run_time'] = min(filter(None, [partition['min_run_time'], run_times.min()]))
+            partition['max_run_time'] = max(filter(None, [partition['max_run_time'], run_times.max()]))
+        self.partitions.sort(key=lambda p: p['name'])
+        self._save_manifest()
+        return len(df)
+
+    def drop_columns(self, columns):
+        """Rewrite every segment without `columns` and return how many segments changed"""
+        columns = [col for col in columns if col in self.manifest['columns']]
+        if not columns:
+            return 0
+        rewritten = 0
+        for partition in self.partitions:
+            path = os.path.join(self.root, partition['file'])
+            # The header, not the manifest: segments that predate COLUMNS changing don't record their columns
+            segment_columns = list(pd.read_csv(path, nrows=0).columns)
+            kept = [col for col in segment_columns if col not in columns]
+            if kept == segment_columns:
+                continue
+            pd.read_csv(path, usecols=kept, dtype={'job_id': str})[kept].to_csv(path + '.tmp', index=False)
+            os.replace(path + '.tmp', path)
+            if kept == COLUMNS:
+                partition.pop('columns', None)
+            else:
+                partition['columns'] = kept
+            rewritten += 1
+        self.manifest['columns'] = [col for col in self.manifest['columns'] if col not in columns]
+        self._save_manifest()
+        return rewritten
+
+    def fill(self, df, columns):
+        """Overwrite `columns` of stored rows with their values in df; return how many rows changed.
+
+        Rows are matched on source, job_id and run_time, so a posting
+        stored by several markets (or runs) is only updated where df has
+        it. Only the segments of the days df covers are rewritten.
+        """
+        keys = ['source', 'job_id', 'run_time']
+        by_name = {p['name']: p for p in self.partitions}
+        updated = 0
+        df = df.astype({'job_id': str}).drop_duplicates(keys).set_index(keys)
+        for day, rows in df.groupby(df.index.get_level_values('run_time').astype(str).str[:10]):
+            partition = by_name.get(day)
+            if partition is None:
+                continue
+            path = os.path.join(self.root, partition['file'])
+            segment = pd.read_csv(path, dtype={'job_id': str})
+            present = [column for column in columns if column in segment]
+            stored = pd.MultiIndex.from_frame(segment[keys])
+            hit = stored.isin(rows.index)
+            if not hit.any() or not present:
+                continue
+            segment[present] = segment[present].astype(object)
+            segment.loc[hit, present] = rows.loc[stored[hit], present].values
+            segment.to_csv(path + '.tmp', index=False)
+            os.replace(path + '.tmp', path)
+            updated += int(hit.sum())
+        return updated
+
+    def select_partitions(self, since=None, until=None):
+        """Partitions that may hold rows with since < run_time <= until"""
+        return [p for p in self.partitions
+                if (since is None or p['max_run_time'] > since)
+                and (until is None or p['min_run_time'] <= until)]
+
+    def read(self, columns=None, since=None, until=None):
+        """Load rows with since < run_time <= until, parsing only `columns`"""
+        usecols = list(columns) if columns else list(self.manifest['columns'])
+        filter_time = since is not None or until is not None
+        if filter_time and 'run_time' not in usecols:
+            usecols.append('run_time')
+        frames = []
+        for partition in self.select_partitions(since, until):
+            path = os.path.join(self.root, partition['file'])
+            present = [col for col in usecols if col in self.partition_columns(partition)]
+            frames.append(pd.read_csv(path, usecols=present, dtype={'job_id': str}).reindex(columns=usecols))
+        if not frames:
+            return pd.DataFrame(columns=columns or self.manifest['columns'])
+        df = pd.concat(frames, ignore_index=True)
+        if since is not None:
+            df = df[df['run_time'] > since]
+        if until is not None:
+            df = df[df['run_time'] <= until]
+        return df[columns or self.manifest['columns']].reset_index(drop=True)
+
+
+def export_csv(csv_file, df):
+    """Append new rows to the legacy single-file CSV export"""
+    if os.path.exists(csv_file):
+        with open(csv_file, encoding='utf-8') as f:
+            header = f.readline().rstrip('\r\n').split(',')
+        if header != COLUMNS:
+            # Written before the columns changed (e.g. with link): rewrite it with the current header
+            existing = pd.read_csv(csv_file, dtype={'job_id': str}).reindex(columns=COLUMNS)
+            existing.to_csv(csv_file + '.tmp', index=False)
+            os.replace(csv_file + '.tmp', csv_file)
+    write_header = not os.path.exists(csv_file)
+    df.reindex(columns=COLUMNS).to_csv(csv_file, mode='a', header=write_header, index=False)
+
+
+def open_store(root=STORE_DIR, csv_file=None):
+    """Open the store, importing csv_file into it the first time"""
+    store = JobStore(root)
+    if not store.exists and csv_file and os.path.exists(csv_file):
+        index = JobIndex(store.index_path)
+        history = index.filter_new(canonicalize_jobs(pd.read_csv(csv_file, dtype={'job_id': str})))
+        store.append(history)
+        index.save()
+        print(f"Imported {len(history)} jobs from {csv_file} into {root}", flush=True)
+    if any(col in store.manifest['columns'] for col in DERIVED_COLUMNS):
+        # Stores written before links were derived: drop them once
+        store.drop_columns(DERIVED_COLUMNS)
+        print(f"Dropped {', '.join(DERIVED_COLUMNS)} from {root}", flush=True)
+    return store
+
+
+def merge_new_jobs(store, jobs, csv_file=None, lifecycle=None, enricher=None, scope=None):
+    """Store the rows of a scrape that aren't known yet and return them.
+
+    With a JobLifecycle, every scraped job (new or not) is also recorded as
+    seen in this run. With a JobEnricher, the new rows get its detail-page
+    columns before they are stored. Rows are new when they aren't stored
+    in `scope` yet (a market's Market.scope; None for the default market).
+    """
+    index = store.load_index()
+    jobs = canonicalize_jobs(jobs)
+    if lifecycle is not None:
+        lifecycle.observe(jobs)
+    new_jobs = index.filter_new(jobs, scope)
+    if enricher is not None:
+        new_jobs = enricher.enrich(new_jobs)
+    store.append(new_jobs)
+    if csv_file:
+        export_csv(csv_file, new_jobs)
+    index.save()
+    return new_jobs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or import the partitioned job store")
+    parser.add_argument('--store', default=STORE_DIR)
+    parser.add_argument('--import-csv', default='Data_Science_Jobs_Israel.csv',
+                        help="CSV to import when the store doesn't exist yet")
+    args = parser.parse_args()
+    store = open_store(args.store, args.import_csv)
+    print(f"{store.root}: {len(store.partitions)} partitions, {store.row_count} rows, "
+          f"last run {store.max_run_time}", flush=True)
@@ -0,0 +1,81 @@
+import re
+import numpy as np
+import pandas as pd
+from collections import Counter
+
+# Words, plus the separators no phrase may span: the newlines between titles in tokenize(),
+# punctuation, and spaced dashes ("Data Scientist - NLP", but not "full-stack")
+TOKEN_RE = re.compile(r'[a-z][a-z0-9]*|\n|[,;:|()/]|\s[-\u2013]\s')
+
+# Single keywords shorter than this are too generic to chart ("data" is the shortest kept)
+MIN_KEYWORD_LENGTH = 4
+
+# Seniority, work-mode and filler words: dropped before counting, and no phrase may contain one.
+# Each market adds its own place names (markets.LOCATION_WORDS).
+STOP_WORDS = frozenset([
+    'senior', 'junior', 'lead', 'principal', 'staff', 'head', 'team', 'developer', 'intern', 'student',
+    'hybrid', 'remote',
+    'a', 'an', 'and', 'at', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'with',
+])
+
+
+def tokenize(titles):
+    """Factorized title tokens: (codes, vocabulary, segment of each token).
+
+    All titles go through the regex in one pass, joined by newlines. Every
+    separator match starts a new segment, so tokens are adjacent in a
+    phrase only if they share a segment. Separators stay in the vocabulary
+    but never appear in codes.
+    """
+    text = '\n'.join(pd.Series(titles, dtype=object).astype(str)).lower()
+    codes, vocabulary = pd.factorize(np.array(TOKEN_RE.findall(text), dtype=object))
+    vocabulary = np.asarray(vocabulary, dtype=object)
+    breaks = np.array([not token[0].isalpha() for token in vocabulary], dtype=bool)[codes]
+    return codes[~breaks].astype(np.int64), vocabulary, np.cumsum(breaks)[~breaks]
+
+
+def _ngram_codes(codes, segments, stopped, n):
+    """Every run of n consecutive tokens within one segment that avoids stop words,
+    encoded as one integer per n-gram (digits in base len(vocabulary))"""
+    m = len(codes) - n + 1
+    if m <= 0:
+        return np.array([], dtype=np.int64)
+    usable = np.ones(m, dtype=bool)
+    for k in range(n):
+        usable &= (segments[k:k + m] == segments[:m]) & ~stopped[codes[k:k + m]]
+    base = len(stopped)
+    grams = np.zeros(usable.sum(), dtype=np.int64)
+    for k in range(n):
+        grams = grams * base + codes[k:k + m][usable]
+    return grams
+
+
+def keyword_counts(titles, sizes=(1, 2, 3), stop_words=STOP_WORDS):
+    """Count keywords (n=1) and n-gram phrases in titles; return {n: Counter}.
+
+    Stop words are removed before counting, so the top of each Counter is
+    ready to chart. Counts from different runs can simply be added. Stop-word
+    checks run once per distinct word, and n-grams are counted as integers,
+    then spelled out once per distinct n-gram.
+    """
+    codes, vocabulary, segments = tokenize(titles)
+    stopped = np.array([word in stop_words for word in vocabulary], dtype=bool)
+    counts = {}
+    for n in sizes:
+        if n == 1:
+            short = np.array([len(word) < MIN_KEYWORD_LENGTH for word in vocabulary], dtype=bool)
+            tallies = pd.Series(codes[~(stopped | short)[codes]]).value_counts()
+        else:
+            tallies = pd.Series(_ngram_codes(codes, segments, stopped, n)).value_counts()
+        counts[n] = Counter({_spell(gram, vocabulary, n): int(tally) for gram, tally in tallies.items()})
+    return counts
+
+
+def _spell(gram, vocabulary, n):
+    """Turn an n-gram's integer code back into its words"""
+    base = len(vocabulary)
+    words = []
+    for _ in range(n):
+        gram, code = divmod(gram, base)
+        words.append(vocabulary[code])
+    return ' '.join(reversed(words))
@@ -0,0 +1,167 @@
+import os
+import json
+import hashlib
+
+DATA_DIR = 'jobs_data'
+SHARD_SIZE = 1000
+LISTING_COLUMNS = ['title', 'company', 'location', 'source', 'run_time', 'link']
+
+
+def _write_if_changed(path, payload):
+    """Write bytes unless the file already holds them; return True if written"""
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == payload:
+                return False
+    with open(path, 'wb') as f:
+        f.write(payload)
+    return True
+
+
+def listing_records(df):
+    """Rows of df as JSON-ready lists of LISTING_COLUMNS, run_time formatted"""
+    rows = df[LISTING_COLUMNS]
+    rows = rows.assign(run_time=rows['run_time'].dt.strftime('%Y-%m-%d %H:%M')).astype(object).fillna('')
+    return rows.values.tolist()
+
+
+def write_listing_shards(df, data_dir=DATA_DIR, shard_size=SHARD_SIZE):
+    """Write the listings as fixed-size JSON shards.
+
+    Rows are kept in chronological order, so a new run only changes the last
+    shard and appends new ones; older shards stay byte-identical and cached.
+    Returns the shard index, which goes into the data bundle.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    records = listing_records(df.sort_values('run_time', kind='stable'))
+    shards = []
+    written = 0
+    for start in range(0, len(records), shard_size):
+        name = f"listings-{start // shard_size:03d}.json"
+        payload = json.dumps({'columns': LISTING_COLUMNS, 'rows': records[start:start + shard_size]},
+                             ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        written += _write_if_changed(os.path.join(data_dir, name), payload)
+        shards.append({'file': name, 'rows': len(records[start:start + shard_size]),
+                       'hash': hashlib.sha1(payload).hexdigest()[:12], 'bytes': len(payload)})
+    # Remove shards left over from a larger previous build
+    for name in os.listdir(data_dir):
+        if name.startswith('listings-') and name not in {s['file'] for s in shards}:
+            os.remove(os.path.join(data_dir, name))
+    index = {'count': len(records), 'columns': LISTING_COLUMNS, 'shards': shards}
+    print(f"Listings: {len(records)} rows in {len(shards)} shards ({written} rewritten)")
+    return index
+
+
+def write_charts(charts, data_dir=DATA_DIR):
+    """Write {div id: plotly figure dict} as one JSON file; return its content hash"""
+    os.makedirs(data_dir, exist_ok=True)
+    payload = json.dumps(charts, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    _write_if_changed(os.path.join(data_dir, 'charts.json'), payload)
+    return hashlib.sha1(payload).hexdigest()[:12]
+
+
+def load_charts(data_dir=DATA_DIR):
+    """The figures written by the previous write_charts(), or {}"""
+    path = os.path.join(data_dir, 'charts.json')
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+PAGED_TABLE_HTML = """
+                        <div class="row g-2 mb-3">
+                            <div class="col-md-8">
+                                <input id="listing-search" type="search" class="form-control" placeholder="Search title, company or location">
+                            </div>
+                            <div class="col-md-4 text-md-end">
+                                <span id="listing-status" class="text-muted"></span>
+                            </div>
+                        </div>
+                        <div style="overflow-x: auto;">
+                            <table class="table table-striped" id="listing-table">
+                                <thead>
+                                    <tr>
+                                        <th data-col="0" role="button">Title</th>
+                                        <th data-col="1" role="button">Company</th>
+                                        <th data-col="2" role="button">Location</th>
+                                        <th data-col="3" role="button">Source</th>
+                                        <th data-col="4" role="button">Scraped At</th>
+                                        <th>Link</th>
+                                    </tr>
+                                </thead>
+                                <tbody></tbody>
+                            </table>
+                        </div>
+                        <nav class="d-flex justify-content-between align-items-center">
+                            <button id="listing-prev" class="btn btn-outline-primary btn-sm">Previous</button>
+                            <span id="listing-page" class="text-muted"></span>
+                            <button id="listing-next" class="btn btn-outline-primary btn-sm">Next</button>
+                        </nav>
+"""
+
+PAGED_TABLE_JS = """
+        // All Job Listings: rows embedded in the index, or loaded lazily from JSON shards, newest shard first
+        function showListings(index) {
+            const PAGE_SIZE = 50;
+            let rows = [], view = [], page = 0, sortCol = 4, sortDir = -1, query = '', total = 0;
+            const tbody = document.querySelector('#listing-table tbody');
+            const status = document.getElementById('listing-status');
+
+            function refresh() {
+                const q = query.toLowerCase();
+                view = q ? rows.filter(r => (r[0] + ' ' + r[1] + ' ' + r[2]).toLowerCase().includes(q)) : rows.slice();
+                view.sort((a, b) => a[sortCol] < b[sortCol] ? -sortDir : a[sortCol] > b[sortCol] ? sortDir : 0);
+                page = Math.min(page, Math.max(0, Math.ceil(view.length / PAGE_SIZE) - 1));
+                draw();
+            }
+
+            function draw() {
+                const frag = document.createDocumentFragment();
+                for (const r of view.slice(page * PAGE_SIZE, (page + 1) * PAGE_SIZE)) {
+                    const tr = document.createElement('tr');
+                    for (let c = 0; c < 5; c++) {
+                        const td = document.createElement('td');
+                        td.textContent = r[c];
+                        tr.appendChild(td);
+                    }
+                    const td = document.createElement('td');
+                    const a = document.createElement('a');
+                    a.href = r[5]; a.target = '_blank'; a.rel = 'noopener'; a.textContent = 'Apply';
+                    td.appendChild(a);
+                    tr.appendChild(td);
+                    frag.appendChild(tr);
+                }
+                tbody.replaceChildren(frag);
+                const pages = Math.max(1, Math.ceil(view.length / PAGE_SIZE));
+                document.getElementById('listing-page').textContent = 'Page ' + (page + 1) + ' of ' + pages;
+                status.textContent = view.length + ' of ' + total + ' jobs' + (rows.length < total ? ' (loading...)' : '');
+            }
+
+            document.getElementById('listing-search').addEventListener('input', e => { query = e.target.value; page = 0; refresh(); });
+            document.getElementById('listing-prev').addEventListener('click', () => { if (page > 0) { page--; draw(); } });
+            document.getElementById('listing-next').addEventListener('click', () => {
+                if ((page + 1) * PAGE_SIZE < view.length) { page++; draw(); }
+            });
+            document.querySelectorAll('#listing-table th[data-col]').forEach(th => th.addEventListener('click', () => {
+                const col = Number(th.dataset.col);
+                sortDir = col === sortCol ? -sortDir : 1;
+                sortCol = col;
+                refresh();
+            }));
+
+            total = index.count;
+            if (index.rows) {
+                rows = index.rows;
+                refresh();
+                return;
+            }
+            (async () => {
+                for (const shard of index.shards.slice().reverse()) {
+                    const data = await fetch(DATA_DIR + '/' + shard.file + '?v=' + shard.hash).then(r => r.json());
+                    rows = rows.concat(data.rows);
+                    refresh();
+                }
+            })();
+        }
+"""
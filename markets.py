@@ -0,0 +1,67 @@
+import os
+import re
+from keywords import STOP_WORDS
+
+DEFAULT_COUNTRY = 'Israel'
+DEFAULT_POSITION = 'Data Scientist'
+
+# How a searched position is named in titles and file names ("Data Science Jobs in Israel")
+LABELS = {'Data Scientist': 'Data Science'}
+
+# Place names dropped from title keywords, besides the country's own name
+LOCATION_WORDS = {
+    'Israel': ['tel', 'aviv', 'haifa', 'jerusalem'],
+}
+
+
+def market_slug(label, country):
+    """"Data Science", "Israel" -> "data-science-israel\""""
+    return re.sub(r'[^a-z0-9]+', '-', f"{label} {country}".lower()).strip('-')
+
+
+class Market:
+    """One (country, position) dashboard and the files it owns.
+
+    The default market keeps the original paths (jobs_dashboard.html,
+    jobs_data/, the CSV export and the aggregates directly in job_store/)
+    so the published dashboard doesn't move; every other market gets a
+    markets/<slug>/ directory and job_store/markets/<slug>/ for its
+    aggregates.
+    """
+
+    def __init__(self, country=DEFAULT_COUNTRY, position=DEFAULT_POSITION):
+        self.country = country
+        self.position = position
+        self.label = LABELS.get(position, position)
+        self.slug = market_slug(self.label, country)
+        self.is_default = (country, position) == (DEFAULT_COUNTRY, DEFAULT_POSITION)
+        # Identity index scope (job_index.scoped_keys): the default market keeps the unscoped keys
+        self.scope = None if self.is_default else self.slug
+        self.csv_file = f"{self.label}_Jobs_{country}.csv".replace(' ', '_')
+        directory = '' if self.is_default else os.path.join('markets', self.slug)
+        self.output_file = os.path.join(directory, 'jobs_dashboard.html')
+        self.data_dir = os.path.join(directory, 'jobs_data')
+        location_words = LOCATION_WORDS.get(country, []) + re.findall(r'[a-z0-9]+', country.lower())
+        self.stop_words = STOP_WORDS | frozenset(location_words)
+
+    def __repr__(self):
+        return f"Market({self.country!r}, {self.position!r})"
+
+    def state_dir(self, store_dir):
+        """Where the market's dashboard aggregates live in the store"""
+        return store_dir if self.is_default else os.path.join(store_dir, 'markets', self.slug)
+
+    def csv_path(self, default_csv):
+        """The market's CSV export, next to default_csv (the default market's own)"""
+        if self.is_default:
+            return default_csv
+        return os.path.join(os.path.dirname(default_csv), self.csv_file)
+
+
+DEFAULT_MARKET = Market()
+
+
+def config_markets(config):
+    """The distinct (country, position) markets of a scrape config, in order"""
+    pairs = dict.fromkeys((job['country'], job['position']) for job in config['jobs'])
+    return [Market(country, position) for country, position in pairs] or [DEFAULT_MARKET]
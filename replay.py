@@ -0,0 +1,263 @@
+import os
+import json
+import hashlib
+import argparse
+import requests
+from urllib.parse import urlencode
+from selenium.common.exceptions import NoSuchElementException
+from html_parsing import CardParser, LINKEDIN_CARD_SPEC
+from scraper import JobScraper, LINKEDIN_NEW_CARDS_JS, LINKEDIN_CARD_COUNT_JS
+from scheduler import CONFIG_FILE, load_config
+
+RECORDINGS_DIR = 'recordings'
+
+
+def request_key(method, url, params=None):
+    """Stable file name for an HTTP request"""
+    if params:
+        url = f"{url}?{urlencode(sorted(params.items()))}"
+    return hashlib.sha1(f"{method} {url}".encode('utf-8')).hexdigest()[:16]
+
+
+def page_key(url):
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+
+
+class RecordingSession:
+    """Wraps a requests.Session and saves every GET response under directory/http/"""
+
+    def __init__(self, directory, session=None):
+        self.directory = os.path.join(directory, 'http')
+        self.session = session or requests.Session()
+        os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    @headers.setter
+    def headers(self, value):
+        self.session.headers = value
+
+    def get(self, url, params=None, **kwargs):
+        response = self.session.get(url, params=params, **kwargs)
+        record = {
+            'url': url,
+            'params': params,
+            'status_code': response.status_code,
+            'headers': dict(response.headers),
+            'text': response.text,
+        }
+        with open(os.path.join(self.directory, request_key('GET', url, params) + '.json'), 'w',
+                  encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False)
+        return response
+
+
+class ReplaySession:
+    """Serves GET requests from a recording instead of the network"""
+
+    def __init__(self, directory):
+        self.directory = os.path.join(directory, 'http')
+        self.headers = {}
+        self.requests = 0
+
+    def get(self, url, params=None, **kwargs):
+        path = os.path.join(self.directory, request_key('GET', url, params) + '.json')
+        response = requests.models.Response()
+        response.url = url
+        self.requests += 1
+        if not os.path.exists(path):
+            response.status_code = 404
+            response._content = b''
+            return response
+        with open(path, encoding='utf-8') as f:
+            record = json.load(f)
+        response.status_code = record['status_code']
+        response.headers.update(record['headers'])
+        response.headers.pop('Content-Encoding', None)
+        response.encoding = 'utf-8'
+        response._content = record['text'].encode('utf-8')
+        return response
+
+
+class RecordingDriver:
+    """Wraps a live WebDriver and snapshots page_source after each load and scroll.
+
+    Snapshot 0 is taken right after get(); snapshot N when the scraper reads
+    the cards after its Nth scroll, which is what ReplayDriver serves back.
+    """
+
+    def __init__(self, driver, directory):
+        self.driver = driver
+        self.directory = os.path.join(directory, 'pages')
+        self.snapshots = None
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+    def _snapshot(self):
+        path = os.path.join(self.snapshots, f"page-{self.page:03d}.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.driver.page_source)
+        self.page += 1
+
+    def get(self, url):
+        self.driver.get(url)
+        self.snapshots = os.path.join(self.directory, page_key(url))
+        os.makedirs(self.snapshots, exist_ok=True)
+        with open(os.path.join(self.snapshots, 'url.txt'), 'w', encoding='utf-8') as f:
+            f.write(url)
+        self.page = 0
+        self._snapshot()
+
+    @property
+    def page_source(self):
+        if self.snapshots:
+            self._snapshot()
+        return self.driver.page_source
+
+    def execute_script(self, script, *args):
+        if script == LINKEDIN_NEW_CARDS_JS and self.snapshots:
+            self._snapshot()
+        return self.driver.execute_script(script, *args)
+
+
+class ReplayDriver:
+    """Stands in for a WebDriver, replaying recorded page snapshots.
+
+    Scrolling advances to the next snapshot; the scroll height is the
+    snapshot's length, and the card extraction script is emulated by parsing
+    the snapshot, so the scraper's loop runs unchanged.
+    """
+
+    def __init__(self, directory):
+        self.directory = os.path.join(directory, 'pages')
+        self.snapshots = []
+        self.position = 0
+        self.card_parser = CardParser(LINKEDIN_CARD_SPEC)
+
+    def get(self, url):
+        folder = os.path.join(self.directory, page_key(url))
+        if not os.path.isdir(folder):
+            raise FileNotFoundError(f"No recording for {url}")
+        self.snapshots = [os.path.join(folder, name) for name in sorted(os.listdir(folder))
+                          if name.startswith('page-')]
+        self.position = 0
+
+    @property
+    def page_source(self):
+        if not self.snapshots:
+            return ''
+        with open(self.snapshots[self.position], encoding='utf-8') as f:
+            return f.read()
+
+    def execute_script(self, script, *args):
+        if script == LINKEDIN_NEW_CARDS_JS:
+            cards = self.card_parser.parse(self.page_source)
+            start = args[0] if args else 0
+            return {'total': len(cards), 'cards': cards[start:]}
+        if script == LINKEDIN_CARD_COUNT_JS:
+            return len(self.card_parser.parse(self.page_source))
+        if 'scrollTo' in script:
+            self.position = min(self.position + 1, len(self.snapshots) - 1)
+            return None
+        if 'scrollHeight' in script:
+            return len(self.page_source)
+        if script == "return 1":
+            return 1
+        return None
+
+    def find_element(self, by, value):
+        page = self.page_source
+        for selector in value.split(','):
+            if selector.strip().lstrip('.') in page:
+                return object()
+        raise NoSuchElementException(value)
+
+    def find_elements(self, by, value):
+        return []
+
+    def quit(self):
+        pass
+
+
+def recording_scraper(directory, **kwargs):
+    """A JobScraper whose HTTP responses and browser pages are saved to directory"""
+    scraper = None
+
+    def driver_factory():
+        return RecordingDriver(scraper._create_driver(), directory)
+
+    # No conditional requests, so every recorded response carries the full page
+    kwargs.setdefault('http_cache_dir', None)
+    scraper = JobScraper(session=RecordingSession(directory), driver_factory=driver_factory, **kwargs)
+    return scraper
+
+
+def replay_scraper(directory, **kwargs):
+    """A JobScraper that runs entirely from a recording, without sleeping"""
+    kwargs.setdefault('sleep', lambda seconds: None)
+    kwargs.setdefault('http_cache_dir', None)
+    return JobScraper(session=ReplaySession(directory), driver_factory=lambda: ReplayDriver(directory), **kwargs)
+
+
+def synthesize_recording(directory, fixtures_dir, queries, cards_per_scroll=25):
+    """Build a recording from the synthetic fixtures, for offline benchmarks.
+
+    Each LinkedIn query gets snapshots that reveal `cards_per_scroll` more
+    cards per scroll; each Google query gets the Google fixture page.
+    """
+    with open(os.path.join(fixtures_dir, 'linkedin_search.html'), encoding='utf-8') as f:
+        linkedin_page = f.read()
+    with open(os.path.join(fixtures_dir, 'google_careers.html'), encoding='utf-8') as f:
+        google_page = f.read()
+    head, _, rest = linkedin_page.partition('\n<li>')
+    cards_html, _, tail = ('<li>' + rest).rpartition('</li>')
+    cards = [card + '</li>' for card in cards_html.split('</li>') if card.strip()]
+    for query in queries:
+        if 'linkedin.com' in query['website']:
+            url = JobScraper.linkedin_search_url(query['position'], query['country'])
+            folder = os.path.join(directory, 'pages', page_key(url))
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, 'url.txt'), 'w', encoding='utf-8') as f:
+                f.write(url)
+            for page, end in enumerate(range(cards_per_scroll, len(cards) + cards_per_scroll, cards_per_scroll)):
+                with open(os.path.join(folder, f"page-{page:03d}.html"), 'w', encoding='utf-8') as f:
+                    f.write(head + '\n' + ''.join(cards[:end]) + tail)
+        else:
+            http_dir = os.path.join(directory, 'http')
+            os.makedirs(http_dir, exist_ok=True)
+            params = {"q": f"'{query['position']}'", "location": query['country']}
+            url = "https://www.google.com/about/careers/applications/jobs/results/"
+            with open(os.path.join(http_dir, request_key('GET', url, params) + '.json'), 'w',
+                      encoding='utf-8') as f:
+                json.dump({'url': url, 'params': params, 'status_code': 200,
+                           'headers': {'Content-Type': 'text/html; charset=utf-8'}, 'text': google_page}, f)
+
+
+def run_queries(scraper, queries):
+    """Scrape each query in order and return {label: rows}"""
+    counts = {}
+    with scraper:
+        for query in queries:
+            df = scraper.scrape(query['website'], query['position'], query['country'], query.get('max_results'))
+            counts[f"{query['website']} / {query['position']} / {query['country']}"] = len(df)
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record live scraper traffic or replay it offline")
+    parser.add_argument('mode', choices=['record', 'replay', 'synth'])
+    parser.add_argument('directory', nargs='?', default=os.path.join(RECORDINGS_DIR, 'latest'))
+    parser.add_argument('--config', default=CONFIG_FILE)
+    parser.add_argument('--fixtures', default='fixtures')
+    args = parser.parse_args()
+    queries = load_config(args.config)['jobs']
+    if args.mode == 'record':
+        print(run_queries(recording_scraper(args.directory), queries))
+    elif args.mode == 'replay':
+        print(run_queries(replay_scraper(args.directory), queries))
+    else:
+        synthesize_recording(args.directory, args.fixtures, queries)
+        print(f"Wrote synthetic recording to {args.directory}")
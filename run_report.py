@@ -0,0 +1,148 @@
+import os
+import sys
+import json
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+REPORT_VERSION = 1
+REPORT_DIR = 'run_reports'
+PROFILERS = ['cprofile', 'pyinstrument']
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, or None where it isn't available"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def io_counters():
+    """Bytes this process has read and written so far (files, sockets and pipes), Linux only"""
+    try:
+        with open('/proc/self/io') as f:
+            fields = dict(line.split(': ') for line in f.read().splitlines())
+    except OSError:
+        return None
+    return {'read': int(fields['rchar']), 'written': int(fields['wchar'])}
+
+
+def report_path(kind, csv_file, started):
+    """run_reports/<kind>_<start time>.json, next to the CSV file"""
+    directory = os.path.join(os.path.dirname(os.path.abspath(csv_file)), REPORT_DIR)
+    return os.path.join(directory, f"{kind}_{started:%Y%m%d-%H%M%S}.json")
+
+
+class RunReport:
+    """Timers, counters and events for one scrape or dashboard build, saved as JSON.
+
+    `stage(name)` times a block (repeated blocks accumulate), `count()`
+    bumps a counter, `event()` appends a record such as one scroll's stats
+    and `info()` stores any other value. Safe to share between the
+    scheduler's threads. The saved report adds total time, peak RSS and
+    I/O bytes, so reports from successive runs can be compared.
+    """
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.started = datetime.now()
+        self.stages = {}
+        self.counters = Counter()
+        self.events = {}
+        self.details = {}
+        self._start = time.perf_counter()
+        self._io_start = io_counters()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name, seconds, calls=1):
+        with self._lock:
+            stage = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            stage['seconds'] += seconds
+            stage['calls'] += calls
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def event(self, name, **fields):
+        with self._lock:
+            self.events.setdefault(name, []).append(fields)
+
+    def info(self, name, value):
+        with self._lock:
+            self.details[name] = value
+
+    def to_dict(self):
+        io_end = io_counters()
+        with self._lock:
+            return {
+                'version': REPORT_VERSION,
+                'kind': self.kind,
+                'started': self.started.isoformat(timespec='seconds'),
+                'seconds': round(time.perf_counter() - self._start, 3),
+                'peak_rss_mb': peak_rss_mb(),
+                'io_bytes': ({key: io_end[key] - self._io_start[key] for key in io_end}
+                             if io_end and self._io_start else None),
+                'stages': {name: {'seconds': round(stage['seconds'], 3), 'calls': stage['calls']}
+                           for name, stage in self.stages.items()},
+                'counters': dict(self.counters),
+                'events': {name: list(events) for name, events in self.events.items()},
+                **self.details,
+            }
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=1, default=str)
+        print(f"Run report: {path}", flush=True)
+        return path
+
+
+@contextmanager
+def profiled(profiler, path):
+    """Profile the block with cProfile (stats to path.prof) or pyinstrument (path.html).
+
+    pyinstrument is optional and only imported when asked for; with
+    profiler=None the block runs unprofiled. Yields the output file path.
+    """
+    if profiler is None:
+        yield None
+        return
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if profiler == 'cprofile':
+        import cProfile
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield path + '.prof'
+        finally:
+            profile.disable()
+            profile.dump_stats(path + '.prof')
+            print(f"Profile: {path}.prof (view with python -m pstats)", flush=True)
+    elif profiler == 'pyinstrument':
+        from pyinstrument import Profiler
+        profile = Profiler()
+        profile.start()
+        try:
+            yield path + '.html'
+        finally:
+            profile.stop()
+            with open(path + '.html', 'w', encoding='utf-8') as f:
+                f.write(profile.output_html())
+            print(f"Profile: {path}.html", flush=True)
+    else:
+        raise ValueError(f"Unknown profiler {profiler!r}, expected one of {PROFILERS}")
@@ -0,0 +1,160 @@
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+from job_index import canonicalize_jobs
+from job_store import merge_new_jobs
+from markets import Market
+
+CONFIG_FILE = 'scrape_jobs.json'
+
+# Used for any domain the config doesn't list
+DEFAULT_LIMITS = {'concurrency': 1, 'rate_per_minute': 30, 'burst': 1}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `capacity` banked"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available; return seconds waited"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class RateLimiter:
+    """Per-domain concurrency slots and request rate limits"""
+
+    def __init__(self, limits=None):
+        self.limits = dict(limits or {})
+        self._slots = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _domain(self, website):
+        """The most specific configured key found in website, else its host.
+
+        "linkedin.com/jobs-guest" wins over "linkedin.com" for a detail page
+        URL, so the detail API has its own limits.
+        """
+        website = website.lower().strip()
+        matches = [domain for domain in self.limits if domain in website]
+        if matches:
+            return max(matches, key=len)
+        return urlparse(website).netloc or website
+
+    def _get(self, website):
+        domain = self._domain(website)
+        with self._lock:
+            if domain not in self._slots:
+                limits = {**DEFAULT_LIMITS, **self.limits.get(domain, {})}
+                self._slots[domain] = threading.BoundedSemaphore(limits['concurrency'])
+                self._buckets[domain] = TokenBucket(limits['rate_per_minute'] / 60.0, limits['burst'])
+        return self._slots[domain], self._buckets[domain]
+
+    def concurrency(self, website):
+        return {**DEFAULT_LIMITS, **self.limits.get(self._domain(website), {})}['concurrency']
+
+    def slot(self, website):
+        """Semaphore bounding concurrent scrapes of a domain"""
+        return self._get(website)[0]
+
+    def throttle(self, website):
+        """Block until the domain's rate limit allows another request"""
+        return self._get(website)[1].acquire()
+
+
+def load_config(path=CONFIG_FILE):
+    """Read {"limits": {domain: {...}}, "jobs": [{website, position, country, max_results}]}"""
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    config.setdefault('limits', {})
+    for job in config['jobs']:
+        job.setdefault('max_results', None)
+    return config
+
+
+class ScrapeScheduler:
+    """Run many scrape queries in parallel and merge each one as it finishes.
+
+    Queries for different domains run side by side; queries for the same
+    domain are bounded by its concurrency and rate limits, so total time
+    tracks the slowest source rather than the sum of all queries.
+    """
+
+    def __init__(self, scraper, limiter, store, csv_file=None, lifecycle=None, enricher=None):
+        self.scraper = scraper
+        self.limiter = limiter
+        self.store = store
+        self.csv_file = csv_file
+        self.lifecycle = lifecycle
+        self.enricher = enricher
+        self._merge_lock = threading.Lock()
+        scraper.rate_limiter = limiter
+
+    def _run_one(self, job):
+        with self.limiter.slot(job['website']):
+            start = time.perf_counter()
+            checkpoint = self.scraper.scrape_checkpoint(job['website'], job['position'], job['country'],
+                                                        job['max_results'])
+            elapsed = time.perf_counter() - start
+        # Rows are tagged with the query's market, which picks the dashboard (and CSV export) they go to.
+        # A posting already stored by another market is stored again for this one.
+        market = Market(job['country'], job['position'])
+        csv_file = market.csv_path(self.csv_file) if self.csv_file else None
+        # Detail pages of the new jobs are downloaded first, outside the merge lock, so the merge
+        # itself only reads them from the cache and a slow detail API never holds up other queries
+        if self.enricher is not None:
+            with self.scraper.report.stage('details'):
+                index = self.store.load_index()
+                for df in checkpoint.chunks():
+                    df = canonicalize_jobs(df)
+                    self.enricher.fetch(df[index.new_mask(df, market.scope)])
+        # Merged a chunk at a time; the checkpoint is only removed once all of it is stored
+        found = added = 0
+        with self._merge_lock, self.scraper.report.stage('merge'):
+            for df in checkpoint.chunks():
+                found += len(df)
+                df = df.assign(country=market.country, position=market.position)
+                added += len(merge_new_jobs(self.store, df, csv_file, self.lifecycle, self.enricher,
+                                            market.scope))
+            checkpoint.remove()
+        return found, added, elapsed
+
+    def run(self, jobs):
+        """Scrape every job; return one summary dict per query"""
+        workers = sum(self.limiter.concurrency(domain) for domain in {job['website'] for job in jobs})
+        summaries = []
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {pool.submit(self._run_one, job): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                label = f"{job['website']} / {job['position']} / {job['country']}"
+                try:
+                    found, added, elapsed = future.result()
+                except Exception as e:
+                    print(f"Query failed ({label}): {e}", flush=True)
+                    summaries.append({**job, 'error': str(e)})
+                    continue
+                print(f"Finished {label}: {found} jobs, {added} new, {elapsed:.1f}s", flush=True)
+                summaries.append({**job, 'found': found, 'added': added, 'seconds': round(elapsed, 1)})
+        print(f"Ran {len(jobs)} queries in {time.perf_counter() - start:.1f}s", flush=True)
+        return summaries
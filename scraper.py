@@ -1,30 +1,154 @@
 import os
+import math
+import argparse
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 import time
-import random
-from fake_useragent import UserAgent
-import pandas as pd
 import subprocess
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import NoSuchElementException, ElementNotInteractableException, TimeoutException
-from selenium.webdriver.common.action_chains import ActionChains
-from webdriver_manager.chrome import ChromeDriverManager
-import re
+import threading
+from urllib.parse import urlparse
+from job_index import SeenIds, extract_linkedin_job_id, extract_google_job_id
+from job_store import STORE_DIR, open_store
+from job_lifecycle import open_lifecycle
+from scroll_wait import AdaptiveWait
+from http_fetch import PageFetcher, HTTP_CACHE_DIR
+from html_parsing import CardParser, LINKEDIN_CARD_SPEC, GOOGLE_CARD_SPEC
+from scheduler import CONFIG_FILE, RateLimiter, ScrapeScheduler, load_config
+from enrichment import BACKLOG_FILE, JobEnricher
+from checkpoints import CHECKPOINT_DIR, Checkpoint
+from markets import DEFAULT_MARKET, Market, config_markets
+from run_report import PROFILERS, RunReport, report_path, profiled
+
+# Default search, used when there's no scrape_jobs.json
+COUNTRY = DEFAULT_MARKET.country
+POSITION = DEFAULT_MARKET.position
+# The default market's export; other markets' rows go to their own CSV next to it
+CSV_FILE = DEFAULT_MARKET.csv_file
+
+# Google Careers lists 20 jobs per results page
+GOOGLE_PAGE_SIZE = 20
+
+# LinkedIn geo ids for the countries we search; other countries fall back to the location text
+LINKEDIN_GEO_IDS = {
+    'Israel': '101620260',
+}
+
+# Returns the job cards from index arguments[0] onwards as plain objects, using the
+# same selector fallbacks as _parse_linkedin_page, so each scroll only ships new cards
+LINKEDIN_NEW_CARDS_JS = """
+const start = arguments[0];
+let cards = document.querySelectorAll('li.jobs-search-results__list-item');
+if (!cards.length) cards = document.querySelectorAll('div.base-card');
+if (!cards.length) cards = document.querySelectorAll('div.job-card-container');
+const text = (card, selectors) => {
+    for (const selector of selectors) {
+        const el = card.querySelector(selector);
+        if (el) return el.textContent.trim();
+    }
+    return null;
+};
+const out = [];
+for (let i = start; i < cards.length; i++) {
+    const card = cards[i];
+    const link = card.querySelector('a.base-card__full-link') || card.querySelector('a.job-card-container__link');
+    out.push({
+        link: link ? link.getAttribute('href') : null,
+        title: text(card, ['h3.base-search-card__title', 'h3.job-card-list__title']),
+        company: text(card, ['h4.base-search-card__subtitle', 'a.job-card-container__company-name']),
+        location: text(card, ['span.job-search-card__location', 'li.job-card-container__metadata-item'])
+    });
+}
+return {total: cards.length, cards: out};
+"""
+
+LINKEDIN_CARD_COUNT_JS = """
+return document.querySelectorAll('li.jobs-search-results__list-item').length
+    || document.querySelectorAll('div.base-card').length
+    || document.querySelectorAll('div.job-card-container').length;
+"""
 
 class JobScraper:
-    def __init__(self):
-        self.ua = UserAgent()
-        self.session = requests.Session()
-        self.session.headers = self._get_headers()
+    def __init__(self, pool_size=1, max_pages_per_driver=20, max_driver_memory_mb=512, incremental_parsing=True,
+                 parser_backend=None, http_workers=4, http_cache_dir=HTTP_CACHE_DIR, seen_ids=None,
+                 known_stop_scrolls=None, repeat_ids=None, session=None, driver_factory=None, sleep=time.sleep, report=None,
+                 checkpoint_dir=None):
+        # session, driver_factory and sleep can be swapped out, e.g. by replay.py to run offline
+        self._ua = None
+        self.session = session or requests.Session()
+        self._headers_set = False
+        self.sleep = sleep
+        # Politeness floor for each scroll wait (longer in CI); the rest adapts to this session
+        floor = (0.5, 1.0) if os.getenv('GITHUB_ACTIONS') == 'true' else (0.3, 0.8)
+        self.scroll_wait = AdaptiveWait(floor=floor, sleep=sleep)
         self.run_time = datetime.now().strftime("%Y-%m-%d %H:%M")
+        # Stage timings, counters and per-scroll stats for the run report (run_report.RunReport)
+        self.report = report or RunReport('scrape')
+        # With a checkpoint directory each query streams its jobs to disk and resumes after a crash
+        self.checkpoint_dir = checkpoint_dir
         self.jobs = []
+        self.rate_limiter = None
+        self.incremental_parsing = incremental_parsing
+        # {market slug: LinkedIn ids that market already stored (job_index.SeenIds)}; with
+        # known_stop_scrolls set, a search stops after that many consecutive scrolls that turned
+        # up only jobs its market stored
+        self.seen_ids = seen_ids
+        self.known_stop_scrolls = known_stop_scrolls
+        # LinkedIn ids already seen in more than one run (SeenIds); with them only scrolls of such jobs count
+        # towards the early stop, so the jobs of the previous run are seen again before a search stops
+        self.repeat_ids = repeat_ids
+        self.linkedin_parser = CardParser(LINKEDIN_CARD_SPEC, parser_backend)
+        self.google_parser = CardParser(GOOGLE_CARD_SPEC, parser_backend)
+        self.page_fetcher = PageFetcher(self.session, max_workers=http_workers, cache_dir=http_cache_dir,
+                                        throttle=lambda url: self._throttle(urlparse(url).netloc), sleep=sleep)
+        # Selenium and the browser pool are only loaded once a LinkedIn search needs them; the lock
+        # keeps the scheduler's concurrent LinkedIn queries from each building a pool
+        self._driver_pool = None
+        self._pool_lock = threading.Lock()
+        self._pool_options = dict(driver_factory=driver_factory or self._create_driver, size=pool_size,
+                                  max_pages=max_pages_per_driver, max_memory_mb=max_driver_memory_mb)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Quit any pooled browsers"""
+        if self.pool_started:
+            self._driver_pool.close()
+
+    @property
+    def pool_started(self):
+        return self._driver_pool is not None
+
+    @property
+    def driver_pool(self):
+        if self._driver_pool is None:
+            with self._pool_lock:
+                if self._driver_pool is None:
+                    from driver_pool import DriverPool
+                    self._driver_pool = DriverPool(**self._pool_options)
+        return self._driver_pool
+
+    @property
+    def ua(self):
+        """fake_useragent's UserAgent, created on first use (it loads its browser data)"""
+        if self._ua is None:
+            from fake_useragent import UserAgent
+            self._ua = UserAgent()
+        return self._ua
+
+    def _ensure_headers(self):
+        """Give the HTTP session browser-like headers before its first request"""
+        if not self._headers_set:
+            self.session.headers = self._get_headers()
+            self._headers_set = True
+
+    def _throttle(self, website):
+        """Wait for the shared per-domain rate limit, if a scheduler attached one"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.throttle(website)
 
     def _get_headers(self):
         return {
@@ -38,14 +162,28 @@ class JobScraper:
         }
 
     def scrape(self, website, position, country, max_results=None):
+        return self.scrape_checkpoint(website, position, country, max_results).frame()
+
+    def scrape_checkpoint(self, website, position, country, max_results=None):
+        """Scrape one query into its checkpoints.Checkpoint and return it.
+
+        A checkpoint left by an interrupted run is resumed: the jobs in it
+        are kept and skipped. On an error the jobs found so far are kept
+        too. The caller merges the checkpoint and then removes it.
+        """
         website = website.lower().strip()
+        checkpoint = Checkpoint.open(self.checkpoint_dir, f"{website} {position} {country}")
+        if len(checkpoint):
+            print(f"Resuming {website} / {position} / {country}: {len(checkpoint)} jobs in {checkpoint.path}",
+                  flush=True)
         if 'linkedin.com' in website:
-            return self._scrape_linkedin(position, country, max_results)
+            self._scrape_linkedin(checkpoint, position, country, max_results)
         elif 'google.com' in website:
-            return self._scrape_google(position, country)
-        return pd.DataFrame()
+            self._scrape_google(checkpoint, position, country, max_results)
+        checkpoint.close()
+        return checkpoint
 
-    def _scrape_google(self, position, country):
+    def _scrape_google(self, checkpoint, position, country, max_results=None):
         all_jobs = []
         base_url = "https://www.google.com/about/careers/applications/jobs/results/"
         params = {
@@ -53,216 +191,221 @@ class JobScraper:
             "location": country
         }
         
+        def page_params(page):
+            # Page 1 is the plain search URL; later pages add ?page=N
+            return params if page == 1 else {**params, "page": page}
+        
         try:
-            # Fetch job search page
-            response = self.session.get(base_url, params=params, timeout=15)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find all job cards
-            job_cards = soup.find_all('li', class_='lLd3Je')
-            
-            for card in job_cards:
-                try:
-                    title = card.find('h3', class_='QJPWVe').text.strip()
-                    company = "Google"
-                    
-                    # Extract location
-                    location_div = card.find('div', class_='vbZS6e')
-                    location = location_div.text.strip() if location_div else "Israel"
-                    
-                    # Extract job ID from link
-                    link_tag = card.find('a', class_='WpHeLc')
-                    if not link_tag:
-                        continue
-                    relative_link = link_tag.get('href')
-                    job_id = relative_link.split('/')[-2] if relative_link else ""
-                    link = f"https://www.google.com/about/careers/applications/{relative_link}"
-                    
-                    all_jobs.append({
-                        "title": title,
-                        "company": company,
-                        "location": location,
-                        "link": link,
-                        "source": "Google Careers",
-                        "job_id": job_id,
-                        "run_time": self.run_time
-                    })
-                except Exception as e:
-                    print(f"Error parsing Google job card: {e}", flush=True)
+            self._ensure_headers()
+            # Fetch every results page concurrently and extract the job cards as each page arrives
+            max_pages = math.ceil(max_results / GOOGLE_PAGE_SIZE) if max_results else 50
+            with self.report.stage('google.fetch_and_parse'):
+                cards = self.page_fetcher.fetch_pages(base_url, page_params, self.google_parser.parse, max_pages,
+                                                      page_size=GOOGLE_PAGE_SIZE)
+            self.report.count('google.cards', len(cards))
+            seen_ids = checkpoint.job_ids
+            for card in cards:
+                title = card['title']
+                relative_link = card['link']
+                if not title or not relative_link:
+                    print("Skipping Google job card without title or link", flush=True)
                     continue
+                link = f"https://www.google.com/about/careers/applications/{relative_link}"
+                job_id = extract_google_job_id(link)
+                if job_id in seen_ids:
+                    continue
+                seen_ids.add(job_id)
+                all_jobs.append({
+                    "title": title,
+                    "company": "Google",
+                    "location": card['location'] or country,
+                    "link": link,
+                    "source": "Google Careers",
+                    "job_id": job_id,
+                    "run_time": self.run_time
+                })
                     
-            print(f"Google Careers: Found {len(all_jobs)} jobs", flush=True)
+            print(f"Google Careers: Found {len(all_jobs)} jobs ({self.page_fetcher.report()})", flush=True)
         except Exception as e:
-            print(f"Google Careers error: {str(e)}", flush=True)
-        return pd.DataFrame(all_jobs)
+            print(f"Google Careers error: {str(e)} (keeping {len(all_jobs)} jobs found before it)", flush=True)
+        checkpoint.append(all_jobs)
     
     def extract_linkedin_job_id(self, url):
         """Extract LinkedIn job ID from URL using regex"""
-        match = re.search(r'-(\d+)(?:\?|$)', url)
-        return match.group(1) if match else None
+        return extract_linkedin_job_id(url)
 
-    def _parse_linkedin_page(self, soup):
+    def _parse_linkedin_page(self, page_source):
         """Parse LinkedIn job cards from page source"""
-        # Try multiple selectors as LinkedIn changes their classes frequently
-        job_cards = soup.find_all('li', class_='jobs-search-results__list-item') or \
-                    soup.find_all('div', class_='base-card') or \
-                    soup.find_all('div', class_='job-card-container')
+        # The card spec tries multiple selectors as LinkedIn changes their classes frequently
+        job_cards = self.linkedin_parser.parse(page_source)
         
         jobs = []
         for card in job_cards:
-            try:
-                # Extract job link and ID
-                link_elem = card.find('a', class_='base-card__full-link') or \
-                            card.find('a', class_='job-card-container__link')
-                link = link_elem['href'] if link_elem and 'href' in link_elem.attrs else None
-                job_id = self.extract_linkedin_job_id(link) if link else None
-                
-                # Extract job title
-                title_elem = card.find('h3', class_='base-search-card__title') or \
-                             card.find('h3', class_='job-card-list__title')
-                title = title_elem.text.strip() if title_elem else None
-                
-                # Extract company
-                company_elem = card.find('h4', class_='base-search-card__subtitle') or \
-                               card.find('a', class_='job-card-container__company-name')
-                company = company_elem.text.strip() if company_elem else None
-                
-                # Extract location
-                location_elem = card.find('span', class_='job-search-card__location') or \
-                                card.find('li', class_='job-card-container__metadata-item')
-                location = location_elem.text.strip() if location_elem else None
-                
-                jobs.append({
-                    "title": title,
-                    "company": company,
-                    "location": location,
-                    "link": link,
-                    "source": "LinkedIn",
-                    "job_id": job_id,
-                    "run_time": self.run_time
-                })
-                
-            except Exception as e:
-                print(f"Error parsing job card: {e}")
-                continue
+            link = card['link']
+            jobs.append({
+                "title": card['title'],
+                "company": card['company'],
+                "location": card['location'],
+                "link": link,
+                "source": "LinkedIn",
+                "job_id": self.extract_linkedin_job_id(link) if link else None,
+                "run_time": self.run_time
+            })
         
         print(f"Found {len(job_cards)} job cards, parsed {len(jobs)} jobs")
         return jobs, len(jobs)
 
-    def _scrape_linkedin(self, position, country, max_results):
-        """Scrape LinkedIn job listings"""
-        all_jobs = []
-        unique_job_ids = set()
-        
-        # Set up Chrome options
-        chrome_options = Options()
-        if os.getenv('GITHUB_ACTIONS') == 'true':
-            # Running in GitHub Actions
-            chrome_options.add_argument('--headless=new')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--disable-software-rasterizer')
-            chrome_options.add_argument('--disable-extensions')
-            chrome_options.add_argument('--disable-logging')
-            chrome_options.add_argument('--log-level=3')
-            chrome_options.add_argument('--output=/dev/null')
-            chrome_options.binary_location = '/usr/bin/chromium-browser'
-            service = Service(executable_path='/usr/bin/chromedriver')
-        else:
-            # Running locally
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--disable-gpu')
-            service = Service(ChromeDriverManager().install())
-        
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--start-maximized')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_argument(f'user-agent={self.ua.random}')
-        chrome_options.add_experimental_option('excludeSwitches', ['enable-logging', 'enable-automation'])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
+    def _linkedin_card_count(self, driver):
+        """Number of job cards currently on the page"""
+        from selenium.common.exceptions import WebDriverException
+        try:
+            return driver.execute_script(LINKEDIN_CARD_COUNT_JS) or 0
+        except WebDriverException:
+            return 0
+
+    def _extract_new_linkedin_cards(self, driver, start):
+        """Pull only the job cards added since card index `start`.
+
+        Returns (jobs, total card count), or None if the script failed and
+        the caller should fall back to parsing the full page source.
+        """
+        from selenium.common.exceptions import WebDriverException
+        try:
+            result = driver.execute_script(LINKEDIN_NEW_CARDS_JS, start)
+        except WebDriverException as e:
+            print(f"Incremental card extraction failed: {e}")
+            return None
+        if result['total'] < start:
+            # The list was re-rendered; start over, known ids are skipped by the caller
+            return self._extract_new_linkedin_cards(driver, 0)
+        jobs = []
+        for card in result['cards']:
+            link = card['link']
+            jobs.append({
+                "title": card['title'],
+                "company": card['company'],
+                "location": card['location'],
+                "link": link,
+                "source": "LinkedIn",
+                "job_id": self.extract_linkedin_job_id(link) if link else None,
+                "run_time": self.run_time
+            })
+        print(f"Found {len(jobs)} new job cards ({result['total']} on page)")
+        return jobs, result['total']
+
+    @staticmethod
+    def linkedin_search_url(position, country):
+        """Build the LinkedIn job search URL for a query"""
+        base_url = "https://www.linkedin.com/jobs/search"
+        params = {
+            'keywords': position.replace(' ', '%20'),
+            'location': country.replace(' ', '%20'),
+            'f_TPR': 'r86400',  # Last 24 hours
+            'sortBy': 'DD'  # Newest first, so postings from earlier runs come last
+        }
+        if country in LINKEDIN_GEO_IDS:
+            params['geoId'] = LINKEDIN_GEO_IDS[country]
+        query_string = '&'.join(f"{k}={v}" for k, v in params.items())
+        return f"{base_url}?{query_string}"
+
+    def _scrape_linkedin(self, checkpoint, position, country, max_results):
+        """Scrape LinkedIn job listings, appending each scroll's new jobs to checkpoint"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import (NoSuchElementException, ElementNotInteractableException,
+                                                TimeoutException)
+        # Jobs already in the checkpoint (from an interrupted run) are skipped and count towards max_results
+        unique_job_ids = checkpoint.job_ids
+        stored_ids = self.seen_ids.get(Market(country, position).slug) if self.seen_ids is not None else None
+        if max_results is None:
+            max_results = float('inf')
         
-        # Initialize WebDriver
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        # Lease a browser from the pool (started on first use, reused across queries)
+        with self.report.stage('linkedin.lease_browser'):
+            driver = self.driver_pool.acquire()
+        query = f"{position} / {country}"
         
         try:
-            # Build URL
-            base_url = "https://www.linkedin.com/jobs/search"
-            position = position.replace(' ', '%20')
-            country = country.replace(' ', '%20')
-            params = {
-                'keywords': position,
-                'location': country,
-                'geoId': '101620260',  # Israel
-                'f_TPR': 'r86400'  # Last 24 hours
-            }
-            query_string = '&'.join(f"{k}={v}" for k, v in params.items())
-            url = f"{base_url}?{query_string}"
-            
+            url = self.linkedin_search_url(position, country)
             print(f"Opening LinkedIn: {url}")
-            driver.get(url)
+            self._throttle("linkedin.com")
             
-            # Wait for initial jobs to load
+            # Load the search and wait for initial jobs
             try:
-                WebDriverWait(driver, 20).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".jobs-search__results-list, .jobs-search__results"))
-                )
+                with self.report.stage('linkedin.page_load'):
+                    driver.get(url)
+                    WebDriverWait(driver, 20).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, ".jobs-search__results-list, .jobs-search__results"))
+                    )
                 print("Job results container loaded")
             except TimeoutException:
                 print("Timed out waiting for job results container")
-                return pd.DataFrame()
+                return
             
             # Initialize scroll variables
-            last_height = driver.execute_script("return document.body.scrollHeight")
-            consecutive_no_new_jobs = 0
-            job_count = 0
+            cards_on_page = self._linkedin_card_count(driver)
+            stagnant_scrolls = 0
+            cards_seen = 0
+            job_count = len(checkpoint)
             scroll_attempts = 0
+            known_scrolls = 0
+            known_total = 0
+            wait_seconds = 0.0
+            parse_seconds = 0.0
             MAX_SCROLL_ATTEMPTS = 30
+            MAX_STAGNANT_SCROLLS = 3
             
             while job_count < max_results and scroll_attempts < MAX_SCROLL_ATTEMPTS:
                 scroll_attempts += 1
+                previous_cards = cards_on_page
+                more_cards = lambda: self._linkedin_card_count(driver) > previous_cards
                 
-                # Scroll to bottom with JavaScript
+                # Scroll to bottom with JavaScript (each scroll fetches another batch of jobs)
+                self._throttle("linkedin.com")
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
                 print(f"Scroll attempt {scroll_attempts}: Scrolled to bottom")
                 
-                # Wait for content to load (longer wait in CI)
-                wait_time = random.uniform(2.0, 4.0) if os.getenv('GITHUB_ACTIONS') == 'true' else random.uniform(1.5, 3.0)
-                time.sleep(wait_time)
+                # Wait until new cards appear rather than for a fixed time
+                wait_start = time.perf_counter()
+                loaded, _ = self.scroll_wait.wait_for(more_cards)
                 
-                # Try clicking "See more jobs" button if available
-                try:
-                    see_more_buttons = driver.find_elements(
-                        By.XPATH, "//button[contains(@aria-label, 'See more jobs')]"
-                    )
-                    for button in see_more_buttons:
-                        if button.is_displayed():
-                            # Scroll to button first
-                            driver.execute_script("arguments[0].scrollIntoView(true);", button)
-                            time.sleep(0.5)
-                            
-                            # Click using JavaScript
-                            driver.execute_script("arguments[0].click();", button)
-                            print("Clicked 'See more jobs' button")
-                            time.sleep(3)
-                            break
-                except (NoSuchElementException, ElementNotInteractableException):
-                    pass
+                # Try clicking "See more jobs" button if scrolling alone didn't load anything
+                if not loaded:
+                    try:
+                        see_more_buttons = driver.find_elements(
+                            By.XPATH, "//button[contains(@aria-label, 'See more jobs')]"
+                        )
+                        for button in see_more_buttons:
+                            if button.is_displayed():
+                                # Scroll to button first, then click using JavaScript
+                                driver.execute_script("arguments[0].scrollIntoView(true);", button)
+                                driver.execute_script("arguments[0].click();", button)
+                                print("Clicked 'See more jobs' button")
+                                loaded, _ = self.scroll_wait.wait_for(more_cards)
+                                break
+                    except (NoSuchElementException, ElementNotInteractableException):
+                        pass
+                scroll_wait = time.perf_counter() - wait_start
+                wait_seconds += scroll_wait
+                self.report.add_time('linkedin.scroll_wait', scroll_wait)
                 
-                # Check if new content loaded
-                new_height = driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    print("No height change detected")
-                    consecutive_no_new_jobs += 1
+                # Extract the cards added since the last scroll, or parse the whole page
+                parse_start = time.perf_counter()
+                extracted = self._extract_new_linkedin_cards(driver, cards_seen) if self.incremental_parsing else None
+                if extracted is not None:
+                    jobs, cards_seen = extracted
+                    cards_on_page = cards_seen
+                    self.report.add_time('linkedin.extract_new_cards', time.perf_counter() - parse_start)
                 else:
-                    consecutive_no_new_jobs = 0
-                last_height = new_height
-                
-                # Parse current page
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-                jobs, count = self._parse_linkedin_page(soup)
+                    with self.report.stage('linkedin.page_source'):
+                        page_source = driver.page_source
+                    self.report.count('linkedin.page_source_bytes', len(page_source.encode('utf-8')))
+                    with self.report.stage('linkedin.parse'):
+                        jobs, count = self._parse_linkedin_page(page_source)
+                    cards_on_page = count
+                scroll_parse = time.perf_counter() - parse_start
+                parse_seconds += scroll_parse
                 
                 # Process new jobs
                 new_jobs = []
@@ -273,26 +416,92 @@ class JobScraper:
                         new_jobs.append(job)
                 
                 job_count += len(new_jobs)
-                all_jobs.extend(new_jobs)
-                print(f"Added {len(new_jobs)} new jobs (Total: {job_count})")
+                checkpoint.append(new_jobs)
+                known = None
+                if stored_ids is not None and new_jobs:
+                    job_ids = [job['job_id'] for job in new_jobs]
+                    known_mask = stored_ids.known_mask(job_ids)
+                    known = int(known_mask.sum())
+                    known_total += known
+                    if self.repeat_ids is not None:
+                        known_mask &= self.repeat_ids.known_mask(job_ids)
+                    known_scrolls = known_scrolls + 1 if known_mask.all() else 0
+                    print(f"Added {len(new_jobs)} new jobs (Total: {job_count}; "
+                          f"{known} already stored, {len(new_jobs) - known} unseen)")
+                else:
+                    print(f"Added {len(new_jobs)} new jobs (Total: {job_count})")
+                self.report.count('linkedin.scrolls')
+                self.report.event('scrolls', query=query, attempt=scroll_attempts, loaded=loaded,
+                                  cards_on_page=cards_on_page, new_jobs=len(new_jobs), known=known,
+                                  wait_seconds=round(scroll_wait, 3), parse_seconds=round(scroll_parse, 3))
                 
                 # Exit conditions
-                if consecutive_no_new_jobs >= 5:
+                if self.known_stop_scrolls and known_scrolls >= self.known_stop_scrolls:
+                    print(f"Stopping: {known_scrolls} scrolls in a row found only stored, already re-seen jobs")
+                    break
+                if cards_on_page <= previous_cards:
+                    stagnant_scrolls += 1
+                    print(f"No new job cards ({stagnant_scrolls}/{MAX_STAGNANT_SCROLLS})")
+                else:
+                    stagnant_scrolls = 0
+                if stagnant_scrolls >= MAX_STAGNANT_SCROLLS:
                     print("No new jobs detected after multiple scrolls")
                     break
                 if job_count >= max_results:
                     print(f"Reached max results ({max_results})")
                     break
             
-            return pd.DataFrame(all_jobs)
+            print(f"LinkedIn timing: {wait_seconds:.1f}s waiting, {parse_seconds:.1f}s parsing "
+                  f"over {scroll_attempts} scrolls (learned load latency {self.scroll_wait.latency:.2f}s)")
+            if stored_ids is not None:
+                print(f"LinkedIn: {job_count - known_total} unseen jobs, {known_total} already stored")
         
         except Exception as e:
-            print(f"Error during LinkedIn scraping: {str(e)}")
+            # Every scroll so far is already in the checkpoint, so the jobs found before the error are kept
+            print(f"Error during LinkedIn scraping: {str(e)} (keeping {len(checkpoint)} jobs found before it)")
             import traceback
             traceback.print_exc()
-            return pd.DataFrame()
         finally:
-            driver.quit()
+            self.driver_pool.release(driver)
+
+    def _create_driver(self):
+        """Start a Chrome WebDriver configured for the current environment"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+        from webdriver_manager.chrome import ChromeDriverManager
+        # Set up Chrome options
+        chrome_options = Options()
+        if os.getenv('GITHUB_ACTIONS') == 'true':
+            # Running in GitHub Actions
+            chrome_options.add_argument('--headless=new')
+            chrome_options.add_argument('--no-sandbox')
+            chrome_options.add_argument('--disable-dev-shm-usage')
+            chrome_options.add_argument('--disable-gpu')
+            chrome_options.add_argument('--disable-software-rasterizer')
+            chrome_options.add_argument('--disable-extensions')
+            chrome_options.add_argument('--disable-logging')
+            chrome_options.add_argument('--log-level=3')
+            chrome_options.add_argument('--output=/dev/null')
+            chrome_options.binary_location = '/usr/bin/chromium-browser'
+            service = Service(executable_path='/usr/bin/chromedriver')
+        else:
+            # Running locally
+            chrome_options.add_argument('--headless')
+            chrome_options.add_argument('--disable-gpu')
+            service = Service(ChromeDriverManager().install())
+        
+        chrome_options.add_argument('--window-size=1920,1080')
+        chrome_options.add_argument('--start-maximized')
+        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+        chrome_options.add_argument(f'user-agent={self.ua.random}')
+        chrome_options.add_experimental_option('excludeSwitches', ['enable-logging', 'enable-automation'])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+        
+        # Initialize WebDriver
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        return driver
 
 def launch_dashboard():
     """Launch the Streamlit dashboard in a separate process"""
@@ -316,39 +525,77 @@ def launch_dashboard():
     except Exception as e:
         print(f"Failed to launch dashboard: {e}", flush=True)
 
-if __name__ == "__main__":
-    # Configuration
-    COUNTRY = "Israel"
-    POSITION = "Data Scientist"
-    CSV_FILE = f"Data_Science_Jobs_{COUNTRY}.csv"
-    
-    # Initialize scraper
-    scraper = JobScraper()
-    
-    # Scrape sources
-    print("Scraping LinkedIn for DS jobs...", flush=True)
-    linkedin_df = scraper.scrape("linkedin.com", POSITION, COUNTRY, max_results=10000)
-    print("Scraping Google Careers for DS jobs...", flush=True)
-    google_df = scraper.scrape("google.com", POSITION, COUNTRY)
-    
-    # Combine results
-    all_jobs = pd.concat([linkedin_df, google_df], ignore_index=True)
-    
-    # Deduplicate based on link
-    all_jobs = all_jobs.drop_duplicates(subset=['link'])
-    
-    # Save/update CSV
-    if os.path.exists(CSV_FILE):
-        existing = pd.read_csv(CSV_FILE)
-        # Combine and deduplicate
-        combined = pd.concat([existing, all_jobs])
-        combined = combined.drop_duplicates(subset=['link'])
-        combined.to_csv(CSV_FILE, index=False)
-        print(f"Updated CSV. Total unique jobs: {len(combined)}", flush=True)
+def run_scrape(sources=None, config_path=CONFIG_FILE, csv_file=CSV_FILE, profile=None):
+    """Run the configured queries, or only those for `sources`, merging each into the store.
+
+    Writes a run report (run_report.RunReport) to run_reports/ next to the
+    CSV; profile='cprofile' or 'pyinstrument' also profiles the run.
+    """
+    report = RunReport('scrape')
+    path = report_path('scrape', csv_file, report.started)
+    try:
+        with profiled(profile, path[:-len('.json')]):
+            return _run_queries(report, sources, config_path, csv_file)
+    finally:
+        # Saved even if the run failed, with whatever stages completed
+        report.save(path)
+
+
+def _run_queries(report, sources, config_path, csv_file):
+    # Queries to run: scrape_jobs.json if present, otherwise the default DS search
+    if os.path.exists(config_path):
+        config = load_config(config_path)
     else:
-        all_jobs.to_csv(CSV_FILE, index=False)
-        print(f"Created new CSV with {len(all_jobs)} jobs", flush=True)
+        config = {'limits': {}, 'jobs': [
+            {'website': 'linkedin.com', 'position': POSITION, 'country': COUNTRY, 'max_results': 10000},
+            {'website': 'google.com', 'position': POSITION, 'country': COUNTRY, 'max_results': None},
+        ]}
+    jobs = [job for job in config['jobs'] if not sources or any(source in job['website'] for source in sources)]
+    limiter = RateLimiter(config['limits'])
+    with report.stage('open_store'):
+        store = open_store(STORE_DIR, csv_file)
+        rows_before = store.row_count
+        # first_seen / last_seen / seen_count of every job, updated for the jobs each query sees
+        lifecycle = open_lifecycle(store)
+        # Stop a LinkedIn search once two scrolls in a row turn up only jobs its market stored earlier
+        # that were also seen in more than one run, so a job still listed is seen again at least once
+        # before searches stop on it (the lifecycle's time-to-fill depends on it)
+        index = store.load_index()
+        seen_ids = {market.slug: SeenIds.from_index(index, 'LinkedIn', market.scope)
+                    for market in config_markets(config)}
+        repeat_ids = lifecycle.repeat_ids('LinkedIn')
+
+    # Scrape all queries in parallel; each one is merged into the store as soon as it finishes.
+    # The context manager quits pooled browsers when done.
+    with JobScraper(pool_size=limiter.concurrency('linkedin.com'), seen_ids=seen_ids,
+                    known_stop_scrolls=2, repeat_ids=repeat_ids, report=report,
+                    checkpoint_dir=CHECKPOINT_DIR) as scraper:
+        # Detail pages of new jobs are fetched over the scraper's session, under the detail API's own
+        # rate limit ("linkedin.com/jobs-guest" in the config), so they don't eat into the searches'
+        scraper._ensure_headers()
+        enricher = JobEnricher(session=scraper.session, throttle=limiter.throttle,
+                               backlog_path=os.path.join(STORE_DIR, BACKLOG_FILE))
+        summaries = ScrapeScheduler(scraper, limiter, store, csv_file, lifecycle, enricher).run(jobs)
+        # Whatever is left of the run's detail budget goes to jobs stored without details earlier
+        with report.stage('backfill_details'):
+            enricher.backfill(store)
+    if scraper.pool_started:
+        print(scraper.driver_pool.report(), flush=True)
+        report.info('driver_pool', dict(scraper.driver_pool.metrics))
+    report.info('parser_backend', scraper.linkedin_parser.backend)
+    report.info('http', scraper.page_fetcher.report())
+    report.info('enrichment', dict(enricher.stats))
+    report.info('queries', summaries)
+    report.count('jobs_added', store.row_count - rows_before)
+    print(f"Added {store.row_count - rows_before} new jobs. Total unique jobs: {store.row_count}", flush=True)
+    return summaries
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape the configured queries into the job store")
+    parser.add_argument('--profile', choices=PROFILERS, help="also profile the run")
+    run_scrape(profile=parser.parse_args().profile)
     
     # Launch dashboard locally
     if os.getenv('GITHUB_ACTIONS') != 'true':
-        launch_dashboard()
\ No newline at end of file
+        launch_dashboard()
@@ -0,0 +1,52 @@
+import time
+import random
+
+
+class AdaptiveWait:
+    """Wait for new content after a scroll, returning as soon as it appears.
+
+    Every wait starts with a short randomized floor, for politeness, and then
+    polls `condition` until it holds or the timeout passes. The timeout
+    follows an exponentially weighted average of how long content has taken
+    to appear in this session, so a fast session stops waiting sooner once
+    the results run out.
+    """
+
+    def __init__(self, floor=(0.3, 0.8), initial_latency=1.5, min_timeout=2.0, max_timeout=10.0,
+                 poll_interval=0.2, smoothing=0.3, sleep=time.sleep):
+        self.floor = floor
+        self.latency = initial_latency
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.poll_interval = poll_interval
+        self.smoothing = smoothing
+        self.sleep = sleep
+        self.waits = 0
+        self.timeouts = 0
+        self.waited_seconds = 0.0
+
+    @property
+    def timeout(self):
+        return min(self.max_timeout, max(self.min_timeout, 3 * self.latency))
+
+    def wait_for(self, condition):
+        """Sleep the floor, then poll condition(); return (satisfied, seconds waited).
+
+        Time is counted in sleeps rather than read from the clock, so an
+        injected no-op sleep (offline replay) never busy-waits.
+        """
+        waited = random.uniform(*self.floor)
+        self.sleep(waited)
+        timeout = self.timeout
+        satisfied = condition()
+        while not satisfied and waited < timeout:
+            self.sleep(self.poll_interval)
+            waited += self.poll_interval
+            satisfied = condition()
+        self.waits += 1
+        self.waited_seconds += waited
+        if satisfied:
+            self.latency += self.smoothing * (waited - self.latency)
+        else:
+            self.timeouts += 1
+        return satisfied, waited
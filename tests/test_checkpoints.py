@@ -0,0 +1,64 @@
+import json
+from checkpoints import Checkpoint, checkpoint_name
+
+
+def job(job_id):
+    return {'title': 'Data Scientist', 'source': 'LinkedIn', 'job_id': str(job_id)}
+
+
+def test_checkpoint_name():
+    assert checkpoint_name('linkedin.com Data Scientist Israel') == 'linkedin-com-data-scientist-israel.jsonl'
+
+
+def test_resume_loads_ids_and_appends(tmp_path):
+    path = tmp_path / 'query.jsonl'
+    checkpoint = Checkpoint(str(path))
+    checkpoint.append([job(1), job(2)])
+    checkpoint.append([job(3)])
+    checkpoint.close()
+
+    resumed = Checkpoint(str(path))
+    assert len(resumed) == 3
+    assert resumed.job_ids == {'1', '2', '3'}
+    resumed.append([job(4)])
+    assert resumed.frame()['job_id'].tolist() == ['1', '2', '3', '4']
+
+
+def test_resume_truncates_a_torn_line(tmp_path):
+    path = tmp_path / 'query.jsonl'
+    checkpoint = Checkpoint(str(path))
+    checkpoint.append([job(1), job(2)])
+    checkpoint.close()
+    complete = path.read_bytes()
+    with open(path, 'ab') as f:
+        f.write(json.dumps(job(3)).encode()[:10])
+
+    resumed = Checkpoint(str(path))
+    assert len(resumed) == 2 and resumed.job_ids == {'1', '2'}
+    assert path.read_bytes() == complete
+    # The next append starts on a fresh line, so the file stays readable
+    resumed.append([job(3)])
+    assert resumed.frame()['job_id'].tolist() == ['1', '2', '3']
+
+
+def test_chunks(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / 'query.jsonl'))
+    checkpoint.append([job(n) for n in range(5)])
+    assert [len(chunk) for chunk in checkpoint.chunks(size=2)] == [2, 2, 1]
+
+
+def test_remove(tmp_path):
+    path = tmp_path / 'query.jsonl'
+    checkpoint = Checkpoint(str(path))
+    checkpoint.append([job(1)])
+    checkpoint.remove()
+    assert not path.exists()
+    assert len(checkpoint) == 0 and not checkpoint.job_ids
+    assert Checkpoint(str(path)).frame().empty
+
+
+def test_in_memory_checkpoint():
+    checkpoint = Checkpoint.open(None, 'linkedin.com Data Scientist Israel')
+    assert checkpoint.path is None
+    checkpoint.append([job(1), job(2)])
+    assert checkpoint.frame()['job_id'].tolist() == ['1', '2']
@@ -0,0 +1,53 @@
+import pandas as pd
+from dashboard_state import DashboardState
+
+
+def jobs(*rows):
+    return pd.DataFrame(rows, columns=['title', 'company', 'source', 'run_time'])
+
+
+RUN_1 = jobs(('Data Scientist', 'Wix.com', 'LinkedIn', '2025-08-12 01:00'),
+             ('Machine Learning Engineer', 'Intel', 'LinkedIn', '2025-08-12 01:00'))
+RUN_2 = jobs(('Data Scientist NLP', 'Google', 'Google Careers', '2025-08-12 13:00'))
+LATE = jobs(('Data Analyst', 'Intel', 'LinkedIn', '2025-08-11 13:00'))
+
+
+def test_fold_only_counts_rows_past_the_watermark():
+    state = DashboardState()
+    assert state.fold(RUN_1) == 2
+    assert state.fold(pd.concat([RUN_1, RUN_2])) == 1
+    assert state.fold(RUN_2) == 0
+    assert state.rows == 3
+    assert state.watermark == '2025-08-12 13:00'
+    assert state.sources == {'LinkedIn': 2, 'Google Careers': 1}
+    assert state.keywords['data'] == 2
+
+
+def test_folding_by_run_matches_one_fold(tmp_path):
+    path = str(tmp_path / 'dashboard_state.json')
+    state = DashboardState(path)
+    state.update_from_rows(RUN_1)
+    state.save()
+    state = DashboardState.load(path)
+    state.update_from_rows(pd.concat([RUN_1, RUN_2]))
+
+    full = DashboardState()
+    full.fold(pd.concat([RUN_1, RUN_2]))
+    assert (state.rows, state.watermark) == (full.rows, full.watermark)
+    assert (state.sources, state.keywords, state.phrases) == (full.sources, full.keywords, full.phrases)
+
+
+def test_late_rows_rebuild_the_dashboard_state():
+    state = DashboardState()
+    state.update_from_rows(pd.concat([RUN_1, RUN_2]))
+    rows = pd.concat([RUN_1, RUN_2, LATE])
+    assert state.update_from_rows(rows) == 4
+    assert state.rows == len(rows)
+    assert state.keywords['analyst'] == 1
+
+
+def test_load_ignores_another_version(tmp_path):
+    path = tmp_path / 'dashboard_state.json'
+    path.write_text('{"version": 0, "watermark": "2025-08-12 01:00", "rows": 5}')
+    state = DashboardState.load(str(path))
+    assert state.watermark is None and state.rows == 0
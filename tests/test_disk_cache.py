@@ -0,0 +1,74 @@
+import os
+from http_fetch import DiskCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def bodies(root):
+    return sorted(name for _, _, files in os.walk(root) for name in files if name.endswith('.gz'))
+
+
+def test_put_get_and_reload(tmp_path):
+    clock = Clock()
+    cache = DiskCache(str(tmp_path), clock=clock)
+    cache.put('https://example.com/1', 'first page')
+    assert cache.get('https://example.com/1') == ('first page', clock.now)
+    assert cache.get('https://example.com/2') is None
+    cache.save()
+    assert DiskCache(str(tmp_path), clock=clock).get('https://example.com/1') == ('first page', clock.now)
+
+
+def test_identical_bodies_are_stored_once(tmp_path):
+    cache = DiskCache(str(tmp_path), clock=Clock())
+    cache.put('https://example.com/1', 'same page')
+    cache.put('https://example.com/2', 'same page')
+    assert len(bodies(tmp_path)) == 1
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    clock = Clock()
+    cache = DiskCache(str(tmp_path), ttl=60, clock=clock)
+    cache.put('https://example.com/1', 'old page')
+    clock.now += 30
+    cache.put('https://example.com/2', 'new page')
+    clock.now += 40
+    assert cache.get('https://example.com/1') is None
+    assert cache.get('https://example.com/2') == ('new page', clock.now - 40)
+    assert cache.save() == 1
+    assert list(cache.entries) == ['https://example.com/2']
+    assert len(bodies(tmp_path)) == 1
+
+
+def test_least_recently_used_are_evicted_first(tmp_path):
+    clock = Clock()
+    cache = DiskCache(str(tmp_path), clock=clock)
+    for n in range(3):
+        clock.now += 1
+        cache.put(f'https://example.com/{n}', f'page {n} ' + 'x' * 1000)
+    size = cache.entries['https://example.com/0']['size']
+    # Reading page 0 makes page 1 the least recently used
+    clock.now += 1
+    cache.get('https://example.com/0')
+    cache.max_bytes = 2 * size
+    assert cache.save() == 1
+    assert sorted(cache.entries) == ['https://example.com/0', 'https://example.com/2']
+    assert len(bodies(tmp_path)) == 2
+
+
+def test_shared_body_is_kept_while_a_url_uses_it(tmp_path):
+    clock = Clock()
+    cache = DiskCache(str(tmp_path), clock=clock)
+    cache.put('https://example.com/1', 'same page')
+    clock.now += 1
+    cache.put('https://example.com/2', 'same page')
+    cache.max_bytes = cache.entries['https://example.com/1']['size']
+    assert cache.save() == 0
+    cache.max_bytes = 0
+    assert cache.save() == 2
+    assert bodies(tmp_path) == []
@@ -0,0 +1,64 @@
+import pandas as pd
+from job_clusters import JobClusters, normalize_city, normalize_company, seniority
+
+
+def jobs(*rows):
+    return pd.DataFrame(rows, columns=['title', 'company', 'location', 'source', 'job_id'])
+
+
+TEL_AVIV = 'Tel Aviv-Yafo, Tel Aviv District, Israel'
+JOBS = jobs(
+    ('Senior Data Scientist, Payments', 'Wix.com', TEL_AVIV, 'LinkedIn', '1'),
+    # The same role re-posted under a new id, with noise words and an alias
+    ('Sr. Data Scientist - Payments (Hybrid)', 'Wix.com Ltd.', 'Tel Aviv, Israel', 'LinkedIn', '2'),
+    # Same title, another company
+    ('Senior Data Scientist, Payments', 'Intel', TEL_AVIV, 'LinkedIn', '3'),
+    # Same company and title words, another seniority
+    ('Data Scientist, Payments', 'Wix.com', TEL_AVIV, 'LinkedIn', '4'),
+    ('Senior Backend Engineer', 'Wix.com', TEL_AVIV, 'LinkedIn', '5'),
+    # The Google Careers listing of a role also found on LinkedIn
+    ('Data Scientist, Ads', 'Google', 'Tel Aviv, Israel', 'Google Careers', '6'),
+    ('Data Scientist, Ads', 'Google Israel', TEL_AVIV, 'LinkedIn', '7'),
+)
+
+
+def test_normalization():
+    assert normalize_company('Google Israel Ltd.') == normalize_company('Google')
+    assert normalize_city(TEL_AVIV) == 'tel aviv'
+    assert normalize_city('Israel') is None
+    assert seniority('Sr. Data Scientist') == 'senior'
+
+
+def test_near_duplicates_share_a_cluster(tmp_path):
+    clusters = JobClusters(str(tmp_path))
+    assert clusters.add(JOBS) == len(JOBS)
+    labels = clusters.assign(JOBS).tolist()
+    assert labels[0] == labels[1]
+    assert labels[5] == labels[6]
+    assert len({labels[0], labels[2], labels[3], labels[4], labels[5]}) == 5
+
+
+def test_add_only_hashes_new_jobs_and_reloads(tmp_path):
+    clusters = JobClusters(str(tmp_path))
+    clusters.add(JOBS[:3])
+    assert clusters.add(JOBS) == len(JOBS) - 3
+    assert clusters.add(JOBS) == 0
+
+    reloaded = JobClusters.load(str(tmp_path))
+    assert len(reloaded) == len(JOBS)
+    assert reloaded.assign(JOBS).tolist() == clusters.assign(JOBS).tolist()
+
+
+def test_unknown_jobs_get_no_cluster(tmp_path):
+    clusters = JobClusters(str(tmp_path))
+    clusters.add(JOBS[:2])
+    assert clusters.assign(JOBS[1:3]).tolist()[1] == -1
+
+
+def test_load_ignores_keys_without_a_record(tmp_path):
+    clusters = JobClusters(str(tmp_path))
+    clusters.add(JOBS[:2])
+    # A crash between writing the records and the keys
+    with open(clusters.keys_path, 'a', encoding='utf-8') as f:
+        f.write('LinkedIn\t99\n')
+    assert len(JobClusters.load(str(tmp_path))) == 2
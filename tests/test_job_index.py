@@ -0,0 +1,87 @@
+import pandas as pd
+from job_index import JobIndex, SeenIds, canonicalize_jobs
+
+
+def jobs(*rows):
+    return pd.DataFrame(rows, columns=['source', 'job_id'])
+
+
+def test_canonicalize_strips_tracking_and_drops_rows_without_id():
+    df = pd.DataFrame({
+        'link': ['https://il.linkedin.com/jobs/view/data-scientist-at-wix-4283444827?refId=a&trackingId=b',
+                 'https://www.google.com/about/careers/applications/jobs/results/1230677-data-scientist?q=x',
+                 None],
+        'source': ['LinkedIn', 'Google Careers', 'LinkedIn'],
+        'job_id': [None, None, 'not-a-number'],
+    })
+    result = canonicalize_jobs(df)
+    assert result['job_id'].tolist() == ['4283444827', '1230677']
+    assert result['link'][0] == 'https://il.linkedin.com/jobs/view/data-scientist-at-wix-4283444827'
+
+
+def test_canonicalize_without_link_keeps_numeric_ids():
+    result = canonicalize_jobs(jobs(('LinkedIn', ' 42 '), ('LinkedIn', None), ('LinkedIn', 'x1')))
+    assert result['job_id'].tolist() == ['42']
+
+
+def test_filter_new_drops_known_and_repeated_keys():
+    index = JobIndex()
+    assert len(index.filter_new(jobs(('LinkedIn', '1'), ('LinkedIn', '2'), ('LinkedIn', '1')))) == 2
+    new = index.filter_new(jobs(('LinkedIn', '2'), ('Google Careers', '2'), ('LinkedIn', '3')))
+    assert new.values.tolist() == [['Google Careers', '2'], ['LinkedIn', '3']]
+    assert ('LinkedIn', '3') in index and len(index) == 4
+
+
+def test_new_mask_leaves_index_unchanged():
+    index = JobIndex()
+    index.filter_new(jobs(('LinkedIn', '1')))
+    mask = index.new_mask(jobs(('LinkedIn', '1'), ('LinkedIn', '2')))
+    assert mask.tolist() == [False, True]
+    assert len(index) == 1
+
+
+def test_scopes_are_independent():
+    index = JobIndex()
+    index.filter_new(jobs(('LinkedIn', '1')))
+    assert len(index.filter_new(jobs(('LinkedIn', '1')), scope='ml-engineer-us')) == 1
+    assert len(index.filter_new(jobs(('LinkedIn', '1')), scope='ml-engineer-us')) == 0
+    assert ('LinkedIn', '1') in index
+
+
+def test_save_appends_only_new_keys(tmp_path):
+    path = tmp_path / 'index.tsv'
+    index = JobIndex(str(path))
+    index.filter_new(jobs(('LinkedIn', '2'), ('LinkedIn', '1')))
+    index.save()
+    # A new file is written sorted
+    assert path.read_text().splitlines() == ['LinkedIn\t1', 'LinkedIn\t2']
+
+    reloaded = JobIndex.load(str(path))
+    assert len(reloaded) == 2
+    reloaded.filter_new(jobs(('LinkedIn', '1'), ('LinkedIn', '0')))
+    reloaded.save()
+    reloaded.save()
+    assert path.read_text().splitlines() == ['LinkedIn\t1', 'LinkedIn\t2', 'LinkedIn\t0']
+    assert JobIndex.load(str(path)).keys == {'LinkedIn\t0', 'LinkedIn\t1', 'LinkedIn\t2'}
+
+
+def test_load_ignores_a_torn_last_line(tmp_path):
+    path = tmp_path / 'index.tsv'
+    path.write_text('LinkedIn\t1\nLinked')
+    assert JobIndex.load(str(path)).keys == {'LinkedIn\t1'}
+
+
+def test_seen_ids_from_index_by_source_and_scope():
+    index = JobIndex()
+    index.filter_new(jobs(('LinkedIn', '30'), ('LinkedIn', '10'), ('Google Careers', '20')))
+    index.filter_new(jobs(('LinkedIn', '40')), scope='ml-engineer-us')
+    seen = SeenIds.from_index(index, 'LinkedIn')
+    assert seen.ids.tolist() == [10, 30]
+    assert seen.known_mask([10, 20, 30, 40, 50]).tolist() == [True, False, True, False, False]
+    assert 30 in seen and 40 not in seen
+    assert SeenIds.from_index(index, 'LinkedIn', 'ml-engineer-us').ids.tolist() == [40]
+
+
+def test_empty_seen_ids():
+    assert SeenIds().known_mask([1, 2]).tolist() == [False, False]
+    assert SeenIds([1]).known_mask([]).tolist() == []
@@ -0,0 +1,88 @@
+import os
+import pandas as pd
+from job_lifecycle import JobLifecycle, lifecycle_metrics
+
+
+def sightings(run_time, *job_ids, source='LinkedIn'):
+    return pd.DataFrame({'source': source, 'job_id': [str(job_id) for job_id in job_ids], 'run_time': run_time})
+
+
+def table(lifecycle):
+    return lifecycle.frame().set_index('job_id').sort_index()
+
+
+def observe_runs(lifecycle):
+    lifecycle.observe(sightings('2025-08-12 01:00', 1, 2))
+    lifecycle.observe(sightings('2025-08-12 13:00', 1, 3))
+    lifecycle.observe(sightings('2025-08-13 01:00', 1))
+
+
+def test_observe_counts_runs_per_job(tmp_path):
+    lifecycle = JobLifecycle.load(str(tmp_path))
+    assert lifecycle.observe(sightings('2025-08-12 01:00', 1, 2, 2)) == (0, 2)
+    assert lifecycle.observe(sightings('2025-08-12 13:00', 1, 3)) == (1, 1)
+    # The same run observed again (two markets' queries) isn't another sighting
+    lifecycle.observe(sightings('2025-08-12 13:00', 1))
+    result = table(lifecycle)
+    assert result['seen_count'].to_dict() == {1: 2, 2: 1, 3: 1}
+    assert result.loc[1, 'first_seen'] == pd.Timestamp('2025-08-12 01:00')
+    assert result.loc[1, 'last_seen'] == pd.Timestamp('2025-08-12 13:00')
+
+
+def test_repeat_ids(tmp_path):
+    lifecycle = JobLifecycle.load(str(tmp_path))
+    observe_runs(lifecycle)
+    assert lifecycle.repeat_ids('LinkedIn').ids.tolist() == [1]
+    assert len(lifecycle.repeat_ids('Google Careers')) == 0
+
+
+def test_missing_table_is_rebuilt_from_the_log(tmp_path):
+    lifecycle = JobLifecycle.load(str(tmp_path))
+    observe_runs(lifecycle)
+    expected = table(lifecycle)
+    for path in [lifecycle.records_path, lifecycle.keys_path, lifecycle.meta_path]:
+        os.remove(path)
+    pd.testing.assert_frame_equal(table(JobLifecycle.load(str(tmp_path))), expected)
+
+
+def test_table_without_meta_is_rebuilt_not_appended_to(tmp_path):
+    lifecycle = JobLifecycle.load(str(tmp_path))
+    observe_runs(lifecycle)
+    expected = table(lifecycle)
+    os.remove(lifecycle.meta_path)
+    pd.testing.assert_frame_equal(table(JobLifecycle.load(str(tmp_path))), expected)
+
+
+def test_stale_table_catches_up(tmp_path):
+    stale = JobLifecycle.load(str(tmp_path))
+    stale.observe(sightings('2025-08-12 01:00', 1, 2))
+    JobLifecycle.load(str(tmp_path)).observe(sightings('2025-08-12 13:00', 1, 3))
+    assert stale.catch_up() == 2
+    assert table(stale)['seen_count'].to_dict() == {1: 2, 2: 1, 3: 1}
+
+
+def test_catch_up_drops_a_torn_log_line(tmp_path):
+    lifecycle = JobLifecycle.load(str(tmp_path))
+    lifecycle.observe(sightings('2025-08-12 01:00', 1))
+    with open(lifecycle.sightings_path, 'a', encoding='utf-8') as f:
+        f.write('LinkedIn,2,2025-08-12 13:00\nLinkedIn,3,2025-08')
+    reloaded = JobLifecycle.load(str(tmp_path))
+    assert sorted(table(reloaded).index) == [1, 2]
+    reloaded.observe(sightings('2025-08-13 01:00', 3))
+    assert sorted(table(JobLifecycle.load(str(tmp_path))).index) == [1, 2, 3]
+
+
+def test_lifecycle_metrics(tmp_path):
+    lifecycle = JobLifecycle.load(str(tmp_path))
+    lifecycle.observe(sightings('2025-08-12 01:00', 1, 2))
+    lifecycle.observe(sightings('2025-08-12 13:00', 1, 2, 3))
+    lifecycle.observe(sightings('2025-08-15 01:00', 1))
+    metrics = lifecycle_metrics(lifecycle.frame())
+    assert (metrics['jobs'], metrics['active'], metrics['closed']) == (3, 1, 2)
+    # Job 3 was seen once, so only job 2 counts towards days open
+    assert metrics['median_days_open'] == 0.5
+    assert metrics['repeat_share'] == 2 / 3
+
+
+def test_lifecycle_metrics_of_an_empty_table(tmp_path):
+    assert lifecycle_metrics(JobLifecycle.load(str(tmp_path)).frame())['median_days_open'] is None
@@ -0,0 +1,75 @@
+import json
+import pandas as pd
+from job_store import COLUMNS, JobStore, export_csv, merge_new_jobs, open_store
+
+
+def jobs(run_time, *job_ids):
+    return pd.DataFrame({
+        'title': 'Data Scientist', 'company': 'Wix.com', 'location': 'Israel',
+        'link': [f'https://il.linkedin.com/jobs/view/data-scientist-at-wix-{job_id}?refId=x' for job_id in job_ids],
+        'source': 'LinkedIn', 'job_id': [str(job_id) for job_id in job_ids], 'run_time': run_time,
+    })
+
+
+def test_append_and_read_by_run_time(tmp_path):
+    store = JobStore(str(tmp_path))
+    store.append(jobs('2025-08-12 01:00', 1, 2).drop(columns='link'))
+    store.append(jobs('2025-08-13 01:00', 3).drop(columns='link'))
+    reloaded = JobStore(str(tmp_path))
+    assert [p['name'] for p in reloaded.partitions] == ['2025-08-12', '2025-08-13']
+    assert reloaded.row_count == 3 and reloaded.max_run_time == '2025-08-13 01:00'
+    assert reloaded.read(columns=['job_id'], since='2025-08-12 01:00')['job_id'].tolist() == ['3']
+    assert reloaded.read(until='2025-08-12 01:00')['job_id'].tolist() == ['1', '2']
+
+
+def test_new_columns_read_back_empty_from_older_segments(tmp_path):
+    store = JobStore(str(tmp_path))
+    store.append(jobs('2025-08-12 01:00', 1))
+    store.append(jobs('2025-08-12 13:00', 2).assign(seniority='Mid-Senior level'))
+    store.append(jobs('2025-08-13 01:00', 3).assign(seniority='Entry level'))
+    seniority = JobStore(str(tmp_path)).read(columns=['job_id', 'seniority'])
+    assert seniority['seniority'].fillna('').tolist() == ['', 'Mid-Senior level', 'Entry level']
+
+
+def test_merge_stores_new_jobs_without_links(tmp_path):
+    store = JobStore(str(tmp_path / 'store'))
+    csv_file = str(tmp_path / 'jobs.csv')
+    assert len(merge_new_jobs(store, jobs('2025-08-12 01:00', 1, 2), csv_file)) == 2
+    assert len(merge_new_jobs(store, jobs('2025-08-12 13:00', 2, 3), csv_file)) == 1
+    assert store.manifest['columns'] == COLUMNS
+    assert store.read()['job_id'].tolist() == ['1', '2', '3']
+    assert list(pd.read_csv(csv_file).columns) == COLUMNS
+    assert len(pd.read_csv(csv_file)) == 3
+
+
+def test_fill_overwrites_matching_rows(tmp_path):
+    store = JobStore(str(tmp_path))
+    store.append(jobs('2025-08-12 01:00', 1, 2).assign(seniority=None))
+    details = jobs('2025-08-12 01:00', 2).assign(seniority='Director')
+    assert store.fill(details, ['seniority']) == 1
+    assert store.read(columns=['seniority'])['seniority'].fillna('').tolist() == ['', 'Director']
+
+
+def test_open_store_drops_stored_links(tmp_path):
+    root = tmp_path / 'store'
+    root.mkdir()
+    old = jobs('2025-08-12 01:00', 1, 2)
+    old.to_csv(root / '2025-08-12.csv', index=False)
+    manifest = {'version': 1, 'columns': list(old.columns), 'partitions': [
+        {'name': '2025-08-12', 'file': '2025-08-12.csv', 'rows': 2,
+         'min_run_time': '2025-08-12 01:00', 'max_run_time': '2025-08-12 01:00'}]}
+    (root / 'manifest.json').write_text(json.dumps(manifest))
+
+    store = open_store(str(root))
+    assert store.manifest['columns'] == COLUMNS
+    assert list(pd.read_csv(root / '2025-08-12.csv').columns) == COLUMNS
+    assert store.read()['job_id'].tolist() == ['1', '2']
+
+
+def test_export_csv_rewrites_an_old_header(tmp_path):
+    csv_file = str(tmp_path / 'jobs.csv')
+    jobs('2025-08-12 01:00', 1).to_csv(csv_file, index=False)
+    export_csv(csv_file, jobs('2025-08-12 13:00', 2))
+    exported = pd.read_csv(csv_file, dtype={'job_id': str})
+    assert list(exported.columns) == COLUMNS
+    assert exported['job_id'].tolist() == ['1', '2']
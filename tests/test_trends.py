@@ -0,0 +1,35 @@
+import pandas as pd
+from trends import TrendState
+
+
+def jobs(*rows):
+    return pd.DataFrame(rows, columns=['title', 'company', 'source', 'run_time'])
+
+
+RUN_1 = jobs(('Data Scientist', 'Wix.com', 'LinkedIn', '2025-08-12 01:00'),
+             ('Machine Learning Engineer', 'Intel', 'LinkedIn', '2025-08-12 01:00'))
+RUN_2 = jobs(('Data Scientist NLP', 'Google', 'Google Careers', '2025-08-12 13:00'))
+LATE = jobs(('Data Analyst', 'Intel', 'LinkedIn', '2025-08-11 13:00'))
+
+
+def test_trends_fold_and_reload(tmp_path):
+    path = str(tmp_path / 'trends.json')
+    state = TrendState(path)
+    state.update_from_rows(RUN_1)
+    state.save()
+    state = TrendState.load(path)
+    state.update_from_rows(pd.concat([RUN_1, RUN_2]))
+    assert state.rows == 3
+    assert state.daily == {'2025-08-12': 3}
+    assert state.series['company']['Intel'] == {'2025-08-12': 1}
+    assert state.series['source']['Google Careers'] == {'2025-08-12': 1}
+    assert state.frame()['count'].tolist() == [3]
+
+
+def test_late_rows_rebuild_the_trends():
+    state = TrendState()
+    state.update_from_rows(pd.concat([RUN_1, RUN_2]))
+    state.update_from_rows(pd.concat([RUN_1, RUN_2, LATE]))
+    assert state.rows == 4
+    assert state.daily == {'2025-08-11': 1, '2025-08-12': 3}
+    assert state.frame(freq='D')['count'].tolist() == [1, 3]
@@ -0,0 +1,136 @@
+import os
+import json
+from collections import Counter
+import pandas as pd
+from keywords import STOP_WORDS, keyword_counts
+
+TRENDS_VERSION = 1
+DIMENSIONS = ['company', 'source', 'keyword']
+
+
+class TrendState:
+    """Daily counts of new postings, overall and per company, source and title keyword.
+
+    Like DashboardState it is folded in one run at a time behind a
+    run_time watermark. Only daily counts are stored; weekly series and
+    rolling averages are derived from them when plotting.
+    """
+
+    def __init__(self, path=None, stop_words=STOP_WORDS):
+        self.path = path
+        self.stop_words = stop_words
+        self.watermark = None
+        self.rows = 0
+        self.daily = Counter()
+        # dimension -> key -> Counter(day -> count)
+        self.series = {dimension: {} for dimension in DIMENSIONS}
+
+    @classmethod
+    def load(cls, path, stop_words=STOP_WORDS):
+        state = cls(path, stop_words)
+        if not os.path.exists(path):
+            return state
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != TRENDS_VERSION:
+            return state
+        state.watermark = data['watermark']
+        state.rows = data['rows']
+        day_names = data['days']
+        state.daily = Counter(dict(zip(day_names, data['daily'])))
+        state.series = {dimension: {key: Counter({day_names[i]: n for i, n in zip(pairs[::2], pairs[1::2])})
+                                    for key, pairs in data['series'][dimension].items()}
+                        for dimension in DIMENSIONS}
+        return state
+
+    def save(self):
+        # Each key's series is a flat [day offset, count, ...] list into `days`, to keep the file small
+        day_names = sorted(self.daily)
+        offsets = {day: i for i, day in enumerate(day_names)}
+        data = {
+            'version': TRENDS_VERSION,
+            'watermark': self.watermark,
+            'rows': self.rows,
+            'days': day_names,
+            'daily': [self.daily[day] for day in day_names],
+            'series': {dimension: {key: [value for day in sorted(days) for value in (offsets[day], days[day])]
+                                   for key, days in sorted(self.series[dimension].items())}
+                       for dimension in DIMENSIONS},
+        }
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def _add(self, dimension, counts):
+        """Add {(key, day): count} to a dimension's series"""
+        series = self.series[dimension]
+        for (key, day), count in counts.items():
+            series.setdefault(key, Counter())[day] += int(count)
+
+    def fold(self, df):
+        """Count rows of df newer than the watermark and advance it"""
+        if self.watermark is not None:
+            df = df[df['run_time'] > self.watermark]
+        if df.empty:
+            return 0
+        days = df['run_time'].astype(str).str[:10].rename('day')
+        self.daily.update(days.value_counts().to_dict())
+        for dimension in ['company', 'source']:
+            self._add(dimension, df.groupby([df[dimension], days]).size().to_dict())
+        for day, titles in df['title'].groupby(days):
+            counts = keyword_counts(titles, sizes=(1,), stop_words=self.stop_words)[1]
+            self._add('keyword', {(word, day): count for word, count in counts.items()})
+        self.rows += len(df)
+        self.watermark = max(filter(None, [self.watermark, df['run_time'].max()]))
+        return len(df)
+
+    def update_from_rows(self, df):
+        """Fold the rows of df (every row of one market) newer than the watermark.
+
+        Rows don't always arrive in run_time order: `cli.py merge` of an
+        older CSV or a resumed checkpoint can store rows at or before the
+        watermark, which fold() skips. So if the rows counted don't add up
+        to df afterwards (or df shrank), the state is rebuilt from all of df.
+        """
+        folded = self.fold(df)
+        if self.rows != len(df):
+            print(f"Trends: {self.rows} rows counted but {len(df)} stored, rebuilding", flush=True)
+            self.__init__(self.path, self.stop_words)
+            folded = self.fold(df)
+        return folded
+
+    def frame(self, dimension=None, keys=None, freq='D', window=None):
+        """Counts as a date-indexed frame with one column per key (or 'count' overall).
+
+        Days without postings are filled with zeros; freq='W' sums them into
+        weeks. With a window, each column is replaced by its rolling mean
+        over that many periods.
+        """
+        if dimension is None:
+            columns = {'count': self.daily}
+        else:
+            keys = keys if keys is not None else list(self.series[dimension])
+            columns = {key: self.series[dimension].get(key, Counter()) for key in keys}
+        df = pd.DataFrame({key: pd.Series(days, dtype='int64') for key, days in columns.items()})
+        if df.empty:
+            return df
+        df.index = pd.to_datetime(df.index)
+        df = df.reindex(pd.date_range(min(self.daily), max(self.daily), freq='D')).fillna(0).astype('int64')
+        if freq != 'D':
+            df = df.resample(freq).sum()
+        if window:
+            df = df.rolling(window, min_periods=1).mean()
+        return df
+
+    def top(self, dimension, n=10):
+        """The n keys with the most postings overall"""
+        totals = Counter({key: sum(days.values()) for key, days in self.series[dimension].items()})
+        return [key for key, _ in totals.most_common(n)]
+
+    def first_last_seen(self, dimension):
+        """First and last day each key had postings, with its total count"""
+        rows = [(key, min(days), max(days), sum(days.values())) for key, days in self.series[dimension].items()]
+        return pd.DataFrame(rows, columns=[dimension, 'first_seen', 'last_seen', 'total']).sort_values(
+            'total', ascending=False, kind='stable').reset_index(drop=True)